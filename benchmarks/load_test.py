@@ -0,0 +1,307 @@
+import argparse
+import asyncio
+import json
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from benchmarks.mock_server import MockAPIServer
+from managers.task_dispatcher import AsyncTaskDispatcher
+from resources.processor import AsyncJsonProcessor
+from services.api_clients import AgifyClient, JokeClient, PostmanClient
+from services.api_clients.rate_limiter import RateLimiter
+from services.api_clients.resilience import Resilience
+
+COUNTRIES = ("BG", "US", "DE", "FR", "GB", "ES", "IT", "NL")
+SYLLABLES = ("an", "bo", "ca", "de", "el", "fi", "ga", "hr", "iv", "ka", "lo", "ma")
+DEFAULT_MIX = "age=0.6,joke=0.3,raw=0.1"
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    Parse a task mix such as "age=0.6,joke=0.3,raw=0.1".
+
+    :param mix: Comma-separated type=weight pairs.
+    :return: Task type to weight.
+    :raises ValueError: If a pair is malformed or no weight is positive.
+    """
+    weights: Dict[str, float] = {}
+    for pair in filter(None, (part.strip() for part in mix.split(","))):
+        task_type, _, weight = pair.partition("=")
+        try:
+            weights[task_type.strip()] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid task mix entry '{pair}'") from None
+    if not weights or sum(weights.values()) <= 0:
+        raise ValueError(f"Task mix '{mix}' has no positive weight")
+    return weights
+
+
+def synthetic_names(count: int) -> List[str]:
+    """
+    Build `count` distinct names that pass the input validator.
+
+    :param count: Name cardinality.
+    :return: Capitalised names made of two or more syllables.
+    """
+    names: List[str] = []
+    index = 0
+    while len(names) < count:
+        digits, value = [], index
+        while True:
+            value, digit = divmod(value, len(SYLLABLES))
+            digits.append(SYLLABLES[digit])
+            if value == 0:
+                break
+        if len(digits) == 1:
+            digits.append(SYLLABLES[0])
+        names.append("".join(digits).capitalize())
+        index += 1
+    return names
+
+
+def generate_input(
+    root: Path,
+    files: int,
+    mix: Dict[str, float],
+    names: int = 500,
+    subdirs: int = 10,
+    seed: int = 0,
+) -> Dict[str, int]:
+    """
+    Write a synthetic INPUT tree of task files.
+
+    :param root: Directory to create the files in.
+    :param files: Number of task files.
+    :param mix: Task type to weight ("raw" becomes an unrecognised type that is echoed as is).
+    :param names: Number of distinct names (controls the age-cache hit rate).
+    :param subdirs: Number of subdirectories the files are spread over.
+    :param seed: Random seed, so runs are reproducible.
+    :return: Number of files per task type.
+    """
+    rng = random.Random(seed)
+    pool = synthetic_names(max(names, 1))
+    types, weights = list(mix), list(mix.values())
+    counts: Dict[str, int] = dict.fromkeys(types, 0)
+
+    for index in range(files):
+        task_type = rng.choices(types, weights)[0]
+        counts[task_type] += 1
+        directory = root / f"batch_{index % max(subdirs, 1):03d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        task = {
+            "name": rng.choice(pool),
+            "type": "greeting" if task_type == "raw" else task_type,
+            "country": rng.choice(COUNTRIES),
+        }
+        (directory / f"task_{index:07d}.json").write_text(
+            json.dumps(task), encoding="utf-8"
+        )
+    return counts
+
+
+@contextmanager
+def redirect_clients(base_url: str) -> Iterator[None]:
+    """
+    Point the API clients at a local server for the duration of the block.
+
+    The rate limiters and circuit breakers are reset before and after, so a load
+    test neither inherits nor leaves behind per-host state.
+
+    :param base_url: Base URL of the mock server.
+    """
+    targets = {
+        (AgifyClient, "BASE_URL"): f"{base_url}/agify",
+        (JokeClient, "BASE_URL"): f"{base_url}/jokes/random_joke",
+        (JokeClient, "BULK_URL"): f"{base_url}/jokes/random_ten",
+        (PostmanClient, "BASE_URL"): f"{base_url}/postman/post",
+    }
+    originals = {key: getattr(*key) for key in targets}
+    RateLimiter.reset()
+    Resilience.reset()
+    try:
+        for (client, attribute), url in targets.items():
+            setattr(client, attribute, url)
+        yield
+    finally:
+        for (client, attribute), url in originals.items():
+            setattr(client, attribute, url)
+        RateLimiter.reset()
+        Resilience.reset()
+
+
+class TimedProcessor(AsyncJsonProcessor):
+    """Processor that records the wall-clock latency of every processed file."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.latencies: List[float] = []
+
+    async def process_file(
+        self, dispatcher: AsyncTaskDispatcher, file: Path, content: dict
+    ) -> None:
+        started = time.perf_counter()
+        try:
+            await super().process_file(dispatcher, file, content)
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    :param values: Observed values.
+    :param fraction: Percentile as a fraction (0.99 = p99).
+    :return: The value at the percentile (0 if there are no values).
+    """
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[
+        min(max(round(fraction * 100) - 1, 0), 98)
+    ]
+
+
+def peak_rss_mb() -> float:
+    """:return: Peak resident set size of this process, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+async def run_load_test(
+    input_path: Path,
+    server: MockAPIServer,
+    **processor_options: Any,
+) -> Dict[str, Any]:
+    """
+    Process an INPUT tree against a mock server and collect the results.
+
+    :param input_path: Directory with the generated task files.
+    :param server: Mock server (not yet started).
+    :param processor_options: Extra AsyncJsonProcessor arguments (workers, queue_size, ...).
+    :return: Report with run counters, throughput, latency, memory and upstream calls.
+    """
+    base_url = await server.start()
+    try:
+        with redirect_clients(base_url), tempfile.TemporaryDirectory() as state:
+            options = {
+                "age_cache_path": None,
+                "scan_checkpoint_path": None,
+                "metrics_path": None,
+                "journal_path": Path(state) / "run_journal.jsonl",
+                **processor_options,
+            }
+            processor = TimedProcessor(input_path, **options)
+            started = time.perf_counter()
+            stats = await processor.process_all()
+            elapsed = time.perf_counter() - started
+    finally:
+        await server.stop()
+
+    latencies = processor.latencies
+    return {
+        "stats": stats,
+        "elapsed_seconds": round(elapsed, 3),
+        "files_per_second": round(stats["processed"] / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 2),
+            "p99": round(percentile(latencies, 0.99) * 1000, 2),
+            "max": round(max(latencies, default=0.0) * 1000, 2),
+        },
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "upstream_calls": dict(sorted(server.calls.items())),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    :param report: Result of `run_load_test`.
+    :return: Human-readable summary.
+    """
+    stats, latency = report["stats"], report["latency_ms"]
+    lines = [
+        f"files:      {stats['processed']} processed, {stats['failed']} failed, "
+        f"{stats['skipped']} skipped in {report['elapsed_seconds']} s",
+        f"throughput: {report['files_per_second']} files/s",
+        f"latency:    p50 {latency['p50']} ms, p99 {latency['p99']} ms, "
+        f"max {latency['max']} ms",
+        f"peak RSS:   {report['peak_rss_mb']} MiB",
+        "upstream:   "
+        + ", ".join(f"{route}={count}" for route, count in report["upstream_calls"].items()),
+    ]
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Load-test the processor against a local mock API server."
+    )
+    parser.add_argument("--files", type=int, default=1000, help="Number of task files.")
+    parser.add_argument(
+        "--mix", default=DEFAULT_MIX, help=f"Task mix (default {DEFAULT_MIX})."
+    )
+    parser.add_argument(
+        "--names", type=int, default=500, help="Number of distinct names."
+    )
+    parser.add_argument(
+        "--subdirs", type=int, default=10, help="Subdirectories to spread files over."
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=20.0, help="Mean upstream latency."
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=5.0, help="Upstream latency jitter."
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of 503 responses."
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="Upstream requests per second before 429s (0 = unlimited).",
+    )
+    parser.add_argument("--workers", type=int, help="Override PROCESS_WORKERS.")
+    parser.add_argument(
+        "--input", type=Path, help="Generate the tree here instead of a temp directory."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument(
+        "--json", action="store_true", help="Print the report as JSON."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    mix = parse_mix(args.mix)
+    options = {} if args.workers is None else {"workers": args.workers}
+    server = MockAPIServer(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="load_test_") as tmp:
+        input_path = args.input or Path(tmp) / "INPUT"
+        generated = generate_input(
+            input_path, args.files, mix, args.names, args.subdirs, args.seed
+        )
+        report = asyncio.run(run_load_test(input_path, server, **options))
+    report["generated"] = generated
+
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from managers.age_cache import AgeCache
+from managers.file_manager import AsyncFileManager
+from managers.task_dispatcher import AsyncTaskDispatcher
+from validators.input_validator import InputValidator
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEATS = 5
+
+TASK: Dict[str, str] = {"name": "Maria", "type": "age", "country": "BG"}
+COUNTRIES = ("BG", "US", "DE", "FR")
+
+# A benchmark receives a scratch directory and an operation count and returns the
+# seconds spent in the measured part, so its own setup is not timed.
+Benchmark = Callable[[Path, int], Awaitable[float]]
+BENCHMARKS: Dict[str, Tuple[Benchmark, int]] = {}
+
+
+def benchmark(name: str, ops: int) -> Callable[[Benchmark], Benchmark]:
+    """
+    Register a benchmark.
+
+    :param name: Name used in reports and in the baseline file.
+    :param ops: Default number of operations per measurement.
+    """
+
+    def register(func: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = (func, ops)
+        return func
+
+    return register
+
+
+def _task_files(directory: Path, count: int) -> List[Path]:
+    """Write `count` small task files and return their paths."""
+    files = [directory / f"task_{index:06d}.json" for index in range(count)]
+    payload = json.dumps(TASK)
+    for file in files:
+        file.write_text(payload, encoding="utf-8")
+    return files
+
+
+def _names(count: int) -> List[Tuple[str, str]]:
+    """Distinct (name, country) pairs spread over a few countries."""
+    return [
+        (f"Name{index // len(COUNTRIES)}", COUNTRIES[index % len(COUNTRIES)])
+        for index in range(count)
+    ]
+
+
+def _prediction(name: str, country: str) -> Dict[str, Any]:
+    return {"name": name, "age": 42, "count": 1000, "country_id": country}
+
+
+def _offline_dispatcher() -> AsyncTaskDispatcher:
+    """
+    Dispatcher whose upstream calls return immediately, so only local work is measured.
+
+    Agify batches are answered with fixed predictions and results are echoed
+    without a Postman request.
+    """
+    dispatcher = AsyncTaskDispatcher(age_cache=AgeCache())
+
+    async def get_batch_ages(names: List[str], country: str) -> List[Dict[str, Any]]:
+        return [_prediction(name, country) for name in names]
+
+    async def post_response(data: Dict[str, Any]) -> Dict[str, Any]:
+        return {"json": data}
+
+    dispatcher.agify_client.get_batch_ages = get_batch_ages  # type: ignore[method-assign]
+    dispatcher.postman_client.post_response = post_response  # type: ignore[method-assign]
+    return dispatcher
+
+
+@benchmark("validate", ops=20_000)
+async def bench_validate(workdir: Path, ops: int) -> float:
+    tasks = [dict(TASK) for _ in range(ops)]
+    started = time.perf_counter()
+    for task in tasks:
+        InputValidator.validate(task)
+    return time.perf_counter() - started
+
+
+@benchmark("read_json", ops=500)
+async def bench_read_json(workdir: Path, ops: int) -> float:
+    files = _task_files(workdir, ops)
+    started = time.perf_counter()
+    await asyncio.gather(*(AsyncFileManager.read_json(file) for file in files))
+    return time.perf_counter() - started
+
+
+@benchmark("write_json", ops=500)
+async def bench_write_json(workdir: Path, ops: int) -> float:
+    files = [workdir / f"task_{index:06d}_processed.json" for index in range(ops)]
+    started = time.perf_counter()
+    await asyncio.gather(*(AsyncFileManager.write_json(file, TASK) for file in files))
+    return time.perf_counter() - started
+
+
+@benchmark("delete_file", ops=500)
+async def bench_delete_file(workdir: Path, ops: int) -> float:
+    files = _task_files(workdir, ops)
+    started = time.perf_counter()
+    await asyncio.gather(*(AsyncFileManager.delete_file(file) for file in files))
+    return time.perf_counter() - started
+
+
+@benchmark("handle_warm_cache", ops=5_000)
+async def bench_handle_warm_cache(workdir: Path, ops: int) -> float:
+    dispatcher = _offline_dispatcher()
+    pairs = _names(min(ops, 500))
+    dispatcher.age_cache.update(
+        ((name, country), _prediction(name, country)) for name, country in pairs
+    )
+    tasks = [
+        {"name": name, "type": "age", "country": country}
+        for name, country in (pairs[index % len(pairs)] for index in range(ops))
+    ]
+    started = time.perf_counter()
+    await asyncio.gather(*(dispatcher.handle(task) for task in tasks))
+    return time.perf_counter() - started
+
+
+@benchmark("preload_age_predictions", ops=2_000)
+async def bench_preload_age_predictions(workdir: Path, ops: int) -> float:
+    dispatcher = _offline_dispatcher()
+    pairs = _names(ops)
+    started = time.perf_counter()
+    await dispatcher.preload_age_predictions(pairs)
+    return time.perf_counter() - started
+
+
+async def run_suite(
+    names: Optional[Iterable[str]] = None,
+    repeats: int = DEFAULT_REPEATS,
+    scale: float = 1.0,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Measure the selected benchmarks.
+
+    Every benchmark runs `repeats` times in a fresh scratch directory; the median
+    and the best time per operation are reported, in microseconds.
+
+    :param names: Benchmarks to run (default: all).
+    :param repeats: Measurements per benchmark.
+    :param scale: Factor applied to each benchmark's operation count.
+    :return: Results per benchmark name.
+    :raises KeyError: If an unknown benchmark is requested.
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    for name in names or BENCHMARKS:
+        func, default_ops = BENCHMARKS[name]
+        ops = max(int(default_ops * scale), 1)
+        samples = []
+        for _ in range(max(repeats, 1)):
+            with tempfile.TemporaryDirectory(prefix="microbench_") as tmp:
+                samples.append(await func(Path(tmp), ops) / ops)
+        results[name] = {
+            "ops": ops,
+            "median_us": round(statistics.median(samples) * 1e6, 3),
+            "min_us": round(min(samples) * 1e6, 3),
+        }
+    AsyncFileManager.engine().close()
+    return results
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    :param results: Output of `run_suite`.
+    :param baseline: Results recorded earlier.
+    :param threshold: Allowed slowdown of the median, as a fraction (0.25 = 25 %).
+    :return: One message per benchmark that got slower than allowed.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous or previous["median_us"] <= 0:
+            continue
+        change = result["median_us"] / previous["median_us"] - 1
+        if change > threshold:
+            regressions.append(
+                f"{name}: {previous['median_us']:.3f} -> {result['median_us']:.3f} "
+                f"us/op (+{change:.0%})"
+            )
+    return regressions
+
+
+def load_baseline(path: Path) -> Dict[str, Dict[str, float]]:
+    """
+    :param path: Baseline file written with `save_baseline`.
+    :return: Recorded results per benchmark (empty if the file does not exist).
+    """
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))["results"]
+
+
+def save_baseline(path: Path, results: Dict[str, Dict[str, float]]) -> None:
+    """
+    Record results as the new baseline, merged into the benchmarks already recorded.
+
+    :param path: Baseline file.
+    :param results: Output of `run_suite`.
+    """
+    merged = {**load_baseline(path), **results}
+    document = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": dict(sorted(merged.items())),
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run the per-file hot path microbenchmarks."
+    )
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)}).",
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=DEFAULT_REPEATS, help="Measurements per benchmark."
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Factor applied to operation counts."
+    )
+    parser.add_argument(
+        "--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON file."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed median slowdown before a regression is reported (0.25 = 25%%).",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="Record the results as the new baseline."
+    )
+    args = parser.parse_args(argv)
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run_suite(args.benchmarks, args.repeats, args.scale))
+    baseline = load_baseline(args.baseline)
+
+    for name, result in results.items():
+        previous = baseline.get(name, {}).get("median_us")
+        reference = f" (baseline {previous:.3f})" if previous else ""
+        print(
+            f"{name:<26} {result['median_us']:>10.3f} us/op median, "
+            f"{result['min_us']:.3f} best{reference}"
+        )
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if regressions:
+        return 1
+
+    unrecorded = [name for name in results if name not in baseline]
+    if unrecorded:
+        print(
+            f"WARNING no baseline for {', '.join(unrecorded)} in {args.baseline}; "
+            f"record one with --save",
+            file=sys.stderr,
+        )
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
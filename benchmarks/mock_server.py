@@ -0,0 +1,152 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from aiohttp import web
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+class MockAPIServer:
+    """
+    Local stand-in for the Agify, Joke and Postman Echo APIs.
+
+    Every response can be delayed (`latency_ms` ± `jitter_ms`), a fraction of the
+    requests fail with 503 (`error_rate`), and requests beyond `rate_limit` per
+    second are rejected with 429 and rate-limit headers, like the real upstreams.
+    Calls are counted per route.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        :param latency_ms: Mean response delay, in milliseconds.
+        :param jitter_ms: Maximum random deviation from the mean delay.
+        :param error_rate: Fraction of requests answered with 503.
+        :param rate_limit: Requests per second accepted before answering 429 (0 = unlimited).
+        :param seed: Seed for the latency, error and joke generators.
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.calls: Counter = Counter()
+        self._random = random.Random(seed)
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Start serving in the current event loop.
+
+        :param host: Interface to bind.
+        :param port: Port to bind (0 = any free port).
+        :return: Base URL of the server.
+        """
+        app = web.Application(middlewares=[self._simulate])
+        app.router.add_get("/agify", self._agify, name="agify")
+        app.router.add_get("/jokes/random_joke", self._random_joke, name="random_joke")
+        app.router.add_get("/jokes/random_ten", self._random_ten, name="random_ten")
+        app.router.add_post("/postman/post", self._echo, name="postman")
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{bound_port}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _quota(self) -> Tuple[bool, Dict[str, str]]:
+        """
+        Count a request against the fixed one-second quota window.
+
+        :return: Whether the request is within the quota, and the quota headers.
+        """
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._window_start, self._window_count = now, 0
+        self._window_count += 1
+        reset = max(1.0 - (now - self._window_start), 0.001)
+        headers = {
+            "X-RateLimit-Remaining": str(max(int(self.rate_limit) - self._window_count, 0)),
+            "X-RateLimit-Reset": f"{reset:.3f}",
+        }
+        allowed = self._window_count <= self.rate_limit
+        if not allowed:
+            headers["Retry-After"] = f"{reset:.3f}"
+        return allowed, headers
+
+    @web.middleware
+    async def _simulate(self, request: web.Request, handler: Handler) -> web.StreamResponse:
+        """Count the call, then apply the quota, latency and error injection."""
+        self.calls[request.match_info.route.name or request.path] += 1
+
+        headers: Dict[str, str] = {}
+        if self.rate_limit > 0:
+            allowed, headers = self._quota()
+            if not allowed:
+                self.calls["throttled"] += 1
+                return web.json_response(
+                    {"error": "rate limited"}, status=429, headers=headers
+                )
+
+        delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.calls["errors"] += 1
+            return web.json_response({"error": "unavailable"}, status=503)
+
+        response = await handler(request)
+        response.headers.update(headers)
+        return response
+
+    def _joke(self) -> dict:
+        number = self._random.randint(1, 10_000)
+        return {"id": number, "setup": f"Joke #{number}?", "punchline": "Because."}
+
+    async def _agify(self, request: web.Request) -> web.Response:
+        country = request.query.get("country_id", "")
+        names = request.query.getall("name[]", [])
+        if names:
+            return web.json_response(
+                [self._prediction(name, country) for name in names]
+            )
+        return web.json_response(
+            self._prediction(request.query.get("name", ""), country)
+        )
+
+    @staticmethod
+    def _prediction(name: str, country: str) -> dict:
+        return {
+            "name": name,
+            "age": 20 + sum(map(ord, name)) % 50,
+            "count": 1000,
+            "country_id": country,
+        }
+
+    async def _random_joke(self, request: web.Request) -> web.Response:
+        return web.json_response(self._joke())
+
+    async def _random_ten(self, request: web.Request) -> web.Response:
+        return web.json_response([self._joke() for _ in range(10)])
+
+    async def _echo(self, request: web.Request) -> web.Response:
+        return web.json_response({"json": await request.json()})
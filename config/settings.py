@@ -8,7 +8,118 @@ INPUT_DIR = BASE_DIR / "INPUT"
 
 LOG_DIR = BASE_DIR / os.getenv("LOG_DIR", "logs")
 LOG_TO_CONSOLE = config("LOG_TO_CONSOLE", default=False, cast=bool)
+# Logging goes through a background thread; records are written in batches
+LOG_QUEUED = config("LOG_QUEUED", default=True, cast=bool)
+LOG_BUFFER_CAPACITY = config("LOG_BUFFER_CAPACITY", default=100, cast=int)
+LOG_FLUSH_INTERVAL = config("LOG_FLUSH_INTERVAL", default=1.0, cast=float)
+LOG_JSON = config("LOG_JSON", default=False, cast=bool)
+LOG_SUCCESS_SAMPLE_RATE = config("LOG_SUCCESS_SAMPLE_RATE", default=1.0, cast=float)
 
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
 PROCESS_TIME = config("PROCESS_TIME", default="18:10")
+
+# Shared HTTP connection pool used by all API clients
+HTTP_MAX_CONNECTIONS = config("HTTP_MAX_CONNECTIONS", default=100, cast=int)
+HTTP_MAX_KEEPALIVE_CONNECTIONS = config(
+    "HTTP_MAX_KEEPALIVE_CONNECTIONS", default=20, cast=int
+)
+HTTP_KEEPALIVE_EXPIRY = config("HTTP_KEEPALIVE_EXPIRY", default=30.0, cast=float)
+HTTP2_ENABLED = config("HTTP2_ENABLED", default=False, cast=bool)
+HTTP_MAX_IN_FLIGHT = config("HTTP_MAX_IN_FLIGHT", default=50, cast=int)
+
+# Processing concurrency (0 workers = process every file at once)
+PROCESS_WORKERS = config("PROCESS_WORKERS", default=64, cast=int)
+FILE_IO_CONCURRENCY = config("FILE_IO_CONCURRENCY", default=32, cast=int)
+READ_WORKERS = config("READ_WORKERS", default=8, cast=int)
+PIPELINE_QUEUE_SIZE = config("PIPELINE_QUEUE_SIZE", default=1000, cast=int)
+PRELOAD_WINDOW_SIZE = config("PRELOAD_WINDOW_SIZE", default=500, cast=int)
+PRELOAD_WINDOW_SECONDS = config("PRELOAD_WINDOW_SECONDS", default=0.5, cast=float)
+
+# Dedicated file I/O thread pool (operations per submission, fsync before deleting input)
+FILE_IO_THREADS = config("FILE_IO_THREADS", default=16, cast=int)
+FILE_IO_BATCH_SIZE = config("FILE_IO_BATCH_SIZE", default=16, cast=int)
+FILE_IO_FSYNC = config("FILE_IO_FSYNC", default=True, cast=bool)
+
+# Persistent age-prediction cache
+AGE_CACHE_ENABLED = config("AGE_CACHE_ENABLED", default=True, cast=bool)
+AGE_CACHE_PATH = BASE_DIR / config("AGE_CACHE_PATH", default="cache/age_cache.sqlite3")
+AGE_CACHE_TTL_HOURS = config("AGE_CACHE_TTL_HOURS", default=720.0, cast=float)
+AGE_CACHE_MAX_ENTRIES = config("AGE_CACHE_MAX_ENTRIES", default=100000, cast=int)
+
+# Agify batch preloading
+AGIFY_BATCH_CONCURRENCY = config("AGIFY_BATCH_CONCURRENCY", default=5, cast=int)
+AGE_BATCH_WINDOW_MS = config("AGE_BATCH_WINDOW_MS", default=20.0, cast=float)
+
+# Joke reservoir filled from the bulk endpoint (0 = fetch every joke individually)
+JOKE_RESERVOIR_SIZE = config("JOKE_RESERVOIR_SIZE", default=50, cast=int)
+JOKE_RESERVOIR_LOW_WATER = config("JOKE_RESERVOIR_LOW_WATER", default=10, cast=int)
+JOKE_PREFILL_CONCURRENCY = config("JOKE_PREFILL_CONCURRENCY", default=5, cast=int)
+
+# Bulk forwarding of results to Postman Echo (off = one POST per file)
+POSTMAN_BULK_ENABLED = config("POSTMAN_BULK_ENABLED", default=False, cast=bool)
+POSTMAN_BULK_SIZE = config("POSTMAN_BULK_SIZE", default=100, cast=int)
+POSTMAN_BULK_WINDOW_MS = config("POSTMAN_BULK_WINDOW_MS", default=50.0, cast=float)
+
+# Per-host rate limits in requests/second (0 = only follow upstream quota headers)
+AGIFY_RATE_LIMIT = config("AGIFY_RATE_LIMIT", default=0.0, cast=float)
+AGIFY_RATE_BURST = config("AGIFY_RATE_BURST", default=10, cast=int)
+JOKE_RATE_LIMIT = config("JOKE_RATE_LIMIT", default=0.0, cast=float)
+JOKE_RATE_BURST = config("JOKE_RATE_BURST", default=10, cast=int)
+POSTMAN_RATE_LIMIT = config("POSTMAN_RATE_LIMIT", default=0.0, cast=float)
+POSTMAN_RATE_BURST = config("POSTMAN_RATE_BURST", default=10, cast=int)
+# Remaining upstream quota below which requests are paced to last until the reset
+RATE_LIMIT_LOW_QUOTA = config("RATE_LIMIT_LOW_QUOTA", default=100, cast=int)
+
+# Retries and circuit breaking for upstream API calls
+HTTP_MAX_RETRIES = config("HTTP_MAX_RETRIES", default=2, cast=int)
+HTTP_RETRY_BACKOFF = config("HTTP_RETRY_BACKOFF", default=0.2, cast=float)
+HTTP_RETRY_MAX_BACKOFF = config("HTTP_RETRY_MAX_BACKOFF", default=5.0, cast=float)
+HTTP_RETRY_BUDGET_RATIO = config("HTTP_RETRY_BUDGET_RATIO", default=0.2, cast=float)
+CIRCUIT_FAILURE_THRESHOLD = config("CIRCUIT_FAILURE_THRESHOLD", default=5, cast=int)
+CIRCUIT_RECOVERY_SECONDS = config("CIRCUIT_RECOVERY_SECONDS", default=30.0, cast=float)
+
+# Multi-process execution (1 = single process)
+PROCESS_SHARDS = config("PROCESS_SHARDS", default=1, cast=int)
+
+# Continuous watch mode
+WATCH_USE_INOTIFY = config("WATCH_USE_INOTIFY", default=True, cast=bool)
+WATCH_DEBOUNCE_SECONDS = config("WATCH_DEBOUNCE_SECONDS", default=1.0, cast=float)
+WATCH_POLL_INTERVAL = config("WATCH_POLL_INTERVAL", default=5.0, cast=float)
+WATCH_RETRY_SECONDS = config("WATCH_RETRY_SECONDS", default=30.0, cast=float)
+
+# Input discovery
+DISCOVERY_PARALLELISM = config("DISCOVERY_PARALLELISM", default=4, cast=int)
+SCAN_CHECKPOINT_ENABLED = config("SCAN_CHECKPOINT_ENABLED", default=True, cast=bool)
+SCAN_CHECKPOINT_PATH = BASE_DIR / config(
+    "SCAN_CHECKPOINT_PATH", default="cache/scan_checkpoint.json"
+)
+
+# Crash-safe run journal (files with a received response whose output is not written yet)
+JOURNAL_ENABLED = config("JOURNAL_ENABLED", default=True, cast=bool)
+JOURNAL_PATH = BASE_DIR / config("JOURNAL_PATH", default="cache/run_journal.jsonl")
+JOURNAL_FSYNC = config("JOURNAL_FSYNC", default=False, cast=bool)
+JOURNAL_COMPACT_RECORDS = config("JOURNAL_COMPACT_RECORDS", default=1000, cast=int)
+
+# JSON encoding ("auto" picks orjson, then msgspec, then the standard library)
+JSON_CODEC = config("JSON_CODEC", default="auto")
+JSON_OUTPUT_STYLE = config("JSON_OUTPUT_STYLE", default="pretty")
+
+# Prometheus textfile export of run metrics (interval applies while a run is in progress)
+METRICS_ENABLED = config("METRICS_ENABLED", default=True, cast=bool)
+METRICS_TEXTFILE_PATH = BASE_DIR / config(
+    "METRICS_TEXTFILE_PATH", default="metrics/json_processor.prom"
+)
+METRICS_EXPORT_INTERVAL = config("METRICS_EXPORT_INTERVAL", default=15.0, cast=float)
+
+# Profiling of --profile runs (CPU profile, slow event-loop callbacks, memory peak)
+PROFILE_DIR = LOG_DIR / config("PROFILE_DIR", default="profiles")
+PROFILE_SLOW_CALLBACK_MS = config("PROFILE_SLOW_CALLBACK_MS", default=100.0, cast=float)
+PROFILE_TRACEMALLOC_FRAMES = config("PROFILE_TRACEMALLOC_FRAMES", default=10, cast=int)
+PROFILE_MEMORY_INTERVAL = config("PROFILE_MEMORY_INTERVAL", default=1.0, cast=float)
+PROFILE_MEMORY_TOP = config("PROFILE_MEMORY_TOP", default=25, cast=int)
+
+# Chrome/Perfetto trace of the stages of every file (one JSON file per run)
+TRACE_ENABLED = config("TRACE_ENABLED", default=False, cast=bool)
+TRACE_DIR = LOG_DIR / config("TRACE_DIR", default="traces")
+TRACE_MAX_EVENTS = config("TRACE_MAX_EVENTS", default=1_000_000, cast=int)
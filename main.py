@@ -1,13 +1,51 @@
-import asyncio
+import argparse
 from pathlib import Path
+from typing import Dict
 
+from config.settings import PROCESS_SHARDS
 from resources.processor import AsyncJsonProcessor
+from resources.sharded_runner import run_sharded
+from utils.profiling import run_maybe_profiled
 
 
-def main(input_dir: Path = Path("INPUT")):
+def main(
+    input_dir: Path = Path("INPUT"),
+    processes: int = PROCESS_SHARDS,
+    share_age_cache: bool = True,
+    profile: bool = False,
+) -> Dict[str, int]:
+    if processes > 1:
+        return run_sharded(input_dir, processes, share_age_cache, profile)
+
     processor = AsyncJsonProcessor(input_dir)
-    asyncio.run(processor.process_all())
+    return run_maybe_profiled(processor.process_all(), profile, label="main")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Process JSON task files.")
+    parser.add_argument(
+        "--input", type=Path, default=Path("INPUT"), help="Input directory."
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=PROCESS_SHARDS,
+        help="Number of worker processes to shard the input across.",
+    )
+    parser.add_argument(
+        "--no-shared-cache",
+        action="store_true",
+        help="Do not share the persistent age cache between worker processes.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write CPU (event loop and I/O threads), slow-callback and memory "
+        "profiles of the run next to the logs.",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(args.input, args.processes, not args.no_shared_cache, args.profile)
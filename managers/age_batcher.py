@@ -0,0 +1,112 @@
+import asyncio
+from typing import Any, Dict, List, Set
+
+from config.settings import AGE_BATCH_WINDOW_MS
+from services.api_clients import AgifyClient
+from utils.logger import info_logger
+
+
+class AgeMicroBatcher:
+    """
+    Collects concurrent single-name age lookups into Agify batch requests.
+
+    Lookups for the same country that arrive within a short window are sent as one
+    `get_batch_ages` call (up to Agify's 10-name limit), and each caller receives
+    the prediction for its own name. A lone lookup uses the single-name endpoint.
+    """
+
+    MAX_BATCH_SIZE: int = 10
+
+    def __init__(
+        self,
+        agify_client: AgifyClient,
+        window_seconds: float = AGE_BATCH_WINDOW_MS / 1000,
+    ) -> None:
+        """
+        :param agify_client: Client used to send the requests.
+        :param window_seconds: How long to wait for more lookups before sending (0 = no batching).
+        """
+        self.agify_client = agify_client
+        self.window_seconds = window_seconds
+        self._pending: Dict[str, Dict[str, List[asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._requests: Set[asyncio.Task] = set()
+
+    async def get_age(self, name: str, country: str) -> Dict[str, Any]:
+        """
+        Get the age prediction for a name, batched with other concurrent lookups.
+
+        :param name: Person's name.
+        :param country: Country code (ISO 3166-1 alpha-2).
+        :return: API response containing the age prediction.
+        """
+        if self.window_seconds <= 0:
+            return await self.agify_client.get_age(name, country)
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        group = self._pending.setdefault(country, {})
+        group.setdefault(name, []).append(future)
+
+        if len(group) >= self.MAX_BATCH_SIZE:
+            self._flush(country)
+        elif country not in self._timers:
+            self._timers[country] = loop.call_later(
+                self.window_seconds, self._flush, country
+            )
+
+        return await future
+
+    def _flush(self, country: str) -> None:
+        """
+        Send the lookups collected for a country.
+
+        :param country: Country whose pending names are sent.
+        """
+        timer = self._timers.pop(country, None)
+        if timer is not None:
+            timer.cancel()
+
+        group = self._pending.pop(country, None)
+        if not group:
+            return
+
+        task = asyncio.create_task(self._send(country, group))
+        self._requests.add(task)
+        task.add_done_callback(self._requests.discard)
+
+    async def _send(self, country: str, group: Dict[str, List[asyncio.Future]]) -> None:
+        """
+        Request predictions for a group of names and resolve the waiting futures.
+
+        :param country: Country code of the group.
+        :param group: Mapping of name to the futures waiting for it.
+        """
+        names = list(group)
+        try:
+            if len(names) == 1:
+                results = {names[0]: await self.agify_client.get_age(names[0], country)}
+            else:
+                batch = await self.agify_client.get_batch_ages(names, country)
+                results = {result.get("name"): result for result in batch}
+                info_logger.info(
+                    f"[MICROBATCH] {len(names)} names in {country}: {', '.join(names)}"
+                )
+        except Exception as e:
+            for futures in group.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for name, futures in group.items():
+            result = results.get(name)
+            for future in futures:
+                if future.done():
+                    continue
+                if result is None:
+                    future.set_exception(
+                        KeyError(f"No age prediction returned for '{name}' ({country})")
+                    )
+                else:
+                    future.set_result(result)
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import math
+import sqlite3
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from config.settings import AGE_CACHE_MAX_ENTRIES, AGE_CACHE_TTL_HOURS
+from utils.logger import info_logger, error_logger
+
+AgeKey = Tuple[str, str]
+
+
+class _Entry:
+    """Cached prediction with its expiry time (slotted to keep entries small)."""
+
+    __slots__ = ("value", "expires_at")
+
+    def __init__(self, value: Dict[str, Any], expires_at: float) -> None:
+        self.value = value
+        self.expires_at = expires_at
+
+
+class AgeCache:
+    """
+    Bounded cache of age predictions keyed by (name, country).
+
+    Lookups are served from memory. At most `max_entries` predictions are kept;
+    the least recently used one is evicted when the limit is reached, so long-lived
+    processes (e.g. watch mode) do not grow without bound. Keys are interned, since
+    the same names and country codes repeat across thousands of files.
+
+    When a database path is given, entries are persisted to SQLite with a per-entry
+    expiry, loaded back on `open` (warm start) and written in bulk on `flush`, so
+    predictions survive between daily runs.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        ttl_seconds: float = AGE_CACHE_TTL_HOURS * 3600,
+        max_entries: int = AGE_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """
+        :param db_path: SQLite file used for persistence, or None for a memory-only cache.
+        :param ttl_seconds: Lifetime of an entry before it is considered stale (0 = no expiry).
+        :param max_entries: Maximum number of entries kept in memory (0 = unbounded).
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: OrderedDict[AgeKey, _Entry] = OrderedDict()
+        self._dirty: Dict[AgeKey, _Entry] = {}
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._entries.get(key)  # type: ignore[arg-type]
+        return entry is not None and entry.expires_at > time.time()
+
+    def __getitem__(self, key: AgeKey) -> Dict[str, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError(key)
+        if entry.expires_at <= time.time():
+            del self._entries[key]
+            self.expirations += 1
+            raise KeyError(key)
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def __setitem__(self, key: AgeKey, value: Dict[str, Any]) -> None:
+        expires_at = (
+            time.time() + self.ttl_seconds if self.ttl_seconds > 0 else math.inf
+        )
+        entry = self._store((sys.intern(key[0]), sys.intern(key[1])), value, expires_at)
+        if self.db_path is not None:
+            self._dirty[key] = entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: AgeKey) -> Optional[Dict[str, Any]]:
+        """
+        Look up a prediction and record the hit or miss.
+
+        :param key: (name, country) tuple.
+        :return: The cached prediction, or None if missing or expired.
+        """
+        try:
+            value = self[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def update(self, items: Iterable[Tuple[AgeKey, Dict[str, Any]]]) -> None:
+        """
+        Store several predictions at once.
+
+        :param items: Iterable of ((name, country), prediction) pairs.
+        """
+        for key, value in items:
+            self[key] = value
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the cache counters and the current number of entries.
+
+        :return: Dictionary with "hits", "misses", "evictions", "expirations" and "size".
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self),
+        }
+
+    def _store(self, key: AgeKey, value: Dict[str, Any], expires_at: float) -> _Entry:
+        """
+        Insert or refresh an entry as the most recently used one, evicting if full.
+
+        :param key: Interned (name, country) tuple.
+        :param value: Prediction to cache.
+        :param expires_at: Unix time after which the entry is stale.
+        :return: The stored entry.
+        """
+        entry = _Entry(value, expires_at)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if self.max_entries > 0:
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    async def open(self) -> None:
+        """Warm-start the cache from the database, if persistence is enabled."""
+        if self.db_path is None:
+            return
+        try:
+            loaded = await asyncio.to_thread(self._load)
+            info_logger.info(f"[CACHE] Warm start: {loaded} age predictions loaded")
+        except sqlite3.Error as e:
+            error_logger.error(f"[CACHE] Failed to load age cache: {str(e)}")
+
+    async def flush(self) -> None:
+        """Write entries added since the last flush to the database."""
+        if self.db_path is None or not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, {}
+        try:
+            await asyncio.to_thread(self._save, dirty)
+        except sqlite3.Error as e:
+            self._dirty = {**dirty, **self._dirty}
+            error_logger.error(f"[CACHE] Failed to persist age cache: {str(e)}")
+
+    async def close(self) -> None:
+        """Flush pending entries and log the cache counters."""
+        await self.flush()
+        info_logger.info(f"[CACHE] Age cache stats: {self.stats()}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the cache database, creating the schema if needed."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS age_cache ("
+            "name TEXT NOT NULL, country TEXT NOT NULL, payload TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, PRIMARY KEY (name, country))"
+        )
+        return connection
+
+    def _load(self) -> int:
+        """Drop expired rows and load the remaining ones into memory."""
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("DELETE FROM age_cache WHERE expires_at <= ?", (now,))
+            rows = connection.execute(
+                "SELECT name, country, payload, expires_at FROM age_cache "
+                "ORDER BY expires_at"
+            ).fetchall()
+        connection.close()
+
+        if self.max_entries > 0:
+            rows = rows[-self.max_entries :]
+        for name, country, payload, expires_at in rows:
+            key = (sys.intern(name), sys.intern(country))
+            self._store(key, json.loads(payload), expires_at)
+        return len(rows)
+
+    def _save(self, entries: Dict[AgeKey, _Entry]) -> None:
+        """Upsert entries into the database."""
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO age_cache VALUES (?, ?, ?, ?)",
+                [
+                    (name, country, json.dumps(entry.value), entry.expires_at)
+                    for (name, country), entry in entries.items()
+                ],
+            )
+        connection.close()
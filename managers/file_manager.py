@@ -1,12 +1,272 @@
-import json
+import asyncio
+import contextlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple, TypeVar
 
-import aiofiles
-import aiofiles.os
+from config.settings import (
+    DISCOVERY_PARALLELISM,
+    FILE_IO_BATCH_SIZE,
+    FILE_IO_FSYNC,
+    FILE_IO_THREADS,
+)
+from managers.scan_checkpoint import ScanCheckpoint
+from utils.json_codec import codec
+from utils.logger import error_logger
+from utils.metrics import STAGE_SECONDS, Metrics
+
+PROCESSED_JSON_SUFFIX = "_processed.json"
+
+T = TypeVar("T")
+
+
+class _ScanStopped(Exception):
+    """Raised inside walker threads when the consumer stopped iterating."""
+
+
+def _scan_directory(
+    directory: Path, exclude_suffix: str, checkpoint: Optional[ScanCheckpoint]
+) -> Tuple[List[Path], List[Path]]:
+    """
+    List one directory with os.scandir (runs in a worker thread).
+
+    :param directory: Directory to list.
+    :param exclude_suffix: Suffix of output files that are not task files.
+    :param checkpoint: Optional checkpoint of drained directories.
+    :return: Task files and subdirectories of the directory.
+    """
+    mtime_ns = os.stat(directory).st_mtime_ns
+    if checkpoint is not None:
+        subdirs = checkpoint.drained_subdirs(directory, mtime_ns)
+        if subdirs is not None:
+            return [], subdirs
+
+    files: List[Path] = []
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(Path(entry.path))
+            elif (
+                entry.name.endswith(".json")
+                and not entry.name.endswith(exclude_suffix)
+                and entry.is_file()
+            ):
+                files.append(Path(entry.path))
+
+    if checkpoint is not None:
+        checkpoint.record(directory, mtime_ns, bool(files), subdirs)
+    return files, subdirs
+
+
+def _walk_tree(
+    root: Path,
+    emit: Callable[[List[Path]], None],
+    exclude_suffix: str,
+    checkpoint: Optional[ScanCheckpoint],
+) -> None:
+    """
+    Walk a directory tree depth-first and emit its task files per directory.
+
+    :param root: Root of the subtree.
+    :param emit: Callback receiving the task files of each directory.
+    :param exclude_suffix: Suffix of output files that are not task files.
+    :param checkpoint: Optional checkpoint of drained directories.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            files, subdirs = _scan_directory(directory, exclude_suffix, checkpoint)
+        except OSError as e:
+            error_logger.error(f"[SCAN] Cannot list {directory}: {str(e)}")
+            continue
+        stack.extend(subdirs)
+        if files:
+            emit(files)
+
+
+def _read_json_file(path: Path) -> Any:
+    """Open, read and parse a JSON file (runs in an I/O thread)."""
+    with Metrics.timer(STAGE_SECONDS, stage="read"):
+        with open(path, "rb") as f:
+            return codec.loads(f.read())
+
+
+def _write_json_file(path: Path, data: Any, fsync: bool) -> None:
+    """
+    Serialize a JSON file to a temporary file and rename it into place (runs in an I/O thread).
+
+    The rename is atomic, so a crash never leaves a truncated output behind.
+    """
+    with Metrics.timer(STAGE_SECONDS, stage="write"):
+        payload = codec.dumps(data)
+        tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Make renames in a directory durable (no-op where directories cannot be opened)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def _delete_file(path: Path) -> None:
+    """Delete a file (runs in an I/O thread)."""
+    with Metrics.timer(STAGE_SECONDS, stage="delete"):
+        os.remove(path)
+
+
+def _write_json_and_delete(path: Path, data: Any, source: Path, fsync: bool) -> None:
+    """Write a JSON file, then delete its source (runs in an I/O thread)."""
+    _write_json_file(path, data, fsync)
+    if fsync:
+        _fsync_directory(path.parent)
+    _delete_file(source)
+
+
+def _run_batch(operations: List[Callable[[], Any]]) -> List[Tuple[bool, Any]]:
+    """
+    Run file operations one after another in a single I/O thread.
+
+    :param operations: Zero-argument callables.
+    :return: (succeeded, result or exception) for every operation, in order.
+    """
+    outcomes = []
+    for operation in operations:
+        try:
+            outcomes.append((True, operation()))
+        except Exception as e:
+            outcomes.append((False, e))
+    return outcomes
+
+
+class FileIOEngine:
+    """
+    Runs blocking file operations on a dedicated thread pool in batches.
+
+    Each operation is a complete unit of work (e.g. open, read and parse a file, or
+    serialize, write, fsync and delete), so it costs one thread hop instead of one
+    per system call. Operations requested during the same event-loop iteration are
+    grouped, up to `batch_size` at a time, and handed to the pool as a single
+    submission; task files are small, so batching trades a little per-file latency
+    for far fewer thread handoffs.
+    """
+
+    def __init__(
+        self,
+        threads: int = FILE_IO_THREADS,
+        batch_size: int = FILE_IO_BATCH_SIZE,
+        fsync: bool = FILE_IO_FSYNC,
+        thread_initializer: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        :param threads: Size of the dedicated I/O thread pool.
+        :param batch_size: Maximum operations per submission (1 = no batching).
+        :param fsync: Whether written files are fsynced before their source is deleted.
+        :param thread_initializer: Called in every new pool thread (e.g. to start a profiler).
+        """
+        self.threads = max(threads, 1)
+        self.batch_size = max(batch_size, 1)
+        self.fsync = fsync
+        self.thread_initializer = thread_initializer
+        self.submissions = 0
+        self.operations = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Tuple[Callable[[], Any], asyncio.Future]] = []
+
+    async def run(self, operation: Callable[[], T]) -> T:
+        """
+        Run a blocking operation on the I/O pool.
+
+        :param operation: Zero-argument callable performing the file work.
+        :return: The operation's result.
+        :raises Exception: Whatever the operation raised.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending:
+            loop.call_soon(self._flush)
+        self._pending.append((operation, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        return await future
+
+    def close(self) -> None:
+        """Shut the I/O pool down; it is recreated on the next operation."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _flush(self) -> None:
+        """Submit all pending operations as one batch."""
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.threads,
+                thread_name_prefix="file-io",
+                initializer=self.thread_initializer,
+            )
+        self.submissions += 1
+        self.operations += len(batch)
+        done = asyncio.get_running_loop().run_in_executor(
+            self._executor, _run_batch, [operation for operation, _ in batch]
+        )
+        done.add_done_callback(lambda outcome: self._resolve(batch, outcome))
+
+    @staticmethod
+    def _resolve(
+        batch: List[Tuple[Callable[[], Any], asyncio.Future]], outcome: asyncio.Future
+    ) -> None:
+        """Hand every operation's result or exception to its waiter."""
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if outcome.cancelled():
+                future.cancel()
+            elif outcome.exception() is not None:
+                future.set_exception(outcome.exception())
+            else:
+                succeeded, value = outcome.result()[index]
+                if succeeded:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
 
 
 class AsyncFileManager:
+    _engine: Optional[FileIOEngine] = None
+
+    @classmethod
+    def engine(cls) -> FileIOEngine:
+        """
+        :return: The process-wide file I/O engine, created on first use.
+        """
+        if cls._engine is None:
+            cls._engine = FileIOEngine()
+        return cls._engine
+
     @staticmethod
     async def get_json_files(input_path: Path) -> list[Path]:
         """
@@ -15,40 +275,148 @@ class AsyncFileManager:
         Note:
             The input directory may contain multiple folders with arbitrary names
             (e.g. per day), and JSON files are expected to be inside those folders.
+            Processed outputs (`*_processed.json`) are not returned.
 
         :param input_path: The INPUT directory path where folders are placed.
         :return: List of Path objects pointing to JSON files.
         """
-        return list(input_path.rglob("*.json"))
+        return [path async for path in AsyncFileManager.iter_json_files(input_path)]
 
     @staticmethod
-    async def read_json(path: Path) -> dict[str, Any]:
+    async def iter_json_files(
+        input_path: Path,
+        exclude_suffix: str = PROCESSED_JSON_SUFFIX,
+        checkpoint: Optional[ScanCheckpoint] = None,
+        parallelism: int = DISCOVERY_PARALLELISM,
+    ) -> AsyncIterator[Path]:
+        """
+        Lazily yields JSON files from nested subdirectories of the input path.
+
+        Each top-level folder (e.g. one per day) is walked with os.scandir in its own
+        thread of a dedicated pool, so the event loop is never blocked and paths are
+        yielded as soon as their directory has been read. Output files ending with
+        `exclude_suffix` are skipped during the walk. Directories recorded as drained
+        in `checkpoint` and unchanged since are not listed again.
+
+        :param input_path: The INPUT directory path where folders are placed.
+        :param exclude_suffix: Suffix of output files that are not task files.
+        :param checkpoint: Optional checkpoint of drained directories.
+        :param parallelism: Number of folders walked in parallel.
+        :return: Async iterator of Path objects pointing to JSON files.
+        """
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(
+            max_workers=max(parallelism, 1), thread_name_prefix="scan"
+        )
+        batches: asyncio.Queue[Optional[List[Path]]] = asyncio.Queue(
+            maxsize=max(parallelism, 1) * 4
+        )
+        stopped = threading.Event()
+
+        def emit(files: List[Path]) -> None:
+            # Blocks the walker thread while the queue is full (backpressure).
+            future = asyncio.run_coroutine_threadsafe(batches.put(files), loop)
+            while True:
+                try:
+                    return future.result(timeout=0.1)
+                except FutureTimeoutError:
+                    if stopped.is_set():
+                        future.cancel()
+                        raise _ScanStopped()
+
+        async def walk_all() -> None:
+            try:
+                try:
+                    files, subdirs = await loop.run_in_executor(
+                        executor,
+                        _scan_directory,
+                        input_path,
+                        exclude_suffix,
+                        checkpoint,
+                    )
+                except OSError as e:
+                    error_logger.error(f"[SCAN] Cannot list {input_path}: {str(e)}")
+                    return
+                if files:
+                    await batches.put(files)
+                await asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            executor,
+                            _walk_tree,
+                            subdir,
+                            emit,
+                            exclude_suffix,
+                            checkpoint,
+                        )
+                        for subdir in subdirs
+                    )
+                )
+            finally:
+                await batches.put(None)
+
+        walker = asyncio.create_task(walk_all())
+        try:
+            while (batch := await batches.get()) is not None:
+                for path in batch:
+                    yield path
+            await walker
+        finally:
+            stopped.set()
+            walker.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    async def read_json(cls, path: Path) -> dict[str, Any]:
         """
         Asynchronously reads and parses a JSON file.
 
+        Opening, reading and parsing happen in a single I/O-pool submission, and the
+        raw bytes are handed to the configured JSON codec without decoding.
+
         :param path: The path to the JSON file.
         :return: The file content as a dictionary.
+        :raises ValueError: If the file is not valid JSON.
         """
-        async with aiofiles.open(path, "r", encoding="utf-8") as f:
-            content = await f.read()
-            return json.loads(content)
+        return await cls.engine().run(partial(_read_json_file, path))
 
-    @staticmethod
-    async def write_json(path: Path, data: dict[str, Any]) -> None:
+    @classmethod
+    async def write_json(cls, path: Path, data: dict[str, Any]) -> None:
         """
         Asynchronously writes a dictionary to a file in JSON format.
 
+        The output style (pretty or compact) follows JSON_OUTPUT_STYLE.
+
         :param path: The file path to write to.
         :param data: The dictionary to serialize and write.
         """
-        async with aiofiles.open(path, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(data, indent=2, ensure_ascii=False))
+        engine = cls.engine()
+        await engine.run(partial(_write_json_file, path, data, engine.fsync))
 
-    @staticmethod
-    async def delete_file(path: Path) -> None:
+    @classmethod
+    async def write_json_and_delete(
+        cls, path: Path, data: dict[str, Any], source: Path
+    ) -> None:
+        """
+        Writes a dictionary to a JSON file, then deletes the source file.
+
+        Serialization, writing, fsync and deletion happen in a single I/O-pool
+        submission. The source is only deleted once the output is written.
+
+        :param path: The file path to write to.
+        :param data: The dictionary to serialize and write.
+        :param source: The file to delete afterwards.
+        """
+        engine = cls.engine()
+        await engine.run(
+            partial(_write_json_and_delete, path, data, source, engine.fsync)
+        )
+
+    @classmethod
+    async def delete_file(cls, path: Path) -> None:
         """
         Asynchronously deletes a file from the filesystem.
 
         :param path: The path of the file to delete.
         """
-        await aiofiles.os.remove(path)
+        await cls.engine().run(partial(_delete_file, path))
@@ -0,0 +1,347 @@
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from config.settings import (
+    WATCH_DEBOUNCE_SECONDS,
+    WATCH_POLL_INTERVAL,
+    WATCH_RETRY_SECONDS,
+    WATCH_USE_INOTIFY,
+)
+from utils.logger import info_logger, error_logger
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+Signature = Tuple[int, int]
+
+
+class Inotify:
+    """Minimal ctypes binding to the Linux inotify API."""
+
+    def __init__(self) -> None:
+        """
+        :raises OSError: If inotify is not available on this platform.
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd: int = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: Path, mask: int = WATCH_MASK) -> int:
+        """
+        Watch a single directory.
+
+        :param path: Directory to watch.
+        :param mask: inotify event mask.
+        :return: The watch descriptor.
+        :raises OSError: If the watch cannot be added.
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        return wd
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """
+        Read all pending events without blocking.
+
+        :return: List of (watch descriptor, mask, name) tuples.
+        """
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            name = buffer[offset : offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        """Close the inotify file descriptor."""
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """
+    Streams new JSON task files under a directory as soon as they are complete.
+
+    Uses inotify (close-for-writing and move-in events) when available, and falls
+    back to periodic polling otherwise. Every candidate is debounced: it is only
+    yielded after its size and modification time have stayed unchanged for
+    `debounce_seconds`, so partially written files are never picked up. A file
+    whose processing failed can be handed back with `retry` to be yielded again.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        exclude_suffix: str = "_processed.json",
+        debounce_seconds: float = WATCH_DEBOUNCE_SECONDS,
+        poll_interval: float = WATCH_POLL_INTERVAL,
+        use_inotify: bool = WATCH_USE_INOTIFY,
+        retry_seconds: float = WATCH_RETRY_SECONDS,
+    ) -> None:
+        """
+        :param root: Directory to watch recursively.
+        :param exclude_suffix: File name suffix of output files that must be ignored.
+        :param debounce_seconds: Time a file must stay unchanged before it is yielded.
+        :param poll_interval: Seconds between scans in polling mode.
+        :param use_inotify: Whether to try inotify before falling back to polling.
+        :param retry_seconds: Delay before a file handed back with `retry` is yielded again.
+        """
+        self.root = root
+        self.exclude_suffix = exclude_suffix
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.retry_seconds = retry_seconds
+        self._ready: asyncio.Queue[Path] = asyncio.Queue()
+        self._timers: Dict[Path, asyncio.TimerHandle] = {}
+        self._emitted: Dict[Path, Signature] = {}
+        self._watches: Dict[int, Path] = {}
+        self._inotify: Optional[Inotify] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def is_candidate(self, name: str) -> bool:
+        """
+        :param name: File name.
+        :return: True if the file is a JSON task file (not a processed output).
+        """
+        return name.endswith(".json") and not name.endswith(self.exclude_suffix)
+
+    async def watch(self) -> AsyncIterator[Path]:
+        """
+        Yield existing and newly completed task files, forever.
+
+        :return: Async iterator of Paths ready for processing.
+        """
+        self._ready = asyncio.Queue()
+        self._spawn(self._start())
+        try:
+            while True:
+                yield await self._ready.get()
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+            if self._inotify is not None:
+                asyncio.get_running_loop().remove_reader(self._inotify.fd)
+                self._inotify.close()
+                self._inotify = None
+
+    def retry(self, path: Path) -> None:
+        """
+        Yield a file again after `retry_seconds`, although its signature is unchanged.
+
+        Meant for files whose processing failed and that are still in place; a file
+        removed in the meantime is dropped as usual.
+
+        :param path: File previously yielded by `watch`.
+        """
+        self._emitted.pop(path, None)
+        timer = self._timers.pop(path, None)
+        if timer is not None:
+            timer.cancel()
+        self._timers[path] = asyncio.get_running_loop().call_later(
+            self.retry_seconds, self._schedule, path
+        )
+
+    def _spawn(self, coroutine) -> None:
+        """Run a background coroutine, keeping a reference until it finishes."""
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        """Forget a finished background task and log its failure, if any."""
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            error_logger.error(f"[WATCH] Watcher task failed: {task.exception()}")
+
+    async def _start(self) -> None:
+        """Start inotify (or polling) and schedule the files already present."""
+        if self.use_inotify:
+            try:
+                self._inotify = Inotify()
+            except OSError as e:
+                error_logger.error(
+                    f"[WATCH] inotify unavailable ({str(e)}). Falling back to polling."
+                )
+
+        if self._inotify is None:
+            info_logger.info(
+                f"[WATCH] Polling {self.root} every {self.poll_interval} seconds"
+            )
+            await self._poll_forever()
+            return
+
+        asyncio.get_running_loop().add_reader(self._inotify.fd, self._on_events)
+        info_logger.info(f"[WATCH] Watching {self.root} with inotify")
+        await self._add_tree(self.root)
+
+    async def _add_tree(self, directory: Path) -> None:
+        """
+        Watch a directory tree and schedule the task files it already contains.
+
+        Watches are added before listing, so files created meanwhile are not missed.
+
+        :param directory: Root of the tree to add.
+        """
+        found = await asyncio.to_thread(self._watch_and_list, directory)
+        for path in found:
+            self._schedule(path)
+
+    def _watch_and_list(self, directory: Path) -> List[Path]:
+        """Add inotify watches for a tree and return its task files (runs in a thread)."""
+        found = []
+        for dirpath, _, filenames in os.walk(directory):
+            try:
+                wd = self._inotify.add_watch(Path(dirpath))
+                self._watches[wd] = Path(dirpath)
+            except OSError as e:
+                error_logger.error(f"[WATCH] {str(e)}")
+            found.extend(
+                Path(dirpath) / name for name in filenames if self.is_candidate(name)
+            )
+        return found
+
+    def _on_events(self) -> None:
+        """Handle readable inotify events on the event loop."""
+        for wd, mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                error_logger.error("[WATCH] inotify queue overflow. Rescanning.")
+                self._spawn(self._add_tree(self.root))
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / name
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._spawn(self._add_tree(path))
+                continue
+            if not self.is_candidate(name):
+                continue
+
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                self._schedule(path)
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                self._forget(path)
+
+    async def _poll_forever(self) -> None:
+        """Scan the tree periodically and schedule new or changed task files."""
+        while True:
+            snapshot = await asyncio.to_thread(self._scan)
+            for path in list(self._emitted):
+                if path not in snapshot:
+                    self._forget(path)
+            for path, signature in snapshot.items():
+                if self._emitted.get(path) != signature and path not in self._timers:
+                    self._schedule(path)
+            await asyncio.sleep(self.poll_interval)
+
+    def _scan(self) -> Dict[Path, Signature]:
+        """Return the signature of every task file in the tree (runs in a thread)."""
+        snapshot = {}
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if not self.is_candidate(name):
+                    continue
+                path = Path(dirpath) / name
+                signature = self._signature(path)
+                if signature is not None:
+                    snapshot[path] = signature
+        return snapshot
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[Signature]:
+        """
+        :param path: File path.
+        :return: (size, mtime in ns) of the file, or None if it no longer exists.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _schedule(self, path: Path) -> None:
+        """
+        (Re)start the debounce timer of a file.
+
+        :param path: Candidate task file.
+        """
+        timer = self._timers.pop(path, None)
+        if timer is not None:
+            timer.cancel()
+        signature = self._signature(path)
+        if signature is None:
+            return
+        self._timers[path] = asyncio.get_running_loop().call_later(
+            self.debounce_seconds, self._settle, path, signature
+        )
+
+    def _settle(self, path: Path, signature: Signature) -> None:
+        """
+        Yield a file whose signature did not change during the debounce period.
+
+        :param path: Candidate task file.
+        :param signature: Signature recorded when the timer was started.
+        """
+        self._timers.pop(path, None)
+        current = self._signature(path)
+        if current is None:
+            return
+        if current != signature:
+            self._schedule(path)
+            return
+        if self._emitted.get(path) == current:
+            return
+        self._emitted[path] = current
+        self._ready.put_nowait(path)
+
+    def _forget(self, path: Path) -> None:
+        """
+        Drop all state about a file that was removed.
+
+        :param path: Removed file.
+        """
+        self._emitted.pop(path, None)
+        timer = self._timers.pop(path, None)
+        if timer is not None:
+            timer.cancel()
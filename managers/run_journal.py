@@ -0,0 +1,218 @@
+import asyncio
+import os
+import threading
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional
+
+from config.settings import JOURNAL_COMPACT_RECORDS, JOURNAL_FSYNC
+from managers.file_manager import AsyncFileManager
+from utils.json_codec import COMPACT, JsonCodec
+from utils.logger import info_logger, error_logger
+
+RESPONDED = "responded"
+DONE = "done"
+
+_line_codec = JsonCodec(style=COMPACT)
+
+
+class RunJournal:
+    """
+    Append-only journal of the files a run has received upstream responses for.
+
+    Every file gets a "responded" record, holding its final response, once the API
+    stage is over, and a "done" record once its output is written and the source
+    deleted. Records carry the source's size and modification time, so after a
+    crash the files stuck in between can be finished from the journal alone,
+    without repeating any upstream call, and a new file later dropped under the
+    same name is never mistaken for one of them.
+
+    Records are appended through the file I/O pool, one JSON object per line. The
+    journal is compacted down to the files still unfinished every `compact_records`
+    appended records, so it stays small in watch mode where a run never ends, and
+    again on `close`.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fsync: bool = JOURNAL_FSYNC,
+        compact_records: int = JOURNAL_COMPACT_RECORDS,
+    ) -> None:
+        """
+        :param path: JSON-lines journal file.
+        :param fsync: Whether every record is fsynced (survives power loss, not just a crash).
+        :param compact_records: Records appended between two compactions (0 = only on close).
+        """
+        self.path = path
+        self.fsync = fsync
+        self.compact_records = compact_records
+        self._appended = 0
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._handle: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
+
+    async def open(self) -> None:
+        """Replay the journal of earlier runs and start appending to it."""
+        try:
+            self._pending = await asyncio.to_thread(self._replay)
+        except OSError as e:
+            error_logger.error(f"[JOURNAL] Ignoring unreadable journal: {str(e)}")
+            self._pending = {}
+        self._handle = await asyncio.to_thread(self._open_for_append)
+        if self._pending:
+            info_logger.info(
+                f"[JOURNAL] {len(self._pending)} files with unfinished output found"
+            )
+
+    async def resumable(self) -> Dict[Path, Dict[str, Any]]:
+        """
+        Return the unfinished files whose source is unchanged since its response was recorded.
+
+        :return: Recorded response per source file.
+        """
+        return await asyncio.to_thread(self._resumable)
+
+    def _resumable(self) -> Dict[Path, Dict[str, Any]]:
+        """
+        Match the unfinished files against their sources (runs in a thread).
+
+        Records whose source is gone or has changed can never be resumed and are dropped.
+        """
+        resumable = {}
+        with self._lock:
+            for name, record in list(self._pending.items()):
+                try:
+                    stat = os.stat(name)
+                except OSError:
+                    stat = None
+                if stat is not None and (stat.st_size, stat.st_mtime_ns) == (
+                    record["size"],
+                    record["mtime_ns"],
+                ):
+                    resumable[Path(name)] = record["response"]
+                else:
+                    del self._pending[name]
+        return resumable
+
+    async def record_response(self, file: Path, response: Dict[str, Any]) -> None:
+        """
+        Record the final upstream response of a file, before its output is written.
+
+        :param file: Source task file.
+        :param response: Response that will be written as the file's output.
+        """
+        await AsyncFileManager.engine().run(
+            partial(self._record_response, file, response)
+        )
+
+    async def record_done(self, file: Path) -> None:
+        """
+        Record that a file's output is written and its source deleted.
+
+        :param file: Source task file.
+        """
+        await AsyncFileManager.engine().run(
+            partial(self._append, {"file": str(file), "stage": DONE})
+        )
+
+    async def close(self) -> None:
+        """Stop appending and compact the journal down to the unfinished files."""
+        if self._handle is None:
+            return
+        try:
+            await asyncio.to_thread(self._compact)
+        except OSError as e:
+            error_logger.error(f"[JOURNAL] Failed to compact journal: {str(e)}")
+
+    def _record_response(self, file: Path, response: Dict[str, Any]) -> None:
+        """Stat the source and append its "responded" record (runs in an I/O thread)."""
+        stat = os.stat(file)
+        self._append(
+            {
+                "file": str(file),
+                "stage": RESPONDED,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "time": time.time(),
+                "response": response,
+            }
+        )
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Append one record as a single write (runs in an I/O thread)."""
+        line = _line_codec.dumps(record) + b"\n"
+        with self._lock:
+            if self._handle is None:
+                return
+            self._handle.write(line)
+            self._handle.flush()
+            if self.fsync:
+                os.fsync(self._handle.fileno())
+            if record["stage"] == DONE:
+                self._pending.pop(record["file"], None)
+            else:
+                self._pending[record["file"]] = record
+            self._appended += 1
+            if self.compact_records > 0 and self._appended >= self.compact_records:
+                self._compact_while_open()
+
+    def _compact_while_open(self) -> None:
+        """Compact the journal and keep appending to the new file (caller holds the lock)."""
+        self._handle.close()
+        try:
+            self._rewrite()
+        except OSError as e:
+            error_logger.error(f"[JOURNAL] Failed to compact journal: {str(e)}")
+        finally:
+            self._handle = open(self.path, "ab")
+
+    def _open_for_append(self) -> BinaryIO:
+        """Open the journal for appending, creating its directory (runs in a thread)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path, "ab+")
+        if handle.tell() > 0:
+            handle.seek(-1, os.SEEK_END)
+            if handle.read(1) != b"\n":
+                handle.write(b"\n")  # terminate a record cut short by a crash
+        return handle
+
+    def _replay(self) -> Dict[str, Dict[str, Any]]:
+        """Read the journal and keep the files whose last record is not "done"."""
+        pending: Dict[str, Dict[str, Any]] = {}
+        if not self.path.exists():
+            return pending
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    record = _line_codec.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a crash
+                if record.get("stage") == RESPONDED:
+                    pending[record["file"]] = record
+                else:
+                    pending.pop(record.get("file"), None)
+        return pending
+
+    def _compact(self) -> None:
+        """Atomically rewrite the journal with the unfinished files only (runs in a thread)."""
+        with self._lock:
+            self._handle.close()
+            self._handle = None
+            if not self._pending:
+                self.path.unlink(missing_ok=True)
+                return
+            self._rewrite()
+
+    def _rewrite(self) -> None:
+        """Atomically replace the journal with the unfinished files' records (caller holds the lock)."""
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            for record in self._pending.values():
+                f.write(_line_codec.dumps(record) + b"\n")
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._appended = 0
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.logger import info_logger, error_logger
+
+
+class ScanCheckpoint:
+    """
+    Remembers directories that held no pending task files when they were last scanned.
+
+    A drained directory is stored with its modification time and its subdirectory
+    names. On the next scan, if the modification time is unchanged, nothing has been
+    added to or removed from it, so listing it again can be skipped and the walk
+    continues straight into the recorded subdirectories.
+    """
+
+    def __init__(self, path: Optional[Path], root: Path, min_age_seconds: float = 2.0):
+        """
+        :param path: JSON file holding the checkpoint, or None to keep it in memory only.
+        :param root: Input directory the checkpoint belongs to.
+        :param min_age_seconds: Directories modified more recently than this are never
+            recorded, which guards against coarse filesystem timestamps.
+        """
+        self.path = path
+        self.root = root
+        self.min_age_seconds = min_age_seconds
+        self.skipped = 0
+        self._previous: Dict[str, dict] = {}
+        self._current: Dict[str, dict] = {}
+
+    async def load(self) -> None:
+        """Load the checkpoint of the previous scan of the same root."""
+        if self.path is None:
+            return
+        try:
+            self._previous = await asyncio.to_thread(self._read)
+        except (OSError, ValueError) as e:
+            error_logger.error(f"[SCAN] Ignoring unreadable checkpoint: {str(e)}")
+            self._previous = {}
+
+    async def save(self) -> None:
+        """Replace the stored checkpoint with the directories drained in this scan."""
+        if self.path is not None:
+            try:
+                await asyncio.to_thread(self._write)
+            except OSError as e:
+                error_logger.error(f"[SCAN] Failed to save checkpoint: {str(e)}")
+        info_logger.info(
+            f"[SCAN] {len(self._current)} drained directories, "
+            f"{self.skipped} skipped thanks to the checkpoint"
+        )
+
+    def drained_subdirs(self, directory: Path, mtime_ns: int) -> Optional[List[Path]]:
+        """
+        Return the subdirectories of a directory that is still drained.
+
+        :param directory: Directory about to be listed.
+        :param mtime_ns: Its current modification time.
+        :return: Recorded subdirectories if the directory is unchanged, otherwise None.
+        """
+        entry = self._previous.get(str(directory))
+        if entry is None or entry["mtime_ns"] != mtime_ns:
+            return None
+        self._current[str(directory)] = entry
+        self.skipped += 1
+        return [directory / name for name in entry["subdirs"]]
+
+    def record(
+        self, directory: Path, mtime_ns: int, has_files: bool, subdirs: List[Path]
+    ) -> None:
+        """
+        Record the outcome of listing a directory.
+
+        :param directory: The listed directory.
+        :param mtime_ns: Its modification time, taken before listing.
+        :param has_files: Whether it contained pending task files.
+        :param subdirs: Its subdirectories.
+        """
+        if has_files or time.time_ns() - mtime_ns < self.min_age_seconds * 1e9:
+            return
+        self._current[str(directory)] = {
+            "mtime_ns": mtime_ns,
+            "subdirs": [subdir.name for subdir in subdirs],
+        }
+
+    def _read(self) -> Dict[str, dict]:
+        """Read the checkpoint file (runs in a thread)."""
+        if not self.path.exists():
+            return {}
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        if data.get("root") != str(self.root):
+            return {}
+        return data.get("directories", {})
+
+    def _write(self) -> None:
+        """Atomically write the checkpoint file (runs in a thread)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps({"root": str(self.root), "directories": self._current}),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
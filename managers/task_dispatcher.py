@@ -1,18 +1,38 @@
-from typing import Any, Dict, List, Tuple
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 
+from config.settings import AGIFY_BATCH_CONCURRENCY
+from managers.age_batcher import AgeMicroBatcher
+from managers.age_cache import AgeCache
 from services.api_clients import AgifyClient, JokeClient, PostmanClient
 from utils.logger import info_logger, error_logger
+from utils.metrics import STAGE_SECONDS, Metrics
+from utils.single_flight import SingleFlight
+from utils.tracing import Tracer
 
 
 class AsyncTaskDispatcher:
     """Dispatches tasks to external API clients and manages caching for age predictions."""
 
-    def __init__(self) -> None:
-        """Initialize API clients and internal age cache."""
-        self.age_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    def __init__(
+        self,
+        age_cache: Optional[AgeCache] = None,
+        preload_concurrency: int = AGIFY_BATCH_CONCURRENCY,
+    ) -> None:
+        """
+        Initialize API clients and the age cache.
+
+        :param age_cache: Shared (optionally persistent) age cache. A memory-only
+            cache is created when omitted.
+        :param preload_concurrency: Maximum number of Agify batch requests in flight.
+        """
+        self.age_cache: AgeCache = age_cache if age_cache is not None else AgeCache()
+        self.preload_concurrency = max(preload_concurrency, 1)
         self.agify_client = AgifyClient()
         self.joke_client = JokeClient()
         self.postman_client = PostmanClient()
+        self.age_batcher = AgeMicroBatcher(self.agify_client)
+        self._age_flight = SingleFlight()
 
     async def preload_age_predictions(
             self, name_country_pairs: List[Tuple[str, str]]
@@ -20,6 +40,10 @@ class AsyncTaskDispatcher:
         """
         Preload and cache age predictions for batches of (name, country) pairs.
 
+        Batches of up to 10 names are sent concurrently, with at most
+        `preload_concurrency` requests in flight. A failed batch is logged and
+        does not affect the others.
+
         :param name_country_pairs: List of (name, country) tuples to preload predictions for.
         """
         country_groups: Dict[str, List[str]] = {}
@@ -27,21 +51,60 @@ class AsyncTaskDispatcher:
             country = country.upper()
             country_groups.setdefault(country, []).append(name)
 
-        for country, names in country_groups.items():
-            for i in range(0, len(names), 10):
-                batch = names[i: i + 10]
+        semaphore = asyncio.Semaphore(self.preload_concurrency)
+
+        async def load_batch(batch: List[str], country: str) -> None:
+            async with semaphore:
                 try:
                     results = await self.agify_client.get_batch_ages(batch, country)
                     info_logger.info(
                         f"[BATCH] {len(batch)} names in {country}: {', '.join(batch)}"
                     )
-                    for result in results:
-                        self.age_cache[(result["name"], country)] = result
+                    self.age_cache.update(
+                        ((result["name"], country), result) for result in results
+                    )
                 except Exception as e:
                     error_logger.error(
                         f"[BATCH] Failed batch request for {country}: {str(e)}"
                     )
 
+        await asyncio.gather(
+            *(
+                load_batch(names[i: i + 10], country)
+                for country, names in country_groups.items()
+                for i in range(0, len(names), 10)
+            )
+        )
+
+    async def preload_jokes(self, count: int) -> None:
+        """
+        Announce the joke tasks about to be handled, so the reservoir is filled for them.
+
+        :param count: Number of upcoming joke tasks.
+        """
+        await self.joke_client.prefill(count)
+
+    def close(self) -> None:
+        """Stop background work started by the API clients."""
+        self.joke_client.close()
+
+    async def _fetch_age(self, name: str, country: str) -> Dict[str, Any]:
+        """
+        Fetch a single age prediction and store it in the cache.
+
+        Concurrent misses for the same (name, country) share one call to this method.
+
+        :param name: Person's name.
+        :param country: Upper-cased country code.
+        :return: API response containing the age prediction.
+        """
+        result = await self.age_batcher.get_age(name, country)
+        info_logger.info(
+            "[SINGLE] Age fetched for %s in %s", name, country, extra={"sampled": True}
+        )
+        self.age_cache[(name, country)] = result
+        return result
+
     async def handle(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process a single task based on its type ("age", "joke", etc.).
@@ -58,25 +121,28 @@ class AsyncTaskDispatcher:
         try:
             if task_type == "age":
                 key = (name, country)
-                if key not in self.age_cache:
-                    result = await self.agify_client.get_age(name, country)
-                    info_logger.info(f"[SINGLE] Age fetched for {name} in {country}")
-                    self.age_cache[key] = result
-                response: Dict[str, Any] = self.age_cache[key]
+                with Tracer.span("cache_lookup", "cache"):
+                    response: Optional[Dict[str, Any]] = self.age_cache.get(key)
+                if response is None:
+                    response = await self._age_flight.do(
+                        key, lambda: self._fetch_age(name, country)
+                    )
 
             elif task_type == "joke":
                 response = await self.joke_client.get_random_joke()
-                info_logger.info(f"[JOKE] Random joke fetched")
+                info_logger.info("[JOKE] Random joke fetched", extra={"sampled": True})
 
             else:
                 response = data
                 info_logger.info(
-                    f"[RAW] Unrecognized task_type. Used input as response."
+                    "[RAW] Unrecognized task_type. Used input as response.",
+                    extra={"sampled": True},
                 )
 
-            postman_response = await self.postman_client.post_response(response)
+            with Tracer.span("forward"), Metrics.timer(STAGE_SECONDS, stage="forward"):
+                postman_response = await self.postman_client.post_response(response)
             return postman_response.get("json", {})
 
         except Exception as e:
-            error_logger.error(f"[TASK] Failed to handle task: {str(e)}")
+            error_logger.error("[TASK] Failed to handle task: %s", e)
             raise
@@ -1,11 +1,38 @@
 import asyncio
 import time
+import zlib
 from pathlib import Path
-from typing import List, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
+from config.settings import (
+    AGE_CACHE_ENABLED,
+    AGE_CACHE_PATH,
+    FILE_IO_CONCURRENCY,
+    JOURNAL_ENABLED,
+    JOURNAL_PATH,
+    METRICS_ENABLED,
+    METRICS_EXPORT_INTERVAL,
+    METRICS_TEXTFILE_PATH,
+    PIPELINE_QUEUE_SIZE,
+    PRELOAD_WINDOW_SECONDS,
+    PRELOAD_WINDOW_SIZE,
+    PROCESS_WORKERS,
+    READ_WORKERS,
+    SCAN_CHECKPOINT_ENABLED,
+    SCAN_CHECKPOINT_PATH,
+    TRACE_DIR,
+    TRACE_ENABLED,
+)
+from managers.age_cache import AgeCache
 from managers.file_manager import AsyncFileManager
+from managers.file_watcher import FileWatcher
+from managers.run_journal import RunJournal
+from managers.scan_checkpoint import ScanCheckpoint
 from managers.task_dispatcher import AsyncTaskDispatcher
+from services.api_clients import ConnectionPool
 from utils.logger import info_logger, error_logger
+from utils.metrics import FILES_TOTAL, STAGE_SECONDS, Metrics
+from utils.tracing import Tracer
 from validators.input_validator import InputValidator
 
 
@@ -14,12 +41,73 @@ class AsyncJsonProcessor:
     Asynchronous processor for reading, handling, and writing JSON files.
     Handles input from a directory, preloads data (e.g. age predictions),
     and dispatches processing tasks.
+
+    Files flow through a streaming discover → validate → dispatch → write pipeline
+    connected by bounded queues. Files are processed by a fixed pool of workers,
+    so the number of in-flight tasks stays constant however large the input is.
+    File reads/writes and network requests have their own concurrency caps.
     """
 
     PROCESSED_SUFFIX = "_processed"
 
-    def __init__(self, input_path: Path = Path("INPUT")):
+    def __init__(
+        self,
+        input_path: Path = Path("INPUT"),
+        workers: int = PROCESS_WORKERS,
+        file_io_concurrency: int = FILE_IO_CONCURRENCY,
+        read_workers: int = READ_WORKERS,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        preload_window_size: int = PRELOAD_WINDOW_SIZE,
+        preload_window_seconds: float = PRELOAD_WINDOW_SECONDS,
+        age_cache_path: Optional[Path] = AGE_CACHE_PATH if AGE_CACHE_ENABLED else None,
+        shard_index: int = 0,
+        shard_count: int = 1,
+        scan_checkpoint_path: Optional[Path] = (
+            SCAN_CHECKPOINT_PATH if SCAN_CHECKPOINT_ENABLED else None
+        ),
+        metrics_path: Optional[Path] = (
+            METRICS_TEXTFILE_PATH if METRICS_ENABLED else None
+        ),
+        metrics_interval: float = METRICS_EXPORT_INTERVAL,
+        trace_dir: Optional[Path] = TRACE_DIR if TRACE_ENABLED else None,
+        journal_path: Optional[Path] = JOURNAL_PATH if JOURNAL_ENABLED else None,
+    ):
+        """
+        :param input_path: The INPUT directory to process.
+        :param workers: Number of concurrent file workers (0 = no cap on in-flight files).
+        :param file_io_concurrency: Maximum number of concurrent file operations.
+        :param read_workers: Number of concurrent readers in the validation stage.
+        :param queue_size: Capacity of the queues between pipeline stages.
+        :param preload_window_size: Maximum number of files per age-preload window.
+        :param preload_window_seconds: Maximum time spent filling one preload window.
+        :param age_cache_path: SQLite file of the persistent age cache (None = memory only).
+        :param shard_index: Index of the shard this processor handles.
+        :param shard_count: Total number of shards the input is split into.
+        :param scan_checkpoint_path: JSON file remembering drained directories (None = off).
+        :param metrics_path: Prometheus textfile written after each run (None = off).
+        :param metrics_interval: Seconds between metric exports during a run (0 = only at the end).
+        :param trace_dir: Directory receiving a Chrome trace of every run (None = off).
+        :param journal_path: Run journal used to resume unfinished files after a crash (None = off).
+        """
         self.input_path = input_path
+        self.workers = workers
+        self.file_io_concurrency = file_io_concurrency
+        self.read_workers = max(read_workers, 1)
+        self.queue_size = queue_size
+        self.preload_window_size = max(preload_window_size, 1)
+        self.preload_window_seconds = preload_window_seconds
+        self.age_cache_path = age_cache_path
+        self.shard_index = shard_index
+        self.shard_count = max(shard_count, 1)
+        self.scan_checkpoint_path = scan_checkpoint_path
+        self.metrics_path = metrics_path
+        self.metrics_interval = metrics_interval
+        self.trace_dir = trace_dir
+        self.journal_path = journal_path
+        self._journal: Optional[RunJournal] = None
+        self._watcher: Optional[FileWatcher] = None
+        self._io_semaphore = asyncio.Semaphore(file_io_concurrency)
+        self.stats: Dict[str, int] = self._empty_stats()
 
     @staticmethod
     async def read_and_validate(file: Path) -> dict:
@@ -30,8 +118,10 @@ class AsyncJsonProcessor:
         :return: Parsed and validated JSON data.
         :raises: Exception if the file is invalid or unreadable.
         """
-        data: dict = await AsyncFileManager.read_json(file)
-        InputValidator.validate(data)
+        with Tracer.span("read", "disk", file=file.name):
+            data: dict = await AsyncFileManager.read_json(file)
+        with Tracer.span("validate"), Metrics.timer(STAGE_SECONDS, stage="validate"):
+            InputValidator.validate(data)
         return data
 
     async def process_file(
@@ -49,64 +139,421 @@ class AsyncJsonProcessor:
         :param content: The already validated dictionary content of the JSON file.
         """
         start_time = time.time()
-        info_logger.info(f"{file.name} – processing started.")
+        info_logger.info(
+            "%s – processing started.", file.name, extra={"sampled": True}
+        )
 
         try:
-            response: dict = await dispatcher.handle(content)
+            with Tracer.span("process_file", file=file.name):
+                response: dict = await dispatcher.handle(content)
+                if self._journal is not None:
+                    await self._journal.record_response(file, response)
 
-            output_path: Path = file.with_name(
-                f"{file.stem}{self.PROCESSED_SUFFIX}.json"
-            )
-            await AsyncFileManager.write_json(output_path, response)
-            await AsyncFileManager.delete_file(file)
+                with Tracer.span("write_and_delete", "disk"):
+                    async with self._io_semaphore:
+                        await AsyncFileManager.write_json_and_delete(
+                            self.output_path(file), response, file
+                        )
+                if self._journal is not None:
+                    await self._journal.record_done(file)
 
             duration: float = round(time.time() - start_time, 2)
+            self._count("processed")
             info_logger.info(
-                f"{file.name} – processed successfully in {duration} seconds. Status: SUCCESS"
+                "%s – processed successfully in %s seconds. Status: SUCCESS",
+                file.name,
+                duration,
+                extra={"sampled": True},
             )
 
         except Exception as e:
             duration: float = round(time.time() - start_time, 2)
+            self._count("failed")
             error_logger.error(
-                f"{file.name} – failed after {duration} seconds. Reason: {str(e)}"
+                "%s – failed after %s seconds. Reason: %s", file.name, duration, e
+            )
+            if self._watcher is not None:
+                self._watcher.retry(file)
+
+    def output_path(self, file: Path) -> Path:
+        """
+        :param file: Input task file.
+        :return: Path of its output file (same name with the "_processed" suffix).
+        """
+        return file.with_name(f"{file.stem}{self.PROCESSED_SUFFIX}.json")
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        """Return zeroed run counters."""
+        return {
+            "discovered": 0,
+            "skipped": 0,
+            "processed": 0,
+            "failed": 0,
+            "resumed": 0,
+        }
+
+    def _count(self, outcome: str) -> None:
+        """
+        Count a file outcome in the run stats and the metrics registry.
+
+        :param outcome: One of the `_empty_stats` keys.
+        """
+        self.stats[outcome] += 1
+        Metrics.inc(FILES_TOTAL, status=outcome)
+
+    def in_shard(self, file: Path) -> bool:
+        """
+        Check whether a file belongs to this processor's shard.
+
+        Files are assigned by a stable hash of their path relative to the input
+        directory, so every process computes the same split independently.
+
+        :param file: Discovered input file.
+        :return: True if this processor is responsible for the file.
+        """
+        if self.shard_count == 1:
+            return True
+        relative = file.relative_to(self.input_path).as_posix().encode("utf-8")
+        return zlib.crc32(relative) % self.shard_count == self.shard_index
+
+    async def process_all(
+        self, source: Optional[AsyncIterator[Path]] = None
+    ) -> Dict[str, int]:
+        """
+        Process all JSON files in the input directory as a streaming pipeline:
+        - Discovers `.json` files lazily and feeds them into a bounded queue.
+        - Reads and validates files concurrently. Invalid or unreadable files are skipped and logged.
+        - Groups validated files into windows and preloads age predictions for each window.
+        - Dispatches and writes files through a bounded worker pool.
+
+        Stages are connected by bounded queues and run concurrently, so the first
+        outputs are written while discovery is still in progress and neither the
+        file list nor the parsed contents are ever held in memory all at once.
+        All API clients share one pooled HTTP connection for the whole run.
+
+        :param source: Optional stream of files to process instead of scanning the input directory.
+        :return: Run counters ("discovered", "skipped", "processed", "failed").
+        """
+        self._io_semaphore = asyncio.Semaphore(self.file_io_concurrency)
+        self.stats = self._empty_stats()
+        if self.trace_dir is not None:
+            Tracer.start()
+        exporter: Optional[asyncio.Task] = None
+        if self.metrics_path is not None and self.metrics_interval > 0:
+            exporter = asyncio.create_task(self._export_metrics_periodically())
+        await ConnectionPool.open()
+        try:
+            await self._run_pipeline(source)
+        finally:
+            await ConnectionPool.close()
+            if exporter is not None:
+                exporter.cancel()
+            self.export_metrics()
+            self.export_trace()
+        return dict(self.stats)
+
+    def export_metrics(self) -> None:
+        """
+        Write the metrics registry as a Prometheus textfile-collector file.
+
+        Sharded processes label their series with the shard index, so the files of
+        all shards can be collected side by side.
+        """
+        if self.metrics_path is None:
+            return
+        path, labels = self._shard_path(self.metrics_path), {}
+        if self.shard_count > 1:
+            labels["shard"] = str(self.shard_index)
+        try:
+            Metrics.write_textfile(path, **labels)
+        except OSError as e:
+            error_logger.error(f"[METRICS] Failed to export metrics: {str(e)}")
+
+    def _shard_path(self, path: Optional[Path]) -> Optional[Path]:
+        """
+        :param path: Per-run file (metrics, journal, scan checkpoint), or None when disabled.
+        :return: The path itself, or a shard-specific variant of it in sharded runs.
+        """
+        if path is None or self.shard_count == 1:
+            return path
+        return path.with_name(f"{path.stem}_shard{self.shard_index}{path.suffix}")
+
+    def export_trace(self) -> None:
+        """
+        Stop tracing and write the run's spans as a Chrome/Perfetto trace file.
+
+        Every run gets its own timestamped file; sharded processes add their shard
+        index to the name.
+        """
+        if self.trace_dir is None or not Tracer.enabled:
+            return
+        Tracer.stop()
+        shard = f"_shard{self.shard_index}" if self.shard_count > 1 else ""
+        path = self.trace_dir / f"{time.strftime('%Y%m%d_%H%M%S')}_trace{shard}.json"
+        try:
+            Tracer.write(path, shard=self.shard_index, stats=dict(self.stats))
+        except OSError as e:
+            error_logger.error(f"[TRACE] Failed to export trace: {str(e)}")
+            return
+        info_logger.info(f"[TRACE] Trace written to {path}")
+
+    async def _export_metrics_periodically(self) -> None:
+        """Export metrics every `metrics_interval` seconds while a run is in progress."""
+        while True:
+            await asyncio.sleep(self.metrics_interval)
+            await asyncio.to_thread(self.export_metrics)
+
+    async def watch(self, watcher: Optional[FileWatcher] = None) -> Dict[str, int]:
+        """
+        Process files continuously as they appear in the input directory.
+
+        Files already present are processed first; afterwards every newly completed
+        `.json` file is fed into the same pipeline within seconds of being written.
+        Files that fail processing are handed back to the watcher and retried after
+        its retry delay. Runs until cancelled.
+
+        :param watcher: Watcher to use (defaults to one on the input directory).
+        :return: Run counters when the watch is stopped.
+        """
+        if watcher is None:
+            watcher = FileWatcher(
+                self.input_path, exclude_suffix=f"{self.PROCESSED_SUFFIX}.json"
             )
+        self._watcher = watcher
+        try:
+            return await self.process_all(source=watcher.watch())
+        finally:
+            self._watcher = None
+
+    async def _run_pipeline(self, source: Optional[AsyncIterator[Path]]) -> None:
+        """
+        Wire the discover → validate → dispatch → write stages together and run them.
+
+        :param source: Optional stream of files replacing the directory scan.
+        """
+        path_queue: asyncio.Queue[Optional[Path]] = asyncio.Queue(self.queue_size)
+        valid_queue: asyncio.Queue[Optional[Tuple[Path, dict]]] = asyncio.Queue(
+            self.queue_size
+        )
+        if self.journal_path is not None:
+            self._journal = RunJournal(self._shard_path(self.journal_path))
+            await self._journal.open()
+            await self._resume_from_journal()
+
+        age_cache = AgeCache(self.age_cache_path)
+        await age_cache.open()
+        dispatcher = AsyncTaskDispatcher(age_cache)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._discover(path_queue, source))
+                group.create_task(self._validate(path_queue, valid_queue))
+                group.create_task(self._dispatch(dispatcher, valid_queue))
+        finally:
+            dispatcher.close()
+            await age_cache.close()
+            if self._journal is not None:
+                await self._journal.close()
+                self._journal = None
+
+        info_logger.info(f"Processing complete: {self.stats}")
 
-    async def process_all(self) -> None:
+    async def _resume_from_journal(self) -> None:
         """
-        Process all JSON files in the input directory:
-        - Collects all `.json` files.
-        - Validates each file's content early in the process. Invalid or unreadable files are skipped and logged.
-        - Preloads age prediction requests if type is "age".
-        - Calls the dispatcher to handle the rest of the content.
-        - Runs all processing tasks concurrently.
+        Finish the files of an interrupted run from the journal, without any upstream call.
+
+        Files whose response was recorded but whose output was never written (or
+        whose source was never deleted) get their recorded response written, so
+        they are gone before discovery starts.
         """
-        files: List[Path] = await AsyncFileManager.get_json_files(self.input_path)
-        valid_data_map: List[Tuple[Path, dict]] = []
+        resumable = await self._journal.resumable()
+        if not resumable:
+            return
 
-        for file in files:
+        async def finish(file: Path, response: dict) -> None:
             try:
-                data = await self.read_and_validate(file)
-                valid_data_map.append((file, data))
+                async with self._io_semaphore:
+                    await AsyncFileManager.write_json_and_delete(
+                        self.output_path(file), response, file
+                    )
+                await self._journal.record_done(file)
             except Exception as e:
-                error_logger.error(f"{file.name} – skipped. Reason: {str(e)}")
+                error_logger.error("%s – resume failed. Reason: %s", file.name, e)
+                return
+            self._count("resumed")
 
-        age_inputs: List[Tuple[str, str]] = [
-            (data["name"], data["country"].upper())
-            for _, data in valid_data_map
-            if data.get("type", "").lower() == "age"
-        ]
-
-        unique_inputs: List[Tuple[str, str]] = list(set(age_inputs))
+        await asyncio.gather(*(finish(*item) for item in resumable.items()))
         info_logger.info(
-            f"Preloading {len(unique_inputs)} unique (name, country) pairs..."
+            f"[JOURNAL] Resumed {self.stats['resumed']} of {len(resumable)} "
+            f"unfinished files without upstream calls"
         )
 
-        dispatcher = AsyncTaskDispatcher()
-        await dispatcher.preload_age_predictions(unique_inputs)
+    async def _discover(
+        self, path_queue: asyncio.Queue, source: Optional[AsyncIterator[Path]]
+    ) -> None:
+        """
+        Discovery stage: stream JSON paths into the path queue.
+
+        :param path_queue: Queue consumed by the validation stage.
+        :param source: Stream of files, or None to scan the input directory.
+        """
+        started = time.perf_counter()
+        checkpoint: Optional[ScanCheckpoint] = None
+        if source is None:
+            checkpoint = ScanCheckpoint(
+                self._shard_path(self.scan_checkpoint_path), self.input_path
+            )
+            await checkpoint.load()
+            source = AsyncFileManager.iter_json_files(
+                self.input_path,
+                exclude_suffix=f"{self.PROCESSED_SUFFIX}.json",
+                checkpoint=checkpoint,
+            )
+
+        async for file in source:
+            if not self.in_shard(file):
+                continue
+            self._count("discovered")
+            await path_queue.put(file)
+
+        if checkpoint is not None:
+            await checkpoint.save()
+        Metrics.observe(STAGE_SECONDS, time.perf_counter() - started, stage="discover")
+
+        for _ in range(self.read_workers):
+            await path_queue.put(None)
+
+    async def _validate(
+        self, path_queue: asyncio.Queue, valid_queue: asyncio.Queue
+    ) -> None:
+        """
+        Validation stage: read and validate files with a fixed number of readers.
+
+        :param path_queue: Queue of discovered paths.
+        :param valid_queue: Queue of (file, validated content) pairs for the dispatch stage.
+        """
+
+        async def reader() -> None:
+            while (file := await path_queue.get()) is not None:
+                try:
+                    async with self._io_semaphore:
+                        data = await self.read_and_validate(file)
+                except Exception as e:
+                    self._count("skipped")
+                    error_logger.error("%s – skipped. Reason: %s", file.name, e)
+                    continue
+                await valid_queue.put((file, data))
+
+        async with asyncio.TaskGroup() as group:
+            for _ in range(self.read_workers):
+                group.create_task(reader())
+
+        await valid_queue.put(None)
+
+    async def _dispatch(
+        self, dispatcher: AsyncTaskDispatcher, valid_queue: asyncio.Queue
+    ) -> None:
+        """
+        Dispatch stage: preload age predictions per window, then hand files to the workers.
 
-        info_logger.info(f"Processing {len(valid_data_map)} files...")
+        :param dispatcher: Dispatcher instance shared by all workers.
+        :param valid_queue: Queue of (file, validated content) pairs.
+        """
+        work_queue: asyncio.Queue[Optional[Tuple[Path, dict]]] = asyncio.Queue(
+            maxsize=max(self.workers, 1) * 2
+        )
+
+        async def worker() -> None:
+            while (item := await work_queue.get()) is not None:
+                await self.process_file(dispatcher, *item)
+
+        async with asyncio.TaskGroup() as group:
+            for _ in range(self.workers):
+                group.create_task(worker())
+
+            finished = False
+            while not finished:
+                window, finished = await self._next_window(valid_queue)
+                if not window:
+                    continue
+                with Tracer.span("preload_window", files=len(window)):
+                    await self._preload_window(dispatcher, window)
+
+                for item in window:
+                    if self.workers <= 0:
+                        group.create_task(self.process_file(dispatcher, *item))
+                    else:
+                        await work_queue.put(item)
+
+            for _ in range(self.workers):
+                await work_queue.put(None)
+
+    async def _next_window(self, valid_queue: asyncio.Queue) -> Tuple[list, bool]:
+        """
+        Collect up to `preload_window_size` validated files from the stream.
+
+        Waits for the first file, then keeps collecting until the window is full or
+        `preload_window_seconds` have passed, so slow streams still make progress.
+
+        :param valid_queue: Queue of (file, validated content) pairs.
+        :return: The window and whether the end of the stream was reached.
+        """
+        first = await valid_queue.get()
+        if first is None:
+            return [], True
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.preload_window_seconds
+        window = [first]
+        while len(window) < self.preload_window_size:
+            try:
+                item = valid_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(valid_queue.get(), remaining)
+                except TimeoutError:
+                    break
+            if item is None:
+                return window, True
+            window.append(item)
+        return window, False
 
-        tasks = [
-            self.process_file(dispatcher, file, data) for file, data in valid_data_map
+    @staticmethod
+    async def _preload_window(
+        dispatcher: AsyncTaskDispatcher, window: List[Tuple[Path, dict]]
+    ) -> None:
+        """
+        Preload age predictions for the uncached (name, country) pairs of a window,
+        and prefill the joke reservoir for the window's joke tasks.
+
+        :param dispatcher: Dispatcher whose age cache is populated.
+        :param window: (file, validated content) pairs of the current window.
+        """
+        joke_count = sum(
+            1 for _, data in window if data.get("type", "").lower() == "joke"
+        )
+        if joke_count:
+            await dispatcher.preload_jokes(joke_count)
+
+        unique_inputs: List[Tuple[str, str]] = list(
+            {
+                (data["name"], data["country"].upper())
+                for _, data in window
+                if data.get("type", "").lower() == "age"
+            }
+        )
+        unique_inputs = [
+            key for key in unique_inputs if key not in dispatcher.age_cache
         ]
-        await asyncio.gather(*tasks)
+        if not unique_inputs:
+            return
+
+        info_logger.info(
+            f"Preloading {len(unique_inputs)} unique (name, country) pairs..."
+        )
+        await dispatcher.preload_age_predictions(unique_inputs)
+        await dispatcher.age_cache.flush()
@@ -0,0 +1,87 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict
+
+from config.settings import AGE_CACHE_ENABLED, AGE_CACHE_PATH
+from resources.processor import AsyncJsonProcessor
+from utils.logger import flush_logs, info_logger, error_logger
+from utils.profiling import run_maybe_profiled
+
+
+def run_shard(
+    input_dir: Path,
+    shard_index: int,
+    shard_count: int,
+    share_age_cache: bool,
+    profile: bool = False,
+) -> Dict[str, int]:
+    """
+    Process one shard of the input tree in its own event loop.
+
+    Runs inside a worker process, so it must stay a module-level function.
+
+    :param input_dir: The INPUT directory.
+    :param shard_index: Index of the shard handled by this process.
+    :param shard_count: Total number of shards.
+    :param share_age_cache: Whether to use the persistent age cache shared by all shards.
+    :param profile: Whether to write profiles of this shard's run.
+    :return: Run counters of the shard.
+    """
+    age_cache_path = AGE_CACHE_PATH if share_age_cache and AGE_CACHE_ENABLED else None
+    processor = AsyncJsonProcessor(
+        input_dir,
+        age_cache_path=age_cache_path,
+        shard_index=shard_index,
+        shard_count=shard_count,
+    )
+    try:
+        return run_maybe_profiled(
+            processor.process_all(), profile, label=f"shard{shard_index}"
+        )
+    finally:
+        flush_logs()
+
+
+def run_sharded(
+    input_dir: Path,
+    processes: int,
+    share_age_cache: bool = True,
+    profile: bool = False,
+) -> Dict[str, int]:
+    """
+    Split the input tree across worker processes and merge their counters.
+
+    Each process runs its own AsyncJsonProcessor over the files hashed to its
+    shard, so CPU-bound work (JSON parsing/serialization, validation, logging)
+    is spread across cores. When `share_age_cache` is set, all shards warm-start
+    from and flush into the same SQLite age cache.
+
+    :param input_dir: The INPUT directory.
+    :param processes: Number of worker processes.
+    :param share_age_cache: Whether shards share the persistent age cache.
+    :param profile: Whether every shard writes profiles of its run.
+    :return: Counters summed over all shards.
+    """
+    info_logger.info(f"Starting sharded processing with {processes} processes...")
+    totals: Dict[str, int] = {}
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+        futures = [
+            executor.submit(
+                run_shard, input_dir, index, processes, share_age_cache, profile
+            )
+            for index in range(processes)
+        ]
+        for index, future in enumerate(futures):
+            try:
+                stats = future.result()
+            except Exception as e:
+                error_logger.error(f"[SHARD {index}] Worker process failed: {str(e)}")
+                continue
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+
+    info_logger.info(f"Sharded processing complete: {totals}")
+    return totals
@@ -1,4 +1,4 @@
-import asyncio
+import argparse
 import time
 
 import schedule
@@ -6,6 +6,7 @@ import schedule
 from config.settings import PROCESS_TIME
 from resources.processor import AsyncJsonProcessor
 from utils.logger import info_logger
+from utils.profiling import run_maybe_profiled
 from validators.time_validator import validate_process_time
 
 
@@ -15,14 +16,20 @@ async def job():
     await processor.process_all()
 
 
-def run_scheduler() -> None:
+async def watch_job():
+    info_logger.info("Starting continuous watch mode...")
+    processor = AsyncJsonProcessor()
+    await processor.watch()
+
+
+def run_scheduler(profile: bool = False) -> None:
     if not validate_process_time(PROCESS_TIME):
         raise ValueError(
             f"Invalid PROCESS_TIME format: '{PROCESS_TIME}'. Expected HH:MM."
         )
 
     def sync_wrapper():
-        asyncio.run(job())
+        run_maybe_profiled(job(), profile, label="scheduled")
 
     schedule.every().day.at(PROCESS_TIME).do(sync_wrapper)
     info_logger.info(f"Scheduler started. Waiting for scheduled time: {PROCESS_TIME}")
@@ -32,5 +39,32 @@ def run_scheduler() -> None:
         time.sleep(60)
 
 
+def run_watch(profile: bool = False) -> None:
+    try:
+        run_maybe_profiled(watch_job(), profile, label="watch")
+    except KeyboardInterrupt:
+        info_logger.info("Watch mode stopped.")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the JSON task processor.")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Process files continuously as they arrive instead of once a day.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write CPU (event loop and I/O threads), slow-callback and memory "
+        "profiles of every run next to the logs.",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    run_scheduler()
+    args = parse_args()
+    if args.watch:
+        run_watch(args.profile)
+    else:
+        run_scheduler(args.profile)
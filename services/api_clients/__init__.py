@@ -1,9 +1,19 @@
+from .connection_pool import ConnectionPool
+from .rate_limiter import RateLimiter, TokenBucket
+from .resilience import CircuitBreaker, CircuitOpenError, Resilience, RetryBudget
 from .base_client import BaseAPIClient
 from .agify_client import AgifyClient
 from .joke_client import JokeClient
 from .postman_client import PostmanClient
 
 __all__ = [
+    "ConnectionPool",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "RateLimiter",
+    "Resilience",
+    "RetryBudget",
+    "TokenBucket",
     "BaseAPIClient",
     "AgifyClient",
     "JokeClient",
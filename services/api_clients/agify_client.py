@@ -1,5 +1,6 @@
 from typing import Any, Union
 
+from config.settings import AGIFY_RATE_BURST, AGIFY_RATE_LIMIT
 from services.api_clients.base_client import BaseAPIClient
 
 
@@ -7,6 +8,9 @@ class AgifyClient(BaseAPIClient):
     """Client for interacting with the Agify API."""
 
     BASE_URL: str = "https://api.agify.io"
+    RATE_LIMIT_PER_SECOND: float = AGIFY_RATE_LIMIT
+    RATE_LIMIT_BURST: int = AGIFY_RATE_BURST
+    SINGLE_FLIGHT: bool = True
 
     async def get_age(self, name: str, country: str) -> dict[str, Any]:
         """
@@ -1,12 +1,160 @@
-from typing import Any, Optional
+import asyncio
+import time
+from typing import Any, Dict, Optional
 
 import httpx
 
+from config.settings import HTTP_MAX_RETRIES
+from services.api_clients.connection_pool import ConnectionPool
+from services.api_clients.rate_limiter import RateLimiter
+from services.api_clients.resilience import (
+    CircuitOpenError,
+    Resilience,
+    backoff_delay,
+    is_retryable,
+)
+from utils.metrics import API_REQUEST_SECONDS, API_REQUESTS_TOTAL, Metrics
+from utils.single_flight import SingleFlight, freeze_params
+from utils.tracing import Tracer
+
 
 class BaseAPIClient:
-    """Base asynchronous HTTP client using httpx for GET and POST requests."""
+    """
+    Base asynchronous HTTP client using httpx for GET and POST requests.
+
+    Requests go through the shared ConnectionPool when it is open, otherwise a
+    short-lived client is created for the single call.
+
+    Every request first passes the per-host rate limiter, which is configured per
+    client (RATE_LIMIT_PER_SECOND / RATE_LIMIT_BURST) and adapts to the quota
+    headers returned by the upstream.
+
+    Transient failures are retried with backoff and jitter within a per-host retry
+    budget, and a per-endpoint circuit breaker fails fast while an upstream is down.
+
+    Clients with SINGLE_FLIGHT enabled share one in-flight request between
+    concurrent identical GET calls. It is off by default because endpoints such
+    as random jokes must not return the same result to every caller.
+    """
 
     TIMEOUT: int = 5  # seconds
+    SINGLE_FLIGHT: bool = False
+    RATE_LIMIT_PER_SECOND: float = 0.0
+    RATE_LIMIT_BURST: int = 10
+    MAX_RETRIES: int = HTTP_MAX_RETRIES
+
+    def __init__(self) -> None:
+        self._single_flight = SingleFlight()
+
+    @staticmethod
+    def resilience_stats() -> Dict[str, Dict[str, int | str]]:
+        """
+        Return retry and circuit-breaker counters for every endpoint called so far.
+
+        :return: Mapping of "METHOD host/path" to its counters and circuit state.
+        """
+        return Resilience.stats()
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request with retries, guarded by the endpoint's circuit breaker.
+
+        Transient failures (timeouts, connection errors, 429, 5xx) are retried up to
+        MAX_RETRIES times with exponential backoff and jitter, as long as the host's
+        retry budget allows it.
+
+        :param method: HTTP method name.
+        :param url: The target URL.
+        :param kwargs: Extra arguments forwarded to httpx (params, json, ...).
+        :return: The successful httpx.Response.
+        :raises httpx.HTTPStatusError: If the response contains an error status.
+        :raises CircuitOpenError: If the endpoint's circuit is open.
+        """
+        parsed = httpx.URL(url)
+        endpoint = f"{method} {parsed.host}{parsed.path}"
+        breaker = Resilience.breaker(endpoint)
+        budget = Resilience.budget(parsed.host)
+        budget.deposit()
+        Resilience.count(endpoint, "requests")
+
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                Resilience.count(endpoint, "rejected")
+                raise CircuitOpenError(f"Circuit open for {endpoint}")
+
+            try:
+                response = await self._send(method, url, **kwargs)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                Resilience.count(endpoint, "failures")
+
+                if attempt >= self.MAX_RETRIES:
+                    raise
+                if not budget.withdraw():
+                    Resilience.count(endpoint, "budget_exhausted")
+                    raise
+
+                Resilience.count(endpoint, "retries")
+                with Tracer.span("retry_backoff", "http", attempt=attempt + 1):
+                    await asyncio.sleep(backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            breaker.record_success()
+            return response
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a single request through the shared pool, or a one-off client if the pool is closed.
+
+        :param method: HTTP method name.
+        :param url: The target URL.
+        :param kwargs: Extra arguments forwarded to httpx (params, json, ...).
+        :return: The successful httpx.Response.
+        :raises httpx.HTTPStatusError: If the response contains an error status.
+        """
+        limiter = RateLimiter.for_host(
+            httpx.URL(url).host, self.RATE_LIMIT_PER_SECOND, self.RATE_LIMIT_BURST
+        )
+        with Tracer.span("rate_limit_wait", "http"):
+            await limiter.acquire()
+
+        labels = {"client": type(self).__name__, "method": method}
+        # The gap between "upstream" and "http_request" is the wait for a pool slot.
+        with Tracer.span("upstream", "http", url=url, **labels):
+            async with ConnectionPool.slot():
+                started = time.perf_counter()
+                try:
+                    with Tracer.span("http_request", "http"):
+                        client = ConnectionPool.get_client()
+                        if client is not None:
+                            response = await client.request(
+                                method, url, timeout=self.TIMEOUT, **kwargs
+                            )
+                        else:
+                            async with httpx.AsyncClient(
+                                timeout=self.TIMEOUT
+                            ) as client:
+                                response = await client.request(method, url, **kwargs)
+                except Exception:
+                    Metrics.inc(API_REQUESTS_TOTAL, outcome="error", **labels)
+                    raise
+                finally:
+                    Metrics.observe(
+                        API_REQUEST_SECONDS, time.perf_counter() - started, **labels
+                    )
+
+        Metrics.inc(API_REQUESTS_TOTAL, outcome=str(response.status_code), **labels)
+        limiter.update(response.headers, response.status_code)
+        response.raise_for_status()
+        return response
 
     async def get(
         self, url: str, params: Optional[dict | list[tuple[str, Any]]] = None
@@ -19,21 +167,23 @@ class BaseAPIClient:
         :return: Parsed JSON response as a dictionary.
         :raises httpx.HTTPStatusError: If the response contains an error status.
         """
-        async with httpx.AsyncClient(timeout=self.TIMEOUT) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
+
+        async def fetch() -> dict:
+            response = await self._request("GET", url, params=params)
             return response.json()
 
-    async def post(self, url: str, data: Optional[dict] = None) -> dict:
+        if not self.SINGLE_FLIGHT:
+            return await fetch()
+        return await self._single_flight.do((url, freeze_params(params)), fetch)
+
+    async def post(self, url: str, data: Optional[dict | list] = None) -> dict:
         """
         Send an asynchronous POST request.
 
         :param url: The target URL.
-        :param data: Optional payload as a dictionary.
+        :param data: Optional JSON payload (a dictionary or a list).
         :return: Parsed JSON response as a dictionary.
         :raises httpx.HTTPStatusError: If the response contains an error status.
         """
-        async with httpx.AsyncClient(timeout=self.TIMEOUT) as client:
-            response = await client.post(url, json=data)
-            response.raise_for_status()
-            return response.json()
+        response = await self._request("POST", url, json=data)
+        return response.json()
@@ -0,0 +1,112 @@
+import asyncio
+import contextlib
+import importlib.util
+from typing import AsyncContextManager, Optional
+
+import httpx
+
+from config.settings import (
+    HTTP2_ENABLED,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_IN_FLIGHT,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+)
+from utils.logger import info_logger, error_logger
+
+
+class ConnectionPool:
+    """
+    Process-wide pooled httpx client shared by all API clients.
+
+    While the pool is open, every request sent through BaseAPIClient reuses its
+    keep-alive connections instead of opening a new TCP+TLS connection per call.
+    The pool is reference counted, so nested open/close pairs are safe.
+
+    The pool also caps the number of requests in flight at once, so the number of
+    open sockets stays bounded regardless of how many files are being processed.
+    """
+
+    _client: Optional[httpx.AsyncClient] = None
+    _in_flight: Optional[asyncio.Semaphore] = None
+    _users: int = 0
+
+    @classmethod
+    async def open(
+        cls,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        http2: bool = HTTP2_ENABLED,
+        max_in_flight: int = HTTP_MAX_IN_FLIGHT,
+    ) -> httpx.AsyncClient:
+        """
+        Open the shared client, or reuse it if it is already open.
+
+        :param max_connections: Maximum number of concurrent connections.
+        :param max_keepalive_connections: Maximum number of idle connections kept alive.
+        :param keepalive_expiry: Seconds an idle connection is kept before closing.
+        :param http2: Whether to negotiate HTTP/2 (requires the optional `h2` package).
+        :param max_in_flight: Maximum number of concurrent requests (0 = unlimited).
+        :return: The shared httpx.AsyncClient instance.
+        """
+        cls._users += 1
+        if cls._client is not None and not cls._client.is_closed:
+            return cls._client
+
+        if http2 and importlib.util.find_spec("h2") is None:
+            error_logger.error(
+                "[POOL] HTTP/2 requested but the 'h2' package is not installed. "
+                "Falling back to HTTP/1.1."
+            )
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        cls._client = httpx.AsyncClient(limits=limits, http2=http2)
+        cls._in_flight = asyncio.Semaphore(max_in_flight) if max_in_flight > 0 else None
+        info_logger.info(
+            f"[POOL] Opened shared HTTP client "
+            f"(max_connections={max_connections}, "
+            f"keepalive={max_keepalive_connections}, http2={http2})"
+        )
+        return cls._client
+
+    @classmethod
+    async def close(cls) -> None:
+        """
+        Release one user of the shared client and close it when no users remain.
+        """
+        cls._users = max(cls._users - 1, 0)
+        if cls._users or cls._client is None:
+            return
+
+        client, cls._client = cls._client, None
+        cls._in_flight = None
+        await client.aclose()
+        info_logger.info("[POOL] Closed shared HTTP client")
+
+    @classmethod
+    def get_client(cls) -> Optional[httpx.AsyncClient]:
+        """
+        Return the shared client if the pool is open.
+
+        :return: The open httpx.AsyncClient, or None when the pool is closed.
+        """
+        if cls._client is None or cls._client.is_closed:
+            return None
+        return cls._client
+
+    @classmethod
+    def slot(cls) -> AsyncContextManager:
+        """
+        Return a context manager that reserves one in-flight request slot.
+
+        :return: The in-flight semaphore, or a no-op context when the pool is closed.
+        """
+        if cls._in_flight is None or cls.get_client() is None:
+            return contextlib.nullcontext()
+        return cls._in_flight
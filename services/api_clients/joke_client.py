@@ -1,17 +1,149 @@
-from typing import Any
+import asyncio
+import collections
+from typing import Any, Deque, Optional
 
+from config.settings import (
+    JOKE_PREFILL_CONCURRENCY,
+    JOKE_RATE_BURST,
+    JOKE_RATE_LIMIT,
+    JOKE_RESERVOIR_LOW_WATER,
+    JOKE_RESERVOIR_SIZE,
+)
 from services.api_clients.base_client import BaseAPIClient
+from utils.logger import info_logger, error_logger
 
 
 class JokeClient(BaseAPIClient):
-    """Client for retrieving random jokes."""
+    """
+    Client for retrieving random jokes.
+
+    Upcoming joke requests are announced with `prefill`; announced jokes are then
+    served from an in-memory reservoir filled ten at a time from the bulk endpoint.
+    Bulk requests are only sent for announced jokes the reservoir and the requests
+    already in flight do not cover, starting when the first joke is actually
+    requested and again whenever the reservoir drops to `reservoir_low_water`, so
+    nothing is fetched that no task will use. A request that finds the reservoir
+    empty waits for the bulk requests in flight; only if they fail, or the joke was
+    never announced, is a single joke fetched as before.
+    """
 
     BASE_URL: str = "https://official-joke-api.appspot.com/random_joke"
+    BULK_URL: str = "https://official-joke-api.appspot.com/random_ten"
+    BULK_SIZE: int = 10
+    RATE_LIMIT_PER_SECOND: float = JOKE_RATE_LIMIT
+    RATE_LIMIT_BURST: int = JOKE_RATE_BURST
+
+    def __init__(
+        self,
+        reservoir_size: int = JOKE_RESERVOIR_SIZE,
+        reservoir_low_water: int = JOKE_RESERVOIR_LOW_WATER,
+        prefill_concurrency: int = JOKE_PREFILL_CONCURRENCY,
+    ) -> None:
+        """
+        :param reservoir_size: Maximum number of jokes fetched ahead (0 = no reservoir).
+        :param reservoir_low_water: Reservoir level at which more announced jokes are fetched.
+        :param prefill_concurrency: Maximum bulk requests in flight.
+        """
+        super().__init__()
+        self.reservoir_size = reservoir_size
+        self.reservoir_low_water = reservoir_low_water
+        self.prefill_concurrency = max(prefill_concurrency, 1)
+        self._reservoir: Deque[dict[str, Any]] = collections.deque()
+        self._announced = 0
+        self._in_flight = 0
+        self._fill_task: Optional[asyncio.Task] = None
 
     async def get_random_joke(self) -> dict[str, Any]:
         """
-        Retrieve a random joke.
+        Retrieve a random joke, from the reservoir when it was announced.
 
         :return: Dictionary containing joke data.
         """
+        if self._announced > 0:
+            if len(self._reservoir) <= self.reservoir_low_water:
+                self._start_fill()
+            while not self._reservoir:
+                self._start_fill()
+                if not self._filling() or not await asyncio.shield(self._fill_task):
+                    break
+        self._announced = max(self._announced - 1, 0)
+        if self._reservoir:
+            return self._reservoir.popleft()
         return await self.get(self.BASE_URL)
+
+    async def get_ten_jokes(self) -> list[dict[str, Any]]:
+        """
+        Retrieve ten random jokes in a single request.
+
+        :return: List of joke dictionaries.
+        :raises ValueError: If the response is not a list of jokes.
+        """
+        jokes = await self.get(self.BULK_URL)
+        if not isinstance(jokes, list):
+            raise ValueError("Unexpected bulk joke response")
+        return jokes
+
+    async def prefill(self, count: int) -> None:
+        """
+        Announce `count` upcoming joke requests, to be served from the reservoir.
+
+        Nothing is fetched here: bulk requests start with the first `get_random_joke`
+        call. A failed bulk request is logged; the affected tasks fall back to single
+        requests.
+
+        :param count: Number of jokes about to be requested.
+        """
+        if self.reservoir_size <= 0:
+            return
+        self._announced += count
+
+    def close(self) -> None:
+        """Stop bulk requests that are still running."""
+        if self._fill_task is not None:
+            self._fill_task.cancel()
+            self._fill_task = None
+
+    def _missing(self) -> int:
+        """:return: Announced jokes covered neither by the reservoir nor by requests in flight."""
+        wanted = min(self._announced, self.reservoir_size)
+        return wanted - len(self._reservoir) - self._in_flight
+
+    def _filling(self) -> bool:
+        """:return: Whether bulk requests are in flight."""
+        return self._fill_task is not None and not self._fill_task.done()
+
+    def _start_fill(self) -> None:
+        """Start bulk requests for missing announced jokes, unless they are already running."""
+        if not self._filling() and self._missing() > 0:
+            self._fill_task = asyncio.create_task(self._fill())
+
+    async def _fill(self) -> bool:
+        """
+        Fetch missing announced jokes with concurrent bulk requests until none are missing.
+
+        :return: False if the last round of bulk requests all failed.
+        """
+        semaphore = asyncio.Semaphore(self.prefill_concurrency)
+
+        async def load_bulk() -> bool:
+            async with semaphore:
+                try:
+                    self._reservoir.extend(await self.get_ten_jokes())
+                    return True
+                except Exception as e:
+                    error_logger.error(f"[JOKE] Failed bulk joke request: {str(e)}")
+                    return False
+                finally:
+                    self._in_flight -= self.BULK_SIZE
+
+        while (missing := self._missing()) > 0:
+            requests = -(-missing // self.BULK_SIZE)
+            self._in_flight += requests * self.BULK_SIZE
+            loaded = await asyncio.gather(*(load_bulk() for _ in range(requests)))
+            info_logger.info(
+                f"[JOKE] {sum(loaded)} bulk requests for {missing} announced jokes "
+                f"({len(self._reservoir)} ready)"
+            )
+            if not any(loaded):
+                return False
+        return True
@@ -1,12 +1,52 @@
-from typing import Any
+import asyncio
+from typing import Any, List, Optional, Set, Tuple
 
+from config.settings import (
+    POSTMAN_BULK_ENABLED,
+    POSTMAN_BULK_SIZE,
+    POSTMAN_BULK_WINDOW_MS,
+    POSTMAN_RATE_BURST,
+    POSTMAN_RATE_LIMIT,
+)
 from services.api_clients.base_client import BaseAPIClient
+from utils.logger import info_logger
 
 
 class PostmanClient(BaseAPIClient):
-    """Client for testing HTTP POST requests using Postman Echo."""
+    """
+    Client for testing HTTP POST requests using Postman Echo.
+
+    By default every result is posted on its own. In bulk mode, results posted
+    concurrently are buffered and sent as one JSON array once `bulk_size` items
+    are collected or `bulk_window_seconds` have passed; the echoed array is split
+    back so every caller still receives its own `{"json": ...}` echo.
+    """
 
     BASE_URL: str = "https://postman-echo.com/post"
+    RATE_LIMIT_PER_SECOND: float = POSTMAN_RATE_LIMIT
+    RATE_LIMIT_BURST: int = POSTMAN_RATE_BURST
+
+    def __init__(
+        self,
+        bulk: bool = POSTMAN_BULK_ENABLED,
+        bulk_size: int = POSTMAN_BULK_SIZE,
+        bulk_window_seconds: float = POSTMAN_BULK_WINDOW_MS / 1000,
+        base_url: Optional[str] = None,
+    ) -> None:
+        """
+        :param bulk: Whether to buffer results and post them as arrays.
+        :param bulk_size: Maximum number of results per bulk request.
+        :param bulk_window_seconds: Maximum time a result waits for others to join its batch.
+        :param base_url: Echo endpoint to post to (defaults to BASE_URL).
+        """
+        super().__init__()
+        self.bulk = bulk
+        self.bulk_size = max(bulk_size, 1)
+        self.bulk_window_seconds = bulk_window_seconds
+        self.base_url = base_url or self.BASE_URL
+        self._pending: List[Tuple[dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._requests: Set[asyncio.Task] = set()
 
     async def post_response(self, data: dict[str, Any]) -> dict[str, Any]:
         """
@@ -15,4 +55,68 @@ class PostmanClient(BaseAPIClient):
         :param data: Dictionary to send in the request body.
         :return: Echoed response from Postman Echo.
         """
-        return await self.post(self.BASE_URL, data)
+        if not self.bulk:
+            return await self.post(self.base_url, data)
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((data, future))
+
+        if len(self._pending) >= self.bulk_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.bulk_window_seconds, self._flush)
+
+        return await future
+
+    async def post_responses(self, items: List[dict[str, Any]]) -> List[Any]:
+        """
+        Send several results in one POST request.
+
+        :param items: Dictionaries to send as a JSON array.
+        :return: The echoed items, in the order they were sent.
+        :raises ValueError: If the echo does not contain one item per result.
+        """
+        response = await self.post(self.base_url, items)
+        echoed = response.get("json")
+        if not isinstance(echoed, list) or len(echoed) != len(items):
+            raise ValueError(
+                f"Bulk echo returned {len(echoed) if isinstance(echoed, list) else 'no'} "
+                f"items for {len(items)} results"
+            )
+        return echoed
+
+    def _flush(self) -> None:
+        """Send the buffered results as one bulk request."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._send_batch(batch))
+        self._requests.add(task)
+        task.add_done_callback(self._requests.discard)
+
+    async def _send_batch(
+        self, batch: List[Tuple[dict[str, Any], asyncio.Future]]
+    ) -> None:
+        """
+        Post a batch and resolve every caller with its own echoed item.
+
+        :param batch: (result, future) pairs in buffering order.
+        """
+        try:
+            echoed = await self.post_responses([data for data, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        info_logger.info(f"[BULK] Forwarded {len(batch)} results in one request")
+        for (_, future), item in zip(batch, echoed):
+            if not future.done():
+                future.set_result({"json": item})
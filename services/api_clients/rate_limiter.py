@@ -0,0 +1,179 @@
+import asyncio
+import time
+from typing import Dict, Iterable, Mapping, Optional
+
+from config.settings import RATE_LIMIT_LOW_QUOTA
+
+REMAINING_HEADERS = (
+    "x-rate-limit-remaining",
+    "x-ratelimit-remaining",
+    "ratelimit-remaining",
+)
+RESET_HEADERS = ("x-rate-limit-reset", "x-ratelimit-reset", "ratelimit-reset")
+RETRY_AFTER_HEADER = "retry-after"
+EPOCH_THRESHOLD = 1_000_000_000  # reset values above this are Unix timestamps
+
+
+def _header_float(headers: Mapping[str, str], names: Iterable[str]) -> Optional[float]:
+    """
+    Read the first of the given headers that holds a number.
+
+    :param headers: Response headers (case-insensitive mapping).
+    :param names: Header names to try, in order.
+    :return: The numeric header value, or None if absent or not a number.
+    """
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            continue
+    return None
+
+
+class TokenBucket:
+    """
+    Token bucket for a single upstream host.
+
+    The bucket starts at the configured rate (0 = no fixed limit) and is adjusted
+    from the quota headers of every response: once fewer than `low_quota` requests
+    remain, they are spread evenly over the time left until the quota resets, and
+    requests are paused entirely when the quota is exhausted or the upstream
+    answers 429. While plenty of quota is left the configured rate applies, so a
+    long (e.g. daily) reset window does not slow a run down to a trickle.
+    """
+
+    def __init__(
+        self, rate: float = 0.0, burst: int = 1, low_quota: int = RATE_LIMIT_LOW_QUOTA
+    ) -> None:
+        """
+        :param rate: Configured requests per second (0 = limited only by upstream headers).
+        :param burst: Maximum number of requests sent back to back.
+        :param low_quota: Remaining quota below which requests are paced to last until the reset.
+        """
+        self.configured_rate = rate
+        self.low_quota = low_quota
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.adaptive_until = 0.0
+        self.throttled = 0
+
+    def reserve(self) -> float:
+        """
+        Take one token and return how long the caller must wait before sending.
+
+        Tokens may go negative, which queues callers fairly without a lock.
+
+        :return: Seconds to wait (0 when the request may be sent immediately).
+        """
+        now = time.monotonic()
+        if self.adaptive_until and now >= self.adaptive_until:
+            self.rate = self.configured_rate
+            self.adaptive_until = 0.0
+
+        wait = max(self.blocked_until - now, 0.0)
+        if self.rate > 0:
+            elapsed = now - self.updated
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens < 0:
+                wait = max(wait, -self.tokens / self.rate)
+
+        if wait > 0:
+            self.throttled += 1
+        return wait
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def update(self, headers: Mapping[str, str], status_code: int) -> None:
+        """
+        Adjust the bucket from a response's rate-limit headers.
+
+        :param headers: Response headers.
+        :param status_code: Response HTTP status code.
+        """
+        now = time.monotonic()
+        remaining = _header_float(headers, REMAINING_HEADERS)
+        reset = _header_float(headers, RESET_HEADERS)
+        if reset is not None and reset > EPOCH_THRESHOLD:
+            reset -= time.time()
+
+        if status_code == 429:
+            retry_after = _header_float(headers, (RETRY_AFTER_HEADER,))
+            pause = retry_after or reset or 1.0
+            self.blocked_until = max(self.blocked_until, now + pause)
+            return
+
+        if remaining is None or reset is None or reset <= 0:
+            return
+
+        if remaining <= 0:
+            self.blocked_until = max(self.blocked_until, now + reset)
+            return
+
+        if remaining >= self.low_quota:
+            self.rate = self.configured_rate
+            self.adaptive_until = 0.0
+            return
+
+        quota_rate = remaining / reset
+        if self.configured_rate > 0:
+            quota_rate = min(quota_rate, self.configured_rate)
+        if quota_rate != self.rate:
+            self.tokens = min(self.tokens, remaining)
+            self.updated = now
+        self.rate = quota_rate
+        self.adaptive_until = now + reset
+
+    def stats(self) -> Dict[str, float]:
+        """
+        :return: Current effective rate, throttled request count and pause status.
+        """
+        return {
+            "rate": self.rate,
+            "throttled": self.throttled,
+            "blocked": self.blocked_until > time.monotonic(),
+        }
+
+
+class RateLimiter:
+    """Registry of per-host token buckets shared by all API client instances."""
+
+    _buckets: Dict[str, TokenBucket] = {}
+
+    @classmethod
+    def for_host(cls, host: str, rate: float = 0.0, burst: int = 1) -> TokenBucket:
+        """
+        Return the bucket for a host, creating it with the given limits if needed.
+
+        :param host: Upstream host name.
+        :param rate: Configured requests per second (0 = header-driven only).
+        :param burst: Maximum number of back-to-back requests.
+        :return: The host's TokenBucket.
+        """
+        bucket = cls._buckets.get(host)
+        if bucket is None:
+            bucket = cls._buckets[host] = TokenBucket(rate, burst)
+        return bucket
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict[str, float]]:
+        """
+        :return: Per-host limiter statistics.
+        """
+        return {host: bucket.stats() for host, bucket in cls._buckets.items()}
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget all buckets (e.g. between independent runs or tests)."""
+        cls._buckets.clear()
@@ -0,0 +1,217 @@
+import random
+import time
+from typing import Dict
+
+import httpx
+
+from config.settings import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RECOVERY_SECONDS,
+    HTTP_RETRY_BACKOFF,
+    HTTP_RETRY_BUDGET_RATIO,
+    HTTP_RETRY_MAX_BACKOFF,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is rejected because its endpoint's circuit is open."""
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Decide whether a failed request is worth retrying.
+
+    Timeouts, connection errors, 429 and 5xx responses are transient; other
+    client errors (4xx) will fail the same way again.
+
+    :param error: The exception raised by the request.
+    :return: True if the request may succeed on retry.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = HTTP_RETRY_BACKOFF,
+    maximum: float = HTTP_RETRY_MAX_BACKOFF,
+) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    :param attempt: Zero-based retry number.
+    :param base: Delay before the first retry, in seconds.
+    :param maximum: Upper bound of the delay, in seconds.
+    :return: Seconds to sleep before the retry.
+    """
+    return random.uniform(0, min(maximum, base * 2**attempt))
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests
+    fail fast. Once `recovery_seconds` have passed, a single probe request is let
+    through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        recovery_seconds: float = CIRCUIT_RECOVERY_SECONDS,
+    ) -> None:
+        """
+        :param failure_threshold: Consecutive failures that open the circuit (0 = never).
+        :param recovery_seconds: Time the circuit stays open before a probe is allowed.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        """
+        :return: True if a request may be sent now.
+        """
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            return True
+        # Half-open: a probe is already in flight.
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def release(self) -> None:
+        """Give up a half-open probe that ended without a result (e.g. cancelled)."""
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+
+    def record_failure(self) -> None:
+        """Count a failure and open the circuit when the threshold is reached."""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (
+            self.failure_threshold and self.failures >= self.failure_threshold
+        ):
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of the requests sent to a host.
+
+    Every request deposits `ratio` tokens and every retry spends one, so during an
+    outage retries stay a bounded share of the traffic instead of multiplying it.
+    """
+
+    def __init__(
+        self,
+        ratio: float = HTTP_RETRY_BUDGET_RATIO,
+        min_tokens: float = 10.0,
+        max_tokens: float = 100.0,
+    ) -> None:
+        """
+        :param ratio: Retry tokens earned per request.
+        :param min_tokens: Initial tokens, so the first failures can still be retried.
+        :param max_tokens: Maximum number of tokens that can be saved up.
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = min_tokens
+
+    def deposit(self) -> None:
+        """Earn retry tokens for a new request."""
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Spend a token for a retry.
+
+        :return: True if the retry is within budget.
+        """
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class Resilience:
+    """Registry of circuit breakers, retry budgets and counters shared by all clients."""
+
+    _breakers: Dict[str, CircuitBreaker] = {}
+    _budgets: Dict[str, RetryBudget] = {}
+    _counters: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def breaker(cls, endpoint: str) -> CircuitBreaker:
+        """
+        :param endpoint: Endpoint identifier ("METHOD host/path").
+        :return: The endpoint's circuit breaker.
+        """
+        breaker = cls._breakers.get(endpoint)
+        if breaker is None:
+            breaker = cls._breakers[endpoint] = CircuitBreaker()
+        return breaker
+
+    @classmethod
+    def budget(cls, host: str) -> RetryBudget:
+        """
+        :param host: Upstream host name.
+        :return: The host's retry budget.
+        """
+        budget = cls._budgets.get(host)
+        if budget is None:
+            budget = cls._budgets[host] = RetryBudget()
+        return budget
+
+    @classmethod
+    def count(cls, endpoint: str, counter: str) -> None:
+        """
+        Increment one of an endpoint's counters.
+
+        :param endpoint: Endpoint identifier.
+        :param counter: Counter name ("requests", "retries", "failures", ...).
+        """
+        counters = cls._counters.setdefault(
+            endpoint,
+            {
+                "requests": 0,
+                "retries": 0,
+                "failures": 0,
+                "rejected": 0,
+                "budget_exhausted": 0,
+            },
+        )
+        counters[counter] += 1
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict[str, int | str]]:
+        """
+        :return: Per-endpoint counters together with the current circuit state.
+        """
+        return {
+            endpoint: {**counters, "circuit": cls.breaker(endpoint).state}
+            for endpoint, counters in cls._counters.items()
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget all breakers, budgets and counters."""
+        cls._breakers.clear()
+        cls._budgets.clear()
+        cls._counters.clear()
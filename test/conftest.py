@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# The loggers open their files when utils.logger is imported, so LOG_DIR has to point
+# away from the repository before any application module is loaded. Spawned shard
+# processes inherit the variable.
+os.environ["LOG_DIR"] = tempfile.mkdtemp(prefix="json_processor_test_logs_")
+
+from resources.processor import AsyncJsonProcessor
+from services.api_clients import RateLimiter, Resilience
+from utils.metrics import Metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_client_state():
+    """
+    Fixture that isolates the process-wide rate-limiter, circuit-breaker and metrics
+    state, so failures provoked by one test never throttle or short-circuit another.
+    """
+    RateLimiter.reset()
+    Resilience.reset()
+    Metrics.reset()
+    yield
+    RateLimiter.reset()
+    Resilience.reset()
+    Metrics.reset()
+
+
+@pytest.fixture(autouse=True)
+def isolate_state_files(tmp_path: Path, monkeypatch):
+    """
+    Fixture that redirects the age cache, scan checkpoint, run journal and metrics
+    textfile of processors built with default paths into the test's tmp directory,
+    so no test writes cache/ or metrics/ files into the repository. The environment
+    variables carry the same paths into spawned shard processes.
+    """
+    state = tmp_path / "_state"
+    paths = {
+        "age_cache_path": state / "age_cache.sqlite3",
+        "scan_checkpoint_path": state / "scan_checkpoint.json",
+        "journal_path": state / "run_journal.jsonl",
+        "metrics_path": state / "json_processor.prom",
+    }
+    for variable, key in (
+        ("AGE_CACHE_PATH", "age_cache_path"),
+        ("SCAN_CHECKPOINT_PATH", "scan_checkpoint_path"),
+        ("JOURNAL_PATH", "journal_path"),
+        ("METRICS_TEXTFILE_PATH", "metrics_path"),
+    ):
+        monkeypatch.setenv(variable, str(paths[key]))
+    monkeypatch.setattr(
+        "resources.sharded_runner.AGE_CACHE_PATH", paths["age_cache_path"]
+    )
+
+    original_init = AsyncJsonProcessor.__init__
+
+    def init(self, *args, **kwargs):
+        for key, path in paths.items():
+            kwargs.setdefault(key, path)
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(AsyncJsonProcessor, "__init__", init)
+    yield
+
+
+def pytest_unconfigure(config) -> None:
+    """Close the log files and remove the temporary log directory after the session."""
+    from utils.logger import shutdown_logging
+
+    shutdown_logging()
+    shutil.rmtree(os.environ["LOG_DIR"], ignore_errors=True)
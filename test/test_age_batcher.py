@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from managers.age_batcher import AgeMicroBatcher
+from services.api_clients import AgifyClient
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.dispatcher
+async def test_concurrent_misses_are_sent_as_one_batch(monkeypatch) -> None:
+    """Test that concurrent lookups for one country become a single batch request."""
+    client = AgifyClient()
+    batch_calls = []
+
+    async def fake_get_batch_ages(names: list, country: str) -> list:
+        batch_calls.append((names, country))
+        return [
+            {"name": name, "age": len(name), "country_id": country} for name in names
+        ]
+
+    monkeypatch.setattr(client, "get_batch_ages", fake_get_batch_ages)
+    batcher = AgeMicroBatcher(client, window_seconds=0.01)
+
+    results = await asyncio.gather(
+        batcher.get_age("Ann", "US"),
+        batcher.get_age("Bella", "US"),
+        batcher.get_age("Ann", "US"),
+    )
+
+    assert batch_calls == [(["Ann", "Bella"], "US")]
+    assert [result["age"] for result in results] == [3, 5, 3]
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.dispatcher
+async def test_full_batch_is_sent_without_waiting(monkeypatch) -> None:
+    """Test that a batch is flushed as soon as it reaches Agify's 10-name limit."""
+    client = AgifyClient()
+    batch_sizes = []
+
+    async def fake_get_batch_ages(names: list, country: str) -> list:
+        batch_sizes.append(len(names))
+        return [{"name": name, "age": 30} for name in names]
+
+    monkeypatch.setattr(client, "get_batch_ages", fake_get_batch_ages)
+    batcher = AgeMicroBatcher(client, window_seconds=60)
+
+    names = [f"Name{chr(65 + i)}" for i in range(10)]
+    await asyncio.wait_for(
+        asyncio.gather(*(batcher.get_age(name, "DE") for name in names)), timeout=1
+    )
+
+    assert batch_sizes == [10]
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.dispatcher
+async def test_batch_error_is_propagated_to_all_callers(monkeypatch) -> None:
+    """Test that a failed batch request raises in every waiting caller."""
+    client = AgifyClient()
+
+    async def failing_get_batch_ages(names: list, country: str) -> list:
+        raise RuntimeError("Agify down")
+
+    monkeypatch.setattr(client, "get_batch_ages", failing_get_batch_ages)
+    batcher = AgeMicroBatcher(client, window_seconds=0.01)
+
+    results = await asyncio.gather(
+        batcher.get_age("Ann", "FR"),
+        batcher.get_age("Bella", "FR"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,97 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from managers.age_cache import AgeCache
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.cache
+async def test_age_cache_persists_between_runs(tmp_path: Path) -> None:
+    """Test that flushed predictions are loaded back by a new cache (warm start)."""
+    db_path = tmp_path / "age_cache.sqlite3"
+
+    cache = AgeCache(db_path)
+    await cache.open()
+    cache[("Alice", "US")] = {"name": "Alice", "age": 30}
+    await cache.close()
+
+    warm_cache = AgeCache(db_path)
+    await warm_cache.open()
+
+    assert ("Alice", "US") in warm_cache
+    assert warm_cache.get(("Alice", "US"))["age"] == 30
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.cache
+async def test_age_cache_skips_expired_entries(tmp_path: Path) -> None:
+    """Test that entries older than the TTL are neither served nor loaded."""
+    db_path = tmp_path / "age_cache.sqlite3"
+
+    cache = AgeCache(db_path, ttl_seconds=0.01)
+    cache[("Bob", "GB")] = {"name": "Bob", "age": 42}
+    await cache.flush()
+    time.sleep(0.02)
+
+    assert ("Bob", "GB") not in cache
+
+    warm_cache = AgeCache(db_path)
+    await warm_cache.open()
+    assert len(warm_cache) == 0
+
+
+@pytest.mark.unit
+@pytest.mark.cache
+def test_age_cache_counts_hits_and_misses() -> None:
+    """Test that lookups through get() update the hit/miss counters."""
+    cache = AgeCache()
+    cache[("Anna", "PL")] = {"name": "Anna", "age": 25}
+
+    assert cache.get(("Anna", "PL")) is not None
+    assert cache.get(("Ola", "PL")) is None
+
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "expirations": 0,
+        "size": 1,
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.cache
+def test_age_cache_evicts_least_recently_used() -> None:
+    """Test that the cache stays bounded and evicts the entry used longest ago."""
+    cache = AgeCache(max_entries=2)
+    cache[("Anna", "PL")] = {"age": 25}
+    cache[("Ola", "PL")] = {"age": 31}
+    cache.get(("Anna", "PL"))
+
+    cache[("Jan", "PL")] = {"age": 40}
+
+    assert len(cache) == 2
+    assert ("Anna", "PL") in cache
+    assert ("Ola", "PL") not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.cache
+def test_age_cache_drops_expired_entries_on_lookup() -> None:
+    """Test that stale entries are removed when looked up, and a zero TTL never expires."""
+    cache = AgeCache(ttl_seconds=0.01)
+    cache[("Bob", "GB")] = {"age": 42}
+    time.sleep(0.02)
+
+    assert cache.get(("Bob", "GB")) is None
+    assert len(cache) == 0
+    assert cache.stats()["expirations"] == 1
+
+    forever = AgeCache(ttl_seconds=0)
+    forever[("Bob", "GB")] = {"age": 42}
+    assert ("Bob", "GB") in forever
@@ -0,0 +1,374 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from services.api_clients import (
+    AgifyClient,
+    BaseAPIClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    ConnectionPool,
+    JokeClient,
+    PostmanClient,
+    RateLimiter,
+    RetryBudget,
+    TokenBucket,
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.clients
+@respx.mock
+async def test_clients_share_pooled_connection() -> None:
+    """Test that all clients reuse the same pooled httpx client while the pool is open."""
+    respx.get("https://api.agify.io").mock(
+        return_value=Response(200, json={"name": "Alice", "age": 30})
+    )
+    respx.post("https://postman-echo.com/post").mock(
+        return_value=Response(200, json={"json": {"age": 30}})
+    )
+
+    client = await ConnectionPool.open()
+    try:
+        assert ConnectionPool.get_client() is client
+        await AgifyClient().get_age("Alice", "US")
+        await PostmanClient().post_response({"age": 30})
+        assert ConnectionPool.get_client() is client
+    finally:
+        await ConnectionPool.close()
+
+    assert ConnectionPool.get_client() is None
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.clients
+async def test_connection_pool_is_reference_counted() -> None:
+    """Test that nested open/close pairs keep the client open until the last close."""
+    outer = await ConnectionPool.open()
+    inner = await ConnectionPool.open()
+    assert inner is outer
+
+    await ConnectionPool.close()
+    assert ConnectionPool.get_client() is outer
+
+    await ConnectionPool.close()
+    assert ConnectionPool.get_client() is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.clients
+async def test_connection_pool_http2_falls_back_without_h2(monkeypatch) -> None:
+    """Test that requesting HTTP/2 without the `h2` package falls back to HTTP/1.1."""
+    monkeypatch.setattr(
+        "services.api_clients.connection_pool.importlib.util.find_spec",
+        lambda name: None,
+    )
+
+    client = await ConnectionPool.open(http2=True)
+    try:
+        assert not client.is_closed
+    finally:
+        await ConnectionPool.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.clients
+@respx.mock
+async def test_client_works_without_open_pool() -> None:
+    """Test that a request still succeeds with a one-off client when the pool is closed."""
+    respx.get("https://api.agify.io").mock(
+        return_value=Response(200, json={"name": "Bob", "age": 40})
+    )
+
+    assert ConnectionPool.get_client() is None
+    result = await AgifyClient().get_age("Bob", "GB")
+    assert result["age"] == 40
+
+
+@pytest.mark.unit
+@pytest.mark.clients
+def test_token_bucket_enforces_configured_rate() -> None:
+    """Test that requests beyond the burst must wait according to the rate."""
+    bucket = TokenBucket(rate=10, burst=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.throttled == 1
+
+
+@pytest.mark.unit
+@pytest.mark.clients
+def test_token_bucket_paces_by_remaining_quota() -> None:
+    """Test that the quota headers spread the remaining requests over the reset window."""
+    bucket = TokenBucket(rate=0, burst=5)
+    bucket.update({"x-rate-limit-remaining": "10", "x-rate-limit-reset": "20"}, 200)
+
+    assert bucket.rate == pytest.approx(0.5)
+    waits = [bucket.reserve() for _ in range(6)]
+    assert waits[:5] == [0, 0, 0, 0, 0]
+    assert waits[5] == pytest.approx(2.0, abs=0.01)
+
+
+@pytest.mark.unit
+@pytest.mark.clients
+def test_token_bucket_keeps_configured_rate_with_plenty_of_quota() -> None:
+    """Test that a large remaining quota with a long reset window does not slow the bucket."""
+    bucket = TokenBucket(rate=10, burst=2, low_quota=100)
+    bucket.update({"x-ratelimit-remaining": "900", "x-ratelimit-reset": "80000"}, 200)
+
+    assert bucket.rate == 10
+    assert bucket.adaptive_until == 0
+
+    bucket.update({"x-ratelimit-remaining": "50", "x-ratelimit-reset": "100"}, 200)
+    assert bucket.rate == pytest.approx(0.5)
+
+
+@pytest.mark.unit
+@pytest.mark.clients
+def test_token_bucket_pauses_on_exhausted_quota_and_429() -> None:
+    """Test that an exhausted quota or a 429 pauses the host until reset."""
+    bucket = TokenBucket()
+    bucket.update({"x-rate-limit-remaining": "0", "x-rate-limit-reset": "30"}, 200)
+    assert bucket.reserve() == pytest.approx(30, abs=0.1)
+
+    bucket = TokenBucket()
+    bucket.update({"retry-after": "7"}, 429)
+    assert bucket.reserve() == pytest.approx(7, abs=0.1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.clients
+@respx.mock
+async def test_client_feeds_quota_headers_to_host_limiter() -> None:
+    """Test that BaseAPIClient updates the per-host bucket from response headers."""
+    respx.get("https://api.agify.io").mock(
+        return_value=Response(
+            200,
+            json={"name": "Alice", "age": 30},
+            headers={"X-Rate-Limit-Remaining": "50", "X-Rate-Limit-Reset": "100"},
+        )
+    )
+
+    await AgifyClient().get_age("Alice", "US")
+
+    stats = RateLimiter.stats()["api.agify.io"]
+    assert stats["rate"] == pytest.approx(0.5)
+    assert not stats["blocked"]
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """Fixture that removes retry sleeps to keep the tests fast."""
+    monkeypatch.setattr(
+        "services.api_clients.base_client.backoff_delay", lambda attempt: 0
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.clients
+@respx.mock
+async def test_transient_errors_are_retried(no_backoff) -> None:
+    """Test that a 503 followed by a success is retried transparently."""
+    route = respx.get("https://api.agify.io").mock(
+        side_effect=[
+            Response(503),
+            httpx.ConnectTimeout("timed out"),
+            Response(200, json={"name": "Alice", "age": 30}),
+        ]
+    )
+
+    result = await AgifyClient().get_age("Alice", "US")
+
+    assert result["age"] == 30
+    assert route.call_count == 3
+    stats = BaseAPIClient.resilience_stats()["GET api.agify.io/"]
+    assert stats["retries"] == 2
+    assert stats["circuit"] == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.clients
+@respx.mock
+async def test_client_errors_are_not_retried(no_backoff) -> None:
+    """Test that a 4xx response fails immediately without retries."""
+    route = respx.post("https://postman-echo.com/post").mock(
+        return_value=Response(400)
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await PostmanClient().post_response({"age": 30})
+
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.clients
+@respx.mock
+async def test_circuit_opens_after_repeated_failures(no_backoff) -> None:
+    """Test that the circuit opens after consecutive failures and then fails fast."""
+    route = respx.get("https://official-joke-api.appspot.com/random_joke").mock(
+        return_value=Response(500)
+    )
+    client = JokeClient()
+    client.MAX_RETRIES = 0
+
+    for _ in range(CircuitBreaker().failure_threshold):
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_random_joke()
+
+    with pytest.raises(CircuitOpenError):
+        await client.get_random_joke()
+
+    stats = BaseAPIClient.resilience_stats()[
+        "GET official-joke-api.appspot.com/random_joke"
+    ]
+    assert stats["circuit"] == CircuitBreaker.OPEN
+    assert stats["rejected"] == 1
+    assert route.call_count == CircuitBreaker().failure_threshold
+
+
+@pytest.mark.unit
+@pytest.mark.clients
+def test_circuit_half_open_probe_closes_on_success() -> None:
+    """Test that after the recovery time one probe is allowed and success closes the circuit."""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=10)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    breaker.opened_at -= 10
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.unit
+@pytest.mark.clients
+def test_retry_budget_limits_retries() -> None:
+    """Test that retries stop once the budget earned from requests is spent."""
+    budget = RetryBudget(ratio=0.5, min_tokens=1)
+
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.clients
+@respx.mock
+async def test_joke_reservoir_serves_prefilled_jokes() -> None:
+    """
+    Test that announced jokes are served from memory, fetched in bulk only when
+    requested and only for the announced demand.
+    """
+    ten_jokes = [{"id": i, "setup": "Why?", "punchline": str(i)} for i in range(10)]
+    bulk = respx.get("https://official-joke-api.appspot.com/random_ten").mock(
+        return_value=Response(200, json=ten_jokes)
+    )
+    single = respx.get("https://official-joke-api.appspot.com/random_joke").mock(
+        return_value=Response(200, json={"id": 99})
+    )
+    client = JokeClient(reservoir_size=20, reservoir_low_water=5)
+
+    await client.prefill(15)
+    assert bulk.call_count == 0
+
+    jokes = list(await asyncio.gather(*(client.get_random_joke() for _ in range(5))))
+    assert bulk.call_count == 2
+    jokes += [await client.get_random_joke() for _ in range(10)]
+    await asyncio.sleep(0.01)
+    assert bulk.call_count == 2
+
+    await client.prefill(40)
+    jokes += await asyncio.gather(*(client.get_random_joke() for _ in range(40)))
+    client.close()
+
+    assert single.call_count == 0
+    assert [joke["id"] for joke in jokes[:10]] == list(range(10))
+    assert len(jokes) == 55
+    assert bulk.call_count == 6
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.clients
+@respx.mock
+async def test_joke_reservoir_falls_back_to_single_requests() -> None:
+    """Test that jokes are fetched one by one when unprimed or when the bulk call fails."""
+    respx.get("https://official-joke-api.appspot.com/random_ten").mock(
+        return_value=Response(404)
+    )
+    single = respx.get("https://official-joke-api.appspot.com/random_joke").mock(
+        return_value=Response(200, json={"id": 1})
+    )
+    client = JokeClient()
+
+    assert await client.get_random_joke() == {"id": 1}
+    await client.prefill(3)
+    assert await client.get_random_joke() == {"id": 1}
+    client.close()
+
+    assert single.call_count == 2
+
+
+def echo(request: httpx.Request) -> Response:
+    """Local stand-in for Postman Echo: returns the posted body under "json"."""
+    return Response(200, json={"json": json.loads(request.content)})
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.clients
+@respx.mock
+async def test_postman_bulk_mode_maps_echo_back_per_result() -> None:
+    """Test that concurrent results are posted as arrays and split back per caller."""
+    route = respx.post("https://postman-echo.com/post").mock(side_effect=echo)
+    client = PostmanClient(bulk=True, bulk_size=4, bulk_window_seconds=0.01)
+
+    responses = await asyncio.gather(
+        *(client.post_response({"age": age}) for age in range(10))
+    )
+
+    assert responses == [{"json": {"age": age}} for age in range(10)]
+    assert route.call_count == 3
+    assert [len(json.loads(call.request.content)) for call in route.calls] == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.clients
+@respx.mock
+async def test_postman_bulk_mode_fails_every_caller_on_bad_echo() -> None:
+    """Test that an echo that cannot be mapped back fails the whole batch."""
+    respx.post("https://postman-echo.com/post").mock(
+        return_value=Response(200, json={"json": [{"age": 1}]})
+    )
+    client = PostmanClient(bulk=True, bulk_size=10, bulk_window_seconds=0.01)
+
+    results = await asyncio.gather(
+        client.post_response({"age": 1}),
+        client.post_response({"age": 2}),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
@@ -1,9 +1,11 @@
+import asyncio
 import json
 from pathlib import Path
 
 import pytest
 
-from managers.file_manager import AsyncFileManager
+from managers.file_manager import AsyncFileManager, FileIOEngine
+from managers.scan_checkpoint import ScanCheckpoint
 
 pytestmark = pytest.mark.asyncio
 
@@ -63,4 +65,135 @@ async def test_get_json_files(tmp_path: Path):
 
     assert "file1.json" in json_file_names
     assert "file2.json" in json_file_names
-    assert "not_json.txt" not in json_file_names
\ No newline at end of file
+    assert "not_json.txt" not in json_file_names
+
+@pytest.mark.unit
+@pytest.mark.fileio
+async def test_iter_json_files(tmp_path: Path):
+    """
+    Test lazily streaming all .json files from nested directories.
+    """
+    nested_dir = tmp_path / "day1" / "batch"
+    nested_dir.mkdir(parents=True)
+    (tmp_path / "day1" / "file1.json").write_text("{}", encoding="utf-8")
+    (nested_dir / "file2.json").write_text("{}", encoding="utf-8")
+    (nested_dir / "notes.txt").write_text("Not JSON", encoding="utf-8")
+
+    json_file_names = sorted(
+        [f.name async for f in AsyncFileManager.iter_json_files(tmp_path)]
+    )
+
+    assert json_file_names == ["file1.json", "file2.json"]
+
+
+@pytest.mark.unit
+@pytest.mark.fileio
+async def test_iter_json_files_walks_folders_in_parallel(tmp_path: Path):
+    """
+    Test that every task file of a wide tree is found once and outputs are skipped.
+    """
+    expected = []
+    for day in range(6):
+        folder = tmp_path / f"day{day}" / "batch"
+        folder.mkdir(parents=True)
+        for i in range(5):
+            (folder / f"task_{i}.json").write_text("{}", encoding="utf-8")
+            (folder / f"task_{i}_processed.json").write_text("{}", encoding="utf-8")
+            expected.append(folder / f"task_{i}.json")
+
+    found = [f async for f in AsyncFileManager.iter_json_files(tmp_path, parallelism=3)]
+
+    assert sorted(found) == sorted(expected)
+
+
+@pytest.mark.unit
+@pytest.mark.fileio
+async def test_iter_json_files_skips_drained_directories(tmp_path: Path):
+    """
+    Test that directories drained in the previous scan are not listed again
+    until they change.
+    """
+    (tmp_path / "done" / "old").mkdir(parents=True)
+    (tmp_path / "done" / "old" / "a_processed.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "todo").mkdir()
+    (tmp_path / "todo" / "b.json").write_text("{}", encoding="utf-8")
+    checkpoint_path = tmp_path.parent / f"{tmp_path.name}_checkpoint.json"
+
+    async def scan() -> tuple[list[str], int]:
+        checkpoint = ScanCheckpoint(checkpoint_path, tmp_path, min_age_seconds=0)
+        await checkpoint.load()
+        names = [
+            f.name
+            async for f in AsyncFileManager.iter_json_files(
+                tmp_path, checkpoint=checkpoint
+            )
+        ]
+        await checkpoint.save()
+        return names, checkpoint.skipped
+
+    assert await scan() == (["b.json"], 0)
+    assert await scan() == (["b.json"], 3)  # root, done, done/old
+
+    (tmp_path / "done" / "old" / "c.json").write_text("{}", encoding="utf-8")
+    names, _ = await scan()
+    assert sorted(names) == ["b.json", "c.json"]
+
+
+@pytest.mark.unit
+@pytest.mark.fileio
+async def test_write_json_and_delete(tmp_path: Path):
+    """
+    Test that the output is written and the source removed in one operation.
+    """
+    source = tmp_path / "task.json"
+    source.write_text("{}", encoding="utf-8")
+    output = tmp_path / "task_processed.json"
+
+    await AsyncFileManager.write_json_and_delete(output, {"age": 30}, source)
+
+    assert json.loads(output.read_text(encoding="utf-8")) == {"age": 30}
+    assert not source.exists()
+
+
+@pytest.mark.unit
+@pytest.mark.fileio
+async def test_engine_batches_concurrent_operations(tmp_path: Path):
+    """
+    Test that concurrent operations share submissions and errors stay per file.
+    """
+    engine = FileIOEngine(threads=2, batch_size=4, fsync=False)
+    for i in range(10):
+        (tmp_path / f"{i}.json").write_text(json.dumps({"i": i}), encoding="utf-8")
+
+    def read(i: int) -> dict:
+        return json.loads((tmp_path / f"{i}.json").read_text(encoding="utf-8"))
+
+    results = await asyncio.gather(
+        *(engine.run(lambda i=i: read(i)) for i in range(11)), return_exceptions=True
+    )
+    engine.close()
+
+    assert results[:10] == [{"i": i} for i in range(10)]
+    assert isinstance(results[10], FileNotFoundError)
+    assert engine.operations == 11
+    assert engine.submissions == 3
+
+
+@pytest.mark.unit
+@pytest.mark.fileio
+async def test_write_json_is_atomic(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that a failed write leaves the previous output intact and no temporary file behind.
+    """
+    output = tmp_path / "task_processed.json"
+    await AsyncFileManager.write_json(output, {"version": 1})
+
+    def crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("managers.file_manager.os.replace", crash)
+    with pytest.raises(OSError):
+        await AsyncFileManager.write_json(output, {"version": 2})
+
+    assert json.loads(output.read_text(encoding="utf-8")) == {"version": 1}
+    assert list(tmp_path.iterdir()) == [output]
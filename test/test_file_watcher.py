@@ -0,0 +1,98 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from managers.file_watcher import FileWatcher, Inotify
+
+
+def inotify_available() -> bool:
+    try:
+        Inotify().close()
+    except OSError:
+        return False
+    return True
+
+
+async def collect(watcher: FileWatcher, count: int, timeout: float = 3) -> list:
+    """Collect `count` paths from a watcher, then stop it."""
+    stream = watcher.watch()
+    found = []
+    try:
+        async with asyncio.timeout(timeout):
+            async for path in stream:
+                found.append(path)
+                if len(found) == count:
+                    break
+    finally:
+        await stream.aclose()
+    return found
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.watch
+@pytest.mark.parametrize(
+    "use_inotify",
+    [
+        False,
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                not inotify_available(), reason="inotify not available"
+            ),
+        ),
+    ],
+)
+async def test_watcher_yields_existing_and_new_files(
+    tmp_path: Path, use_inotify: bool
+) -> None:
+    """Test that files present at startup and files created later are both yielded."""
+    (tmp_path / "day1").mkdir()
+    existing = tmp_path / "day1" / "existing.json"
+    existing.write_text("{}", encoding="utf-8")
+    (tmp_path / "day1" / "old_processed.json").write_text("{}", encoding="utf-8")
+
+    watcher = FileWatcher(
+        tmp_path, debounce_seconds=0.05, poll_interval=0.05, use_inotify=use_inotify
+    )
+
+    async def create_later() -> Path:
+        await asyncio.sleep(0.2)
+        (tmp_path / "day2").mkdir()
+        await asyncio.sleep(0.1)
+        new_file = tmp_path / "day2" / "new.json"
+        new_file.write_text(json.dumps({"type": "joke"}), encoding="utf-8")
+        return new_file
+
+    creator = asyncio.create_task(create_later())
+    found = await collect(watcher, 2)
+    new_file = await creator
+
+    assert found == [existing, new_file]
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.watch
+async def test_watcher_debounces_partially_written_files(tmp_path: Path) -> None:
+    """Test that a file still being written is yielded once, after it stops changing."""
+    watcher = FileWatcher(
+        tmp_path, debounce_seconds=0.15, poll_interval=0.02, use_inotify=False
+    )
+    target = tmp_path / "slow.json"
+
+    async def write_slowly() -> None:
+        with target.open("w", encoding="utf-8") as f:
+            for chunk in ['{"type": ', '"joke", ', '"name": "Ann"}']:
+                f.write(chunk)
+                f.flush()
+                await asyncio.sleep(0.05)
+
+    writer = asyncio.create_task(write_slowly())
+    found = await collect(watcher, 1)
+    await writer
+
+    assert found == [target]
+    assert json.loads(target.read_text(encoding="utf-8"))["name"] == "Ann"
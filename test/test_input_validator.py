@@ -0,0 +1,75 @@
+import pytest
+
+from validators.input_validator import FieldRule, InputValidator
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        ({"type": "age", "name": "Émilie", "country": "fr"}, None),
+        ({"type": "joke", "name": "Anne-Marie", "country": "DE"}, None),
+        ({"type": "age", "country": "BG"}, "Missing or invalid 'name' field."),
+        (
+            {"type": "age", "name": "A", "country": "BG"},
+            "Invalid 'name': must be between 2 and 64 characters.",
+        ),
+        (
+            {"type": "age", "name": "X1", "country": "BG"},
+            "Invalid 'name': 'X1' contains invalid characters.",
+        ),
+        (
+            {"type": "age-1", "name": "Anna", "country": "BG"},
+            "Invalid 'type': 'age-1' contains invalid characters.",
+        ),
+        (
+            {"type": "age", "name": "Anna", "country": "BGR"},
+            "Invalid country code 'BGR'. Must be ISO 3166-1 alpha-2.",
+        ),
+        ([], "Input data must be a JSON object."),
+    ],
+)
+def test_validate(data, message) -> None:
+    """Test the built-in schema and its error messages."""
+    if message is None:
+        InputValidator.validate(data)
+    else:
+        with pytest.raises(ValueError, match=message):
+            InputValidator.validate(data)
+
+
+@pytest.mark.unit
+def test_validate_many_returns_errors_per_record() -> None:
+    """Test that a batch is validated without raising, one error list per record."""
+    results = InputValidator.validate_many(
+        [
+            {"type": "age", "name": "Anna", "country": "BG"},
+            {"type": ["age"], "name": "Anna"},
+        ]
+    )
+
+    assert results == [
+        [],
+        ["Missing or invalid 'type' field.", "Missing or invalid 'country' field."],
+    ]
+
+
+@pytest.mark.unit
+def test_task_types_can_add_rules() -> None:
+    """Test that rules registered for a task type only apply to that type."""
+    InputValidator.register_task_type("greeting", {"language": FieldRule(r"[a-z]{2}")})
+    try:
+        assert InputValidator.errors(
+            {"type": "greeting", "name": "Anna", "country": "BG"}
+        ) == ["Missing or invalid 'language' field."]
+        assert (
+            InputValidator.errors({"type": "age", "name": "Anna", "country": "BG"})
+            == []
+        )
+    finally:
+        InputValidator.unregister_task_type("greeting")
+
+    assert (
+        InputValidator.errors({"type": "greeting", "name": "Anna", "country": "BG"})
+        == []
+    )
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from utils.json_codec import JsonCodec
+
+BACKENDS = JsonCodec.available()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_round_trip_from_bytes(backend: str) -> None:
+    """Test that every installed backend parses bytes and keeps non-ASCII text."""
+    codec = JsonCodec(backend, "compact")
+    data = {"type": "age", "name": "Мария", "nested": [1, 2.5, None, True]}
+
+    encoded = codec.dumps(data)
+
+    assert isinstance(encoded, bytes)
+    assert "Мария".encode("utf-8") in encoded
+    assert b" " not in encoded
+    assert codec.loads(encoded) == data
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_pretty_output_matches_stdlib_format(backend: str) -> None:
+    """Test that pretty output is identical to json.dumps(indent=2, ensure_ascii=False)."""
+    data = {"joke": "Ще се смееш", "ages": [{"age": 30, "count": 2}]}
+
+    encoded = JsonCodec(backend, "pretty").dumps(data)
+
+    assert encoded.decode("utf-8") == json.dumps(data, indent=2, ensure_ascii=False)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_invalid_json_raises_value_error(backend: str) -> None:
+    """Test that parse errors are normalised to ValueError for every backend."""
+    with pytest.raises(ValueError):
+        JsonCodec(backend).loads(b"{not json")
+
+
+@pytest.mark.unit
+def test_unsupported_values_fall_back_to_stdlib() -> None:
+    """Test that values a fast backend rejects are still encoded."""
+    codec = JsonCodec("auto", "compact")
+
+    assert codec.loads(codec.dumps({"big": 2**70})) == {"big": 2**70}
+
+
+@pytest.mark.unit
+def test_unknown_style_is_rejected() -> None:
+    """Test that a misconfigured output style fails loudly."""
+    with pytest.raises(ValueError):
+        JsonCodec("json", "minified")
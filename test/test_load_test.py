@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.load_test import generate_input, parse_mix, run_load_test
+from benchmarks.mock_server import MockAPIServer
+from services.api_clients import AgifyClient
+
+
+@pytest.mark.unit
+def test_generate_input_follows_mix_and_name_cardinality(tmp_path: Path) -> None:
+    """Test that the generated tree has the requested size, task mix and distinct names."""
+    counts = generate_input(
+        tmp_path, 40, parse_mix("age=1,raw=1"), names=3, subdirs=4, seed=1
+    )
+
+    files = sorted(tmp_path.rglob("*.json"))
+    tasks = [json.loads(file.read_text(encoding="utf-8")) for file in files]
+    assert len(files) == 40 and sum(counts.values()) == 40
+    assert len({file.parent for file in files}) == 4
+    assert {task["type"] for task in tasks} == {"age", "greeting"}
+    assert len({task["name"] for task in tasks}) <= 3
+
+
+@pytest.mark.unit
+def test_parse_mix_rejects_malformed_entries() -> None:
+    """Test that a task mix with a non-numeric weight is rejected."""
+    with pytest.raises(ValueError):
+        parse_mix("age=lots")
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_load_test_processes_tree_against_mock_server(tmp_path: Path) -> None:
+    """Test an end-to-end run against the mock server, and that client URLs are restored."""
+    original_url = AgifyClient.BASE_URL
+    generate_input(tmp_path, 30, parse_mix("age=2,joke=1,raw=1"), names=5)
+
+    report = await run_load_test(tmp_path, MockAPIServer(), workers=8)
+
+    assert report["stats"]["processed"] == 30
+    assert report["stats"]["failed"] == 0
+    assert report["upstream_calls"]["postman"] == 30
+    assert report["latency_ms"]["p99"] >= report["latency_ms"]["p50"] > 0
+    assert len(list(tmp_path.rglob("*_processed.json"))) == 30
+    assert AgifyClient.BASE_URL == original_url
@@ -1,9 +1,12 @@
+import json
 import logging
+import time
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 import pytest
 
-from utils.logger import setup_logger
+from utils.logger import _listeners, setup_logger, shutdown_logging
 
 
 @pytest.fixture
@@ -35,7 +38,7 @@ def test_setup_logger_adds_handlers(mock_handlers: tuple[MagicMock, MagicMock])
     log_level = logging.DEBUG
     filename = "test.log"
 
-    logger = setup_logger(logger_name, log_level, filename)
+    logger = setup_logger(logger_name, log_level, filename, queued=False)
 
     assert logger.name == logger_name
     assert logger.level == log_level
@@ -61,8 +64,64 @@ def test_setup_logger_without_console(monkeypatch) -> None:
         mock_file = MagicMock()
         mock_file_handler.return_value = mock_file
 
-        logger = setup_logger("no_console_logger", logging.WARNING, "no_console.log")
+        logger = setup_logger(
+            "no_console_logger", logging.WARNING, "no_console.log", queued=False
+        )
 
         assert any(isinstance(h, MagicMock) for h in logger.handlers)
         assert mock_file.setFormatter.called
         mock_stream_handler.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.logger
+def test_queued_logger_writes_in_background(tmp_path: Path, monkeypatch) -> None:
+    """
+    Test that a queued logger formats lazily, writes JSON lines and drops sampled
+    records according to the sample rate.
+    """
+    monkeypatch.setattr("utils.logger.LOG_DIR", tmp_path)
+    monkeypatch.setattr("utils.logger.LOG_TO_CONSOLE", False)
+    monkeypatch.setattr("utils.logger.LOG_JSON", True)
+
+    logger = setup_logger("queued_logger", logging.INFO, "queued.log", sample_rate=0)
+    listener = _listeners[-1]
+    try:
+        logger.info("%s – processing started.", "a.json", extra={"sampled": True})
+        logger.info("Processing complete: %s", {"processed": 1})
+    finally:
+        shutdown_logging(listener)
+        logger.handlers.clear()
+        logger.filters.clear()
+
+    lines = (tmp_path / "queued.log").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    entry = json.loads(lines[0])
+    assert entry["level"] == "INFO"
+    assert entry["message"] == "Processing complete: {'processed': 1}"
+
+
+@pytest.mark.unit
+@pytest.mark.logger
+def test_queued_logger_flushes_buffer_when_idle(tmp_path: Path, monkeypatch) -> None:
+    """Test that buffered lines are written after the flush interval without a further record."""
+    monkeypatch.setattr("utils.logger.LOG_DIR", tmp_path)
+    monkeypatch.setattr("utils.logger.LOG_TO_CONSOLE", False)
+    monkeypatch.setattr("utils.logger.LOG_JSON", False)
+    monkeypatch.setattr("utils.logger.LOG_BUFFER_CAPACITY", 100)
+    monkeypatch.setattr("utils.logger.LOG_FLUSH_INTERVAL", 0.05)
+
+    logger = setup_logger("idle_logger", logging.INFO, "idle.log")
+    listener = _listeners[-1]
+    log_file = tmp_path / "idle.log"
+    try:
+        logger.info("last line of a burst")
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline and not log_file.read_text(encoding="utf-8"):
+            time.sleep(0.01)
+        written = log_file.read_text(encoding="utf-8")
+    finally:
+        shutdown_logging(listener)
+        logger.handlers.clear()
+
+    assert "last line of a burst" in written
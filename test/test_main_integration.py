@@ -1,10 +1,24 @@
 import json
+import os
+import zlib
 from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
 import main
+from resources import sharded_runner
+
+
+async def echo_with_pid(self, data: dict) -> dict:
+    """Offline stand-in for AsyncTaskDispatcher.handle recording the handling process."""
+    return {"name": data["name"], "pid": os.getpid()}
+
+
+def offline_shard(*args) -> dict:
+    """run_shard with the dispatcher kept offline; runs inside the spawned worker process."""
+    with patch("resources.processor.AsyncTaskDispatcher.handle", new=echo_with_pid):
+        return sharded_runner.run_shard(*args)
 
 
 @pytest.mark.integration
@@ -37,3 +51,57 @@ def test_main_processes_json_file(tmp_path: Path) -> None:
             result = json.load(f)
 
         assert result == expected_response
+
+
+@pytest.mark.integration
+@pytest.mark.main
+def test_main_shards_across_processes(tmp_path: Path) -> None:
+    """
+    Test that main() delegates to the sharded runner when more than one process is requested.
+    """
+    with patch("main.run_sharded", return_value={"processed": 3}) as mock_run_sharded:
+        result = main.main(tmp_path, processes=4, share_age_cache=False)
+
+    mock_run_sharded.assert_called_once_with(tmp_path, 4, False, False)
+    assert result == {"processed": 3}
+
+
+@pytest.mark.integration
+@pytest.mark.main
+def test_run_sharded_splits_work_across_real_processes(tmp_path: Path, monkeypatch) -> None:
+    """
+    Test a real two-process run: every file is handled by the process of its shard,
+    the shards' counters are merged and each shard writes its own metrics file and
+    scan checkpoint.
+    """
+    input_dir = tmp_path / "INPUT"
+    names = ["Anna", "Boris", "Clara", "Dimitar", "Elena", "Filip"] * 2
+    files = []
+    for index, name in enumerate(names):
+        directory = input_dir / f"batch_{index % 3}"
+        directory.mkdir(parents=True, exist_ok=True)
+        file = directory / f"task_{index}.json"
+        file.write_text(
+            json.dumps({"type": "joke", "name": name, "country": "US"}),
+            encoding="utf-8",
+        )
+        files.append(file)
+    monkeypatch.setattr("resources.sharded_runner.run_shard", offline_shard)
+
+    totals = sharded_runner.run_sharded(input_dir, 2, share_age_cache=False)
+
+    assert totals["processed"] == 12 and totals["failed"] == 0
+    pids: dict = {0: set(), 1: set()}
+    for file in files:
+        assert not file.exists()
+        output = file.with_name(f"{file.stem}_processed.json")
+        result = json.loads(output.read_text(encoding="utf-8"))
+        assert result["name"] == names[files.index(file)]
+        shard = zlib.crc32(file.relative_to(input_dir).as_posix().encode()) % 2
+        pids[shard].add(result["pid"])
+    assert all(len(shard_pids) == 1 for shard_pids in pids.values())
+    assert pids[0] != pids[1] and os.getpid() not in pids[0] | pids[1]
+    for index in range(2):
+        assert (tmp_path / "_state" / f"json_processor_shard{index}.prom").exists()
+        assert (tmp_path / "_state" / f"scan_checkpoint_shard{index}.json").exists()
+    assert not (tmp_path / "_state" / "scan_checkpoint.json").exists()
@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from utils.metrics import Metrics
+
+
+@pytest.mark.unit
+def test_histogram_renders_cumulative_buckets() -> None:
+    """Test that observations land in cumulative le buckets with sum and count."""
+    for value in (0.003, 0.02, 20.0):
+        Metrics.observe("latency_seconds", value, stage="read")
+
+    lines = Metrics.render().splitlines()
+
+    assert '# TYPE latency_seconds histogram' in lines
+    assert 'latency_seconds_bucket{stage="read",le="0.0025"} 0' in lines
+    assert 'latency_seconds_bucket{stage="read",le="0.005"} 1' in lines
+    assert 'latency_seconds_bucket{stage="read",le="10"} 2' in lines
+    assert 'latency_seconds_bucket{stage="read",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{stage="read"} 3' in lines
+    assert 'latency_seconds_sum{stage="read"} 20.023' in lines
+
+
+@pytest.mark.unit
+def test_textfile_export_adds_extra_labels(tmp_path: Path) -> None:
+    """Test that counters are exported atomically with labels escaped and extra labels added."""
+    Metrics.inc("requests_total", client="Agify", outcome='5"00')
+    Metrics.inc("requests_total", client="Agify", outcome='5"00')
+    path = tmp_path / "metrics" / "run.prom"
+
+    Metrics.write_textfile(path, shard="1")
+
+    content = path.read_text(encoding="utf-8")
+    assert 'requests_total{client="Agify",outcome="5\\"00",shard="1"} 2' in content
+    assert list(path.parent.iterdir()) == [path]
+
+
+@pytest.mark.unit
+def test_concurrent_textfile_writes_do_not_collide(tmp_path: Path) -> None:
+    """Test that exports from several threads at once never share a temp file."""
+    Metrics.inc("requests_total", client="Agify", outcome="200")
+    path = tmp_path / "run.prom"
+
+    def export() -> None:
+        for _ in range(50):
+            Metrics.write_textfile(path)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for future in [executor.submit(export) for _ in range(4)]:
+            future.result()
+
+    assert 'requests_total{client="Agify",outcome="200"} 1' in path.read_text(
+        encoding="utf-8"
+    )
+    assert list(tmp_path.iterdir()) == [path]
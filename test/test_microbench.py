@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.microbench import (
+    BENCHMARKS,
+    find_regressions,
+    load_baseline,
+    main,
+    run_suite,
+    save_baseline,
+)
+
+
+@pytest.mark.unit
+def test_find_regressions_flags_only_slowdowns_beyond_threshold() -> None:
+    """Test that only benchmarks slower than the baseline by more than the threshold are flagged."""
+    baseline = {
+        "validate": {"ops": 10, "median_us": 2.0, "min_us": 1.9},
+        "read_json": {"ops": 10, "median_us": 50.0, "min_us": 45.0},
+    }
+    results = {
+        "validate": {"ops": 10, "median_us": 3.0, "min_us": 2.8},
+        "read_json": {"ops": 10, "median_us": 55.0, "min_us": 50.0},
+        "write_json": {"ops": 10, "median_us": 500.0, "min_us": 400.0},
+    }
+
+    regressions = find_regressions(results, baseline, threshold=0.25)
+
+    assert regressions == ["validate: 2.000 -> 3.000 us/op (+50%)"]
+
+
+@pytest.mark.unit
+def test_save_baseline_merges_recorded_results(tmp_path: Path) -> None:
+    """Test that saving a partial run keeps the benchmarks recorded earlier."""
+    path = tmp_path / "baseline.json"
+    save_baseline(path, {"validate": {"ops": 1, "median_us": 2.0, "min_us": 2.0}})
+    save_baseline(path, {"read_json": {"ops": 1, "median_us": 9.0, "min_us": 8.0}})
+
+    assert set(load_baseline(path)) == {"validate", "read_json"}
+    assert load_baseline(tmp_path / "missing.json") == {}
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_run_suite_measures_every_benchmark() -> None:
+    """Test a scaled-down run of the whole suite."""
+    results = await run_suite(repeats=1, scale=0.01)
+
+    assert set(results) == set(BENCHMARKS)
+    assert all(result["median_us"] > 0 for result in results.values())
+
+
+@pytest.mark.unit
+def test_main_fails_without_a_baseline(tmp_path: Path, capsys) -> None:
+    """Test that a comparison run without a recorded baseline warns and exits non-zero."""
+    baseline = tmp_path / "baseline.json"
+    options = ["validate", "--repeats", "1", "--scale", "0.01", "--baseline", str(baseline)]
+
+    assert main(options) == 2
+    assert "no baseline for validate" in capsys.readouterr().err
+
+    assert main(options + ["--save"]) == 0
+    assert main(options + ["--threshold", "1000"]) == 0
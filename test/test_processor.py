@@ -1,12 +1,30 @@
+import asyncio
 import json
 from pathlib import Path
 from unittest.mock import AsyncMock, patch, MagicMock
 
 import pytest
 
+from managers.age_cache import AgeCache
+from managers.file_watcher import FileWatcher
 from resources.processor import AsyncJsonProcessor
 
 
+@pytest.fixture
+def mock_dispatcher():
+    """
+    Fixture that replaces the processor's task dispatcher with a mock whose preload
+    calls do nothing and whose `handle` returns a joke; tests override what they check.
+    """
+    with patch("resources.processor.AsyncTaskDispatcher") as mock_dispatcher_cls:
+        dispatcher = mock_dispatcher_cls.return_value
+        dispatcher.age_cache = AgeCache()
+        dispatcher.preload_age_predictions = AsyncMock()
+        dispatcher.preload_jokes = AsyncMock()
+        dispatcher.handle = AsyncMock(return_value={"joke": "ok"})
+        yield dispatcher
+
+
 @pytest.mark.asyncio
 @pytest.mark.unit
 @pytest.mark.processor
@@ -33,10 +51,9 @@ async def test_process_file_types(
     with patch(
         "resources.processor.AsyncFileManager.read_json", return_value=task_data
     ), patch(
-        "resources.processor.AsyncFileManager.write_json", new_callable=AsyncMock
-    ) as mock_write, patch(
-        "resources.processor.AsyncFileManager.delete_file", new_callable=AsyncMock
-    ) as mock_delete:
+        "resources.processor.AsyncFileManager.write_json_and_delete",
+        new_callable=AsyncMock,
+    ) as mock_write:
 
         processor = AsyncJsonProcessor()
         await processor.process_file(mock_dispatcher, test_file, task_data)
@@ -44,8 +61,7 @@ async def test_process_file_types(
         output_file = test_file.with_name(f"{test_file.stem}_processed.json")
 
         mock_dispatcher.handle.assert_awaited_once_with(task_data)
-        mock_write.assert_awaited_once_with(output_file, expected_response)
-        mock_delete.assert_awaited_once_with(test_file)
+        mock_write.assert_awaited_once_with(output_file, expected_response, test_file)
 
 
 @pytest.mark.asyncio
@@ -65,10 +81,9 @@ async def test_process_file_with_unexpected_task_type(tmp_path: Path) -> None:
     with patch(
         "resources.processor.AsyncFileManager.read_json", return_value=test_data
     ), patch(
-        "resources.processor.AsyncFileManager.write_json", new_callable=AsyncMock
-    ) as mock_write, patch(
-        "resources.processor.AsyncFileManager.delete_file", new_callable=AsyncMock
-    ) as mock_delete:
+        "resources.processor.AsyncFileManager.write_json_and_delete",
+        new_callable=AsyncMock,
+    ) as mock_write:
 
         processor = AsyncJsonProcessor()
         await processor.process_file(mock_dispatcher, test_file, test_data)
@@ -76,5 +91,211 @@ async def test_process_file_with_unexpected_task_type(tmp_path: Path) -> None:
         output_file = test_file.with_name("unexpected_processed.json")
 
         mock_dispatcher.handle.assert_awaited_once_with(test_data)
-        mock_write.assert_awaited_once_with(output_file, test_data)
-        mock_delete.assert_awaited_once_with(test_file)
+        mock_write.assert_awaited_once_with(output_file, test_data, test_file)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.processor
+async def test_process_all_worker_pool_bounds_concurrency(
+    tmp_path: Path, mock_dispatcher: MagicMock
+) -> None:
+    """
+    Test that the worker pool never runs more files at once than the configured workers.
+    """
+    for i in range(10):
+        (tmp_path / f"file_{i}.json").write_text(
+            json.dumps({"type": "joke", "name": "John", "country": "US"}),
+            encoding="utf-8",
+        )
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_handle(data: dict) -> dict:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"joke": "ok"}
+
+    mock_dispatcher.handle = fake_handle
+
+    processor = AsyncJsonProcessor(
+        tmp_path,
+        workers=3,
+        age_cache_path=None,
+        scan_checkpoint_path=None,
+        metrics_path=tmp_path.parent / f"{tmp_path.name}.prom",
+    )
+    await processor.process_all()
+
+    assert peak <= 3
+    assert (
+        sum(call.args[0] for call in mock_dispatcher.preload_jokes.await_args_list) == 10
+    )
+    exported = (tmp_path.parent / f"{tmp_path.name}.prom").read_text(encoding="utf-8")
+    assert 'json_processor_files_total{status="processed"} 10' in exported
+    assert 'json_processor_stage_seconds_count{stage="write"} 10' in exported
+    assert len(list(tmp_path.glob("*_processed.json"))) == 10
+    assert not list(tmp_path.glob("file_?.json"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.processor
+async def test_process_all_preloads_ages_per_window(
+    tmp_path: Path, mock_dispatcher: MagicMock
+) -> None:
+    """
+    Test that the streaming pipeline preloads age predictions window by window
+    and skips files that fail validation.
+    """
+    for i, name in enumerate(["Anna", "Boris", "Clara", "Dimo", "Elena"]):
+        (tmp_path / f"age_{i}.json").write_text(
+            json.dumps({"type": "age", "name": name, "country": "bg"}),
+            encoding="utf-8",
+        )
+    (tmp_path / "invalid.json").write_text(
+        json.dumps({"type": "age", "name": "X1", "country": "BG"}), encoding="utf-8"
+    )
+
+    mock_dispatcher.handle = AsyncMock(return_value={"age": 30})
+
+    processor = AsyncJsonProcessor(
+        tmp_path,
+        workers=2,
+        preload_window_size=2,
+        preload_window_seconds=0.05,
+        age_cache_path=None,
+        scan_checkpoint_path=None,
+        metrics_path=None,
+    )
+    await processor.process_all()
+
+    preloaded = [
+        pair
+        for call in mock_dispatcher.preload_age_predictions.await_args_list
+        for pair in call.args[0]
+    ]
+    assert mock_dispatcher.preload_age_predictions.await_count >= 3
+    assert all(
+        len(call.args[0]) <= 2
+        for call in mock_dispatcher.preload_age_predictions.await_args_list
+    )
+    assert sorted(preloaded) == [
+        ("Anna", "BG"), ("Boris", "BG"), ("Clara", "BG"), ("Dimo", "BG"), ("Elena", "BG")
+    ]
+    assert mock_dispatcher.handle.await_count == 5
+    assert (tmp_path / "invalid.json").exists()
+
+
+@pytest.mark.unit
+@pytest.mark.processor
+def test_shards_partition_the_input_tree(tmp_path: Path) -> None:
+    """
+    Test that every file belongs to exactly one shard.
+    """
+    files = [tmp_path / f"day{i % 4}" / f"file_{i}.json" for i in range(50)]
+    processors = [
+        AsyncJsonProcessor(tmp_path, shard_index=index, shard_count=3)
+        for index in range(3)
+    ]
+
+    for file in files:
+        assert sum(processor.in_shard(file) for processor in processors) == 1
+    assert all(any(p.in_shard(f) for f in files) for p in processors)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.processor
+@pytest.mark.watch
+async def test_watch_processes_files_as_they_arrive(
+    tmp_path: Path, mock_dispatcher: MagicMock
+) -> None:
+    """
+    Test that watch mode processes a file written after startup without a rescan.
+    """
+    watcher = FileWatcher(
+        tmp_path, debounce_seconds=0.05, poll_interval=0.05, use_inotify=False
+    )
+
+    processor = AsyncJsonProcessor(
+        tmp_path,
+        preload_window_seconds=0.01,
+        age_cache_path=None,
+        metrics_path=None,
+    )
+    watch_task = asyncio.create_task(processor.watch(watcher))
+
+    await asyncio.sleep(0.1)
+    (tmp_path / "late.json").write_text(
+        json.dumps({"type": "joke", "name": "John", "country": "US"}),
+        encoding="utf-8",
+    )
+
+    output = tmp_path / "late_processed.json"
+    for _ in range(100):
+        if output.exists():
+            break
+        await asyncio.sleep(0.02)
+
+    watch_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await watch_task
+
+    assert output.exists()
+    assert not (tmp_path / "late.json").exists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.processor
+@pytest.mark.watch
+async def test_watch_retries_files_that_failed_processing(
+    tmp_path: Path, mock_dispatcher: MagicMock
+) -> None:
+    """
+    Test that a file whose processing failed is handed back to the watcher and
+    processed on a later attempt, although it never changed.
+    """
+    task = tmp_path / "flaky.json"
+    task.write_text(
+        json.dumps({"type": "joke", "name": "John", "country": "US"}),
+        encoding="utf-8",
+    )
+    watcher = FileWatcher(
+        tmp_path,
+        debounce_seconds=0.05,
+        poll_interval=0.05,
+        use_inotify=False,
+        retry_seconds=0.05,
+    )
+
+    mock_dispatcher.handle = AsyncMock(
+        side_effect=[RuntimeError("upstream unavailable"), {"joke": "ok"}]
+    )
+
+    processor = AsyncJsonProcessor(
+        tmp_path,
+        preload_window_seconds=0.01,
+        age_cache_path=None,
+        metrics_path=None,
+    )
+    watch_task = asyncio.create_task(processor.watch(watcher))
+
+    output = tmp_path / "flaky_processed.json"
+    for _ in range(100):
+        if output.exists():
+            break
+        await asyncio.sleep(0.02)
+
+    watch_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await watch_task
+
+    assert output.exists()
+    assert not task.exists()
+    assert mock_dispatcher.handle.await_count == 2
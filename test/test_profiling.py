@@ -0,0 +1,70 @@
+import asyncio
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from managers.file_manager import AsyncFileManager
+from utils.profiling import RunProfiler, run_maybe_profiled
+
+
+async def blocking_stage() -> int:
+    """Coroutine that holds the event loop and allocates, for the profiler to catch."""
+    await asyncio.sleep(0)
+    payload = [bytearray(1024) for _ in range(2000)]
+    time.sleep(0.05)
+    return len(payload)
+
+
+@pytest.mark.unit
+def test_profiled_run_writes_cpu_slow_callback_and_memory_profiles(tmp_path: Path) -> None:
+    """Test that a profiled run names the blocking coroutine and records its allocations."""
+    profiler = RunProfiler(
+        "test", output_dir=tmp_path, slow_callback_seconds=0.01, memory_interval=0.01
+    )
+
+    assert profiler.run(blocking_stage()) == 2000
+
+    stats = pstats.Stats(str(profiler.path(".prof")))
+    assert any(func[2] == "blocking_stage" for func in stats.stats)
+    slow_callbacks = profiler.path("_slow_callbacks.log").read_text(encoding="utf-8")
+    assert "blocking_stage" in slow_callbacks
+    assert profiler.peak_bytes >= 2000 * 1024
+    assert tracemalloc.Snapshot.load(str(profiler.path(".tracemalloc"))).traces
+    assert "test_profiling.py" in profiler.path("_memory.txt").read_text(encoding="utf-8")
+    assert not tracemalloc.is_tracing()
+
+
+def threaded_work() -> int:
+    """Blocking work run through asyncio.to_thread."""
+    return sum(range(10_000))
+
+
+@pytest.mark.unit
+def test_profile_covers_worker_threads(tmp_path: Path) -> None:
+    """Test that file I/O pool and to_thread work is merged into the CPU profile."""
+    output = tmp_path / "out.json"
+
+    async def run_in_threads() -> int:
+        await AsyncFileManager.write_json(output, {"name": "Maria"})
+        return await asyncio.to_thread(threaded_work)
+
+    profiler = RunProfiler("threads", output_dir=tmp_path / "profiles")
+    profiler.run(run_in_threads())
+
+    functions = {func[2] for func in pstats.Stats(str(profiler.path(".prof"))).stats}
+    assert "threaded_work" in functions
+    assert "_write_json_file" in functions
+    assert AsyncFileManager.engine().thread_initializer is None
+    assert "worker threads" in profiler.path("_cpu.txt").read_text(encoding="utf-8")
+
+
+@pytest.mark.unit
+def test_unprofiled_run_writes_nothing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that profiling is skipped entirely unless requested."""
+    monkeypatch.setattr("utils.profiling.PROFILE_DIR", tmp_path)
+
+    assert run_maybe_profiled(blocking_stage()) == 2000
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,142 @@
+import json
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from managers.run_journal import RunJournal
+from resources.processor import AsyncJsonProcessor
+
+pytestmark = pytest.mark.asyncio
+
+
+async def crashed_run(journal_path: Path, files: dict) -> None:
+    """Record responses for files, then stop appending without finishing them (a crash)."""
+    journal = RunJournal(journal_path)
+    await journal.open()
+    for file, response in files.items():
+        await journal.record_response(file, response)
+    journal._handle.close()
+
+
+@pytest.mark.unit
+@pytest.mark.fileio
+async def test_replay_keeps_only_unfinished_files(tmp_path: Path) -> None:
+    """Test that finished files and a record cut short by a crash are ignored on replay."""
+    done, pending = tmp_path / "done.json", tmp_path / "pending.json"
+    for file in (done, pending):
+        file.write_text("{}", encoding="utf-8")
+    journal_path = tmp_path / "journal.jsonl"
+
+    journal = RunJournal(journal_path)
+    await journal.open()
+    await journal.record_response(done, {"age": 1})
+    await journal.record_done(done)
+    await journal.record_response(pending, {"age": 2})
+    journal._handle.close()
+    with journal_path.open("ab") as f:
+        f.write(b'{"file": "torn')
+
+    replayed = RunJournal(journal_path)
+    await replayed.open()
+    await replayed.record_done(tmp_path / "other.json")
+
+    assert await replayed.resumable() == {pending: {"age": 2}}
+    lines = journal_path.read_bytes().splitlines()
+    assert json.loads(lines[-1])["stage"] == "done"
+
+
+@pytest.mark.unit
+@pytest.mark.fileio
+async def test_journal_is_compacted_while_open(tmp_path: Path) -> None:
+    """Test that a long-running journal is periodically cut down to its unfinished files."""
+    journal_path = tmp_path / "journal.jsonl"
+    journal = RunJournal(journal_path, compact_records=4)
+    await journal.open()
+    for index in range(10):
+        file = tmp_path / f"task_{index}.json"
+        file.write_text("{}", encoding="utf-8")
+        await journal.record_response(file, {"index": index})
+        if index != 7:
+            await journal.record_done(file)
+
+    # 19 records were appended; at most the unfinished file plus the records since
+    # the last compaction are left.
+    lines = journal_path.read_bytes().splitlines()
+    assert len(lines) <= 1 + 4
+    assert {json.loads(line)["file"] for line in lines} <= {
+        str(tmp_path / f"task_{index}.json") for index in (7, 8, 9)
+    }
+    assert await journal.resumable() == {tmp_path / "task_7.json": {"index": 7}}
+
+    await journal.close()
+    replayed = RunJournal(journal_path)
+    await replayed.open()
+    assert list(await replayed.resumable()) == [tmp_path / "task_7.json"]
+
+
+@pytest.mark.integration
+@pytest.mark.processor
+async def test_rerun_finishes_journaled_files_without_upstream_calls(tmp_path: Path) -> None:
+    """
+    Test that a rerun writes the recorded response of an interrupted file instead of
+    calling the APIs again, and that the journal is removed once nothing is pending.
+    """
+    input_path = tmp_path / "INPUT"
+    input_path.mkdir()
+    task = input_path / "task.json"
+    task.write_text(json.dumps({"type": "age", "name": "Maria", "country": "BG"}))
+    journal_path = tmp_path / "journal.jsonl"
+    await crashed_run(journal_path, {task: {"name": "Maria", "age": 41}})
+
+    processor = AsyncJsonProcessor(
+        input_path,
+        age_cache_path=None,
+        scan_checkpoint_path=None,
+        metrics_path=None,
+        journal_path=journal_path,
+    )
+    with patch(
+        "resources.processor.AsyncTaskDispatcher.handle", new_callable=AsyncMock
+    ) as mock_handle:
+        stats = await processor.process_all()
+
+    mock_handle.assert_not_called()
+    assert stats["resumed"] == 1 and stats["discovered"] == 0
+    assert not task.exists()
+    output = input_path / "task_processed.json"
+    assert json.loads(output.read_text(encoding="utf-8")) == {"name": "Maria", "age": 41}
+    assert not journal_path.exists()
+
+
+@pytest.mark.integration
+@pytest.mark.processor
+async def test_changed_source_is_processed_again(tmp_path: Path) -> None:
+    """Test that a file rewritten after its response was journaled is not resumed."""
+    input_path = tmp_path / "INPUT"
+    input_path.mkdir()
+    task = input_path / "task.json"
+    task.write_text(json.dumps({"type": "joke", "name": "Ivan", "country": "BG"}))
+    journal_path = tmp_path / "journal.jsonl"
+    await crashed_run(journal_path, {task: {"joke": "stale"}})
+    task.write_text(json.dumps({"type": "joke", "name": "Petar", "country": "BG"}))
+    os.utime(task, ns=(1, 1))
+
+    processor = AsyncJsonProcessor(
+        input_path,
+        age_cache_path=None,
+        scan_checkpoint_path=None,
+        metrics_path=None,
+        journal_path=journal_path,
+    )
+    with patch(
+        "resources.processor.AsyncTaskDispatcher.handle", new_callable=AsyncMock
+    ) as mock_handle:
+        mock_handle.return_value = {"joke": "fresh"}
+        stats = await processor.process_all()
+
+    assert stats["resumed"] == 0 and stats["processed"] == 1
+    output = input_path / "task_processed.json"
+    assert json.loads(output.read_text(encoding="utf-8")) == {"joke": "fresh"}
+    assert not journal_path.exists()
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_concurrent_calls_share_one_flight() -> None:
+    """Test that concurrent calls with the same key run the function once."""
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch() -> dict:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"age": 30}
+
+    results = await asyncio.gather(*(flight.do("Alice", fetch) for _ in range(5)))
+
+    assert calls == 1
+    assert results == [{"age": 30}] * 5
+    assert flight.coalesced == 4
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_error_is_propagated_to_all_waiters() -> None:
+    """Test that an exception from the shared call is raised in every waiter."""
+    flight = SingleFlight()
+
+    async def fetch() -> dict:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream failed")
+
+    results = await asyncio.gather(
+        *(flight.do("Bob", fetch) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_different_keys_are_not_coalesced() -> None:
+    """Test that calls with different keys each run their own function."""
+    flight = SingleFlight()
+    keys = []
+
+    async def fetch(key: str) -> str:
+        keys.append(key)
+        await asyncio.sleep(0)
+        return key
+
+    results = await asyncio.gather(
+        flight.do("a", lambda: fetch("a")), flight.do("b", lambda: fetch("b"))
+    )
+
+    assert results == ["a", "b"]
+    assert sorted(keys) == ["a", "b"]
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 import pytest
@@ -204,3 +205,57 @@ async def test_preload_age_predictions_caches_results() -> None:
 
     assert ("Anna", "PL") in dispatcher.age_cache
     assert dispatcher.age_cache[("Ola", "PL")]["age"] == 23
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.dispatcher
+async def test_preload_age_predictions_runs_batches_concurrently(monkeypatch) -> None:
+    """Test that batches are sent concurrently without exceeding the parallelism limit."""
+    in_flight = 0
+    peak = 0
+    batches = []
+
+    async def fake_get_batch_ages(names: list, country: str) -> list:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        batches.append(names)
+        return [{"name": name, "age": 30, "country_id": country} for name in names]
+
+    dispatcher = AsyncTaskDispatcher(preload_concurrency=2)
+    monkeypatch.setattr(dispatcher.agify_client, "get_batch_ages", fake_get_batch_ages)
+
+    pairs = [(f"Name{chr(65 + i % 26)}{i}", "US") for i in range(45)]
+    await dispatcher.preload_age_predictions(pairs)
+
+    assert len(batches) == 5
+    assert peak == 2
+    assert all((name, "US") in dispatcher.age_cache for name, _ in pairs)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.dispatcher
+@respx.mock
+async def test_handle_coalesces_identical_age_lookups() -> None:
+    """Test that concurrent misses for the same (name, country) hit Agify only once."""
+    agify_route = respx.get("https://api.agify.io").mock(
+        return_value=Response(200, json={"name": "Frank", "age": 51, "country_id": "US"})
+    )
+    respx.post("https://postman-echo.com/post").mock(
+        return_value=Response(200, json={"json": {"name": "Frank", "age": 51}})
+    )
+
+    dispatcher = AsyncTaskDispatcher()
+    results = await asyncio.gather(
+        *(
+            dispatcher.handle({"type": "age", "name": "Frank", "country": "US"})
+            for _ in range(5)
+        )
+    )
+
+    assert agify_route.call_count == 1
+    assert all(result["age"] == 51 for result in results)
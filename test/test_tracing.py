@@ -0,0 +1,138 @@
+import asyncio
+import gc
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.load_test import generate_input, parse_mix, run_load_test
+from benchmarks.mock_server import MockAPIServer
+from utils.tracing import Tracer
+
+
+@pytest.fixture(autouse=True)
+def reset_tracer():
+    """Fixture that leaves the process-wide tracer stopped and empty after each test."""
+    yield
+    Tracer.reset()
+
+
+@pytest.mark.unit
+def test_span_is_a_shared_no_op_when_tracing_is_off() -> None:
+    """Test that disabled tracing records nothing and allocates no span objects."""
+    with Tracer.span("read", file="a.json") as first:
+        pass
+
+    assert first is None
+    assert Tracer.span("write") is Tracer.span("read")
+    assert Tracer.events() == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_spans_are_recorded_per_task_track(tmp_path: Path) -> None:
+    """Test that concurrent tasks get their own named tracks with nested complete events."""
+    Tracer.start()
+
+    async def worker(name: str) -> None:
+        with Tracer.span("process_file", file=name):
+            with Tracer.span("read", "disk"):
+                await asyncio.sleep(0.01)
+
+    await asyncio.gather(
+        asyncio.create_task(worker("a.json"), name="worker-a"),
+        asyncio.create_task(worker("b.json"), name="worker-b"),
+    )
+    Tracer.stop()
+    path = tmp_path / "trace.json"
+    Tracer.write(path, shard=0)
+
+    trace = json.loads(path.read_text(encoding="utf-8"))
+    tracks = {
+        event["args"]["name"]: event["tid"]
+        for event in trace["traceEvents"]
+        if event["ph"] == "M"
+    }
+    spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert set(tracks) == {"worker-a", "worker-b"}
+    outer = next(span for span in spans if span.get("args") == {"file": "a.json"})
+    inner = next(
+        span
+        for span in spans
+        if span["name"] == "read" and span["tid"] == tracks["worker-a"]
+    )
+    assert outer["tid"] == tracks["worker-a"]
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert inner["dur"] >= 10_000
+    assert trace["metadata"] == {"dropped_events": 0, "shard": 0}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_track_ids_are_not_reused_after_a_task_is_collected() -> None:
+    """Test that a task started after an earlier one was collected gets a fresh track."""
+    Tracer.start()
+    release = asyncio.Event()
+
+    async def worker(wait: bool) -> int:
+        with Tracer.span("process_file"):
+            if wait:
+                await release.wait()
+        return Tracer.track()
+
+    first = asyncio.create_task(worker(False), name="worker-a")
+    second = asyncio.create_task(worker(True), name="worker-b")
+    track_a = await first
+    del first
+    gc.collect()
+
+    track_c = await asyncio.create_task(worker(False), name="worker-c")
+    release.set()
+    track_b = await second
+
+    assert len({track_a, track_b, track_c}) == 3
+    names = [event["tid"] for event in Tracer.events() if event["ph"] == "M"]
+    assert sorted(names) == sorted({track_a, track_b, track_c})
+
+
+@pytest.mark.unit
+def test_events_beyond_the_limit_are_dropped() -> None:
+    """Test that the event buffer is bounded and dropped spans are counted."""
+    Tracer.start(max_events=2)
+
+    for _ in range(5):
+        with Tracer.span("validate"):
+            pass
+
+    assert len(Tracer.events()) == 2  # thread-name metadata + one span
+    assert Tracer.dropped == 4
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_processing_run_exports_stage_spans(tmp_path: Path) -> None:
+    """Test that a traced run writes one trace covering every stage of a file's life."""
+    input_path = tmp_path / "INPUT"
+    generate_input(input_path, 20, parse_mix("age=1,joke=1"), names=3)
+
+    await run_load_test(
+        input_path, MockAPIServer(), trace_dir=tmp_path / "traces", workers=4
+    )
+
+    (trace_file,) = (tmp_path / "traces").iterdir()
+    events = json.loads(trace_file.read_text(encoding="utf-8"))["traceEvents"]
+    names = {event["name"] for event in events if event["ph"] == "X"}
+    assert {
+        "read",
+        "validate",
+        "preload_window",
+        "cache_lookup",
+        "process_file",
+        "rate_limit_wait",
+        "upstream",
+        "http_request",
+        "forward",
+        "write_and_delete",
+    } <= names
+    assert not Tracer.enabled
@@ -0,0 +1,121 @@
+import json
+from typing import Any, Callable
+
+from config.settings import JSON_CODEC, JSON_OUTPUT_STYLE
+from utils.logger import error_logger
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+COMPACT = "compact"
+PRETTY = "pretty"
+
+
+class JsonCodec:
+    """
+    JSON encoder/decoder backed by the fastest library available.
+
+    orjson is preferred, then msgspec, then the standard library. Every backend
+    parses straight from bytes and encodes to UTF-8 bytes, so file contents never
+    take a detour through str. Pretty output uses a 2-space indent and keeps
+    non-ASCII characters as-is, matching the historical `indent=2, ensure_ascii=False`
+    format; compact output has no whitespace at all.
+    """
+
+    BACKENDS = ("orjson", "msgspec", "json")
+
+    def __init__(self, backend: str = JSON_CODEC, style: str = JSON_OUTPUT_STYLE):
+        """
+        :param backend: "auto" or one of BACKENDS. Unavailable backends fall back to "auto".
+        :param style: "pretty" or "compact" output.
+        :raises ValueError: If the backend or style is unknown.
+        """
+        if backend != "auto" and backend not in self.BACKENDS:
+            raise ValueError(f"Unknown JSON codec: {backend}")
+        if style not in (COMPACT, PRETTY):
+            raise ValueError(f"Unknown JSON output style: {style}")
+
+        available = self.available()
+        if backend != "auto" and backend not in available:
+            error_logger.error(
+                f"[JSON] Codec '{backend}' is not installed. Falling back to '{available[0]}'."
+            )
+            backend = "auto"
+        self.backend = available[0] if backend == "auto" else backend
+        self.style = style
+
+        self._loads: Callable[[bytes | str], Any] = json.loads
+        if self.backend == "orjson":
+            self._loads = orjson.loads
+        elif self.backend == "msgspec":
+            self._loads = msgspec.json.decode
+        self._dumps: Callable[[Any], bytes] = getattr(self, f"_dumps_{self.backend}")
+
+    @classmethod
+    def available(cls) -> list[str]:
+        """
+        :return: Installed backends, fastest first.
+        """
+        installed = {"orjson": orjson is not None, "msgspec": msgspec is not None}
+        return [name for name in cls.BACKENDS if installed.get(name, True)]
+
+    def loads(self, data: bytes | str) -> Any:
+        """
+        Parse a JSON document.
+
+        :param data: Raw file content (bytes are parsed without decoding first).
+        :return: The parsed value.
+        :raises ValueError: If the document is not valid JSON.
+        """
+        try:
+            return self._loads(data)
+        except ValueError:
+            raise
+        except Exception as e:
+            # msgspec raises its own DecodeError; normalise it for callers.
+            raise ValueError(str(e)) from e
+
+    def dumps(self, value: Any) -> bytes:
+        """
+        Serialize a value in the configured output style.
+
+        Values the fast backends reject (e.g. integers beyond 64 bits) are encoded
+        with the standard library instead.
+
+        :param value: JSON-serializable value.
+        :return: UTF-8 encoded JSON.
+        """
+        try:
+            return self._dumps(value)
+        except Exception:
+            if self.backend == "json":
+                raise
+        return self._dumps_json(value)
+
+    def _dumps_orjson(self, value: Any) -> bytes:
+        return orjson.dumps(
+            value, option=orjson.OPT_INDENT_2 if self.style == PRETTY else 0
+        )
+
+    def _dumps_msgspec(self, value: Any) -> bytes:
+        encoded = msgspec.json.encode(value)
+        return (
+            msgspec.json.format(encoded, indent=2) if self.style == PRETTY else encoded
+        )
+
+    def _dumps_json(self, value: Any) -> bytes:
+        if self.style == PRETTY:
+            text = json.dumps(value, indent=2, ensure_ascii=False)
+        else:
+            text = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+        return text.encode("utf-8")
+
+
+codec = JsonCodec()
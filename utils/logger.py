@@ -1,36 +1,241 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import random
+import time
 from logging import Logger
+from typing import List, Optional
 
-from config.settings import LOG_DIR, LOG_TO_CONSOLE
+from config.settings import (
+    LOG_BUFFER_CAPACITY,
+    LOG_DIR,
+    LOG_FLUSH_INTERVAL,
+    LOG_JSON,
+    LOG_QUEUED,
+    LOG_SUCCESS_SAMPLE_RATE,
+    LOG_TO_CONSOLE,
+)
 
 LOG_FORMAT: str = "%(asctime)s - %(levelname)s - %(message)s"
 formatter = logging.Formatter(LOG_FORMAT)
 
+_listeners: List[logging.handlers.QueueListener] = []
 
-def setup_logger(name: str, level: int, filename: str) -> Logger:
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats records as one JSON object per line (time, level, logger, message)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a fraction of the records marked as sampled.
+
+    Per-file success lines are logged with `extra={"sampled": True}`; at high
+    volume they can be thinned out while errors and summaries are always kept.
+    """
+
+    def __init__(self, rate: float) -> None:
+        """
+        :param rate: Fraction of sampled records to keep (1 = all, 0 = none).
+        """
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1 or not getattr(record, "sampled", False):
+            return True
+        return random.random() < self.rate
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Puts records on the queue without formatting them.
+
+    The standard QueueHandler formats every message in the calling thread; here
+    the listener thread does it, so the event loop only pays for the enqueue.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class TimedMemoryHandler(logging.handlers.MemoryHandler):
+    """
+    Buffers records and writes them in batches.
+
+    The buffer is flushed when it is full, on an error record, or once it is
+    `flush_interval` seconds old: on the next record, or by the TimedQueueListener
+    when no record arrives, so quiet periods do not hold lines back for long.
+    """
+
+    def __init__(
+        self, capacity: int, target: logging.Handler, flush_interval: float
+    ) -> None:
+        super().__init__(capacity, flushLevel=logging.ERROR, target=target)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return (
+            super().shouldFlush(record)
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def flush(self) -> None:
+        super().flush()
+        self._last_flush = time.monotonic()
+
+    def flush_deadline(self) -> Optional[float]:
+        """:return: monotonic() time at which the buffered records are due (None if empty)."""
+        if not self.buffer:
+            return None
+        return self._last_flush + self.flush_interval
+
+
+class TimedQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that also flushes its buffering handlers while the queue is idle.
+
+    Instead of blocking on the queue indefinitely, the listener waits at most until
+    the oldest buffered batch is due, then writes it out.
+    """
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        while True:
+            deadlines = [
+                deadline
+                for deadline in (
+                    handler.flush_deadline()
+                    for handler in self.handlers
+                    if isinstance(handler, TimedMemoryHandler)
+                )
+                if deadline is not None
+            ]
+            timeout = (
+                max(min(deadlines) - time.monotonic(), 0.0) if deadlines else None
+            )
+            try:
+                return self.queue.get(block, timeout=timeout)
+            except queue.Empty:
+                if not block:
+                    raise
+            now = time.monotonic()
+            for handler in self.handlers:
+                if isinstance(handler, TimedMemoryHandler):
+                    deadline = handler.flush_deadline()
+                    if deadline is not None and deadline <= now:
+                        handler.flush()
+
+
+def _output_handlers(filename: str) -> List[logging.Handler]:
+    """
+    Create the file (and optional console) handlers of a logger.
+
+    :param filename: Name of the log file where logs will be saved.
+    :return: Configured handlers.
+    """
+    line_formatter = JsonLinesFormatter() if LOG_JSON else formatter
+
+    file_handler = logging.FileHandler(LOG_DIR / filename)
+    file_handler.setFormatter(line_formatter)
+    handlers = [file_handler]
+
+    if LOG_TO_CONSOLE:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(line_formatter)
+        handlers.append(stream_handler)
+
+    return handlers
+
+
+def setup_logger(
+    name: str,
+    level: int,
+    filename: str,
+    queued: bool = LOG_QUEUED,
+    sample_rate: float = 1.0,
+) -> Logger:
     """
     Create and configure a logger with file and optional console output.
 
+    In queued mode the logger only enqueues records; a background QueueListener
+    formats them and writes them in batches, so logging never blocks on disk I/O.
+
     :param name: Name of the logger.
     :param level: Logging level (e.g., logging.INFO, logging.ERROR).
     :param filename: Name of the log file where logs will be saved.
+    :param queued: Whether to write through a background listener thread.
+    :param sample_rate: Fraction of sampled (per-file success) records to keep.
     :return: Configured Logger instance.
     """
     logger = logging.getLogger(name)
     logger.setLevel(level)
     logger.propagate = False  # Prevent double logging if root logger is configured
+    if sample_rate < 1:
+        logger.addFilter(SamplingFilter(sample_rate))
 
-    file_handler = logging.FileHandler(LOG_DIR / filename)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-
-    if LOG_TO_CONSOLE:
-        stream_handler = logging.StreamHandler()
-        stream_handler.setFormatter(formatter)
-        logger.addHandler(stream_handler)
+    handlers = _output_handlers(filename)
+    if not queued:
+        for handler in handlers:
+            logger.addHandler(handler)
+        return logger
 
+    buffered = [
+        TimedMemoryHandler(LOG_BUFFER_CAPACITY, handler, LOG_FLUSH_INTERVAL)
+        for handler in handlers
+    ]
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    listener = TimedQueueListener(records, *buffered, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    logger.addHandler(DeferredQueueHandler(records))
     return logger
 
 
-info_logger: Logger = setup_logger("info_logger", logging.INFO, "info.log")
+def flush_logs() -> None:
+    """
+    Write out every record logged so far, keeping the listeners running.
+
+    Needed in worker processes, which exit without running atexit handlers.
+    """
+    for listener in list(_listeners):
+        listener.stop()
+        for handler in listener.handlers:
+            handler.flush()
+        listener.start()
+
+
+def shutdown_logging(listener: Optional[logging.handlers.QueueListener] = None) -> None:
+    """
+    Stop the background listeners and flush every buffered record.
+
+    :param listener: A single listener to stop (defaults to all of them).
+    """
+    for current in [listener] if listener is not None else list(_listeners):
+        if current not in _listeners:
+            continue
+        _listeners.remove(current)
+        current.stop()
+        for handler in current.handlers:
+            handler.close()
+
+
+atexit.register(shutdown_logging)
+
+info_logger: Logger = setup_logger(
+    "info_logger", logging.INFO, "info.log", sample_rate=LOG_SUCCESS_SAMPLE_RATE
+)
 error_logger: Logger = setup_logger("error_logger", logging.ERROR, "error.log")
@@ -0,0 +1,251 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+STAGE_SECONDS = "json_processor_stage_seconds"
+FILES_TOTAL = "json_processor_files_total"
+API_REQUEST_SECONDS = "json_processor_api_request_seconds"
+API_REQUESTS_TOTAL = "json_processor_api_requests_total"
+
+DOCUMENTATION: Dict[str, str] = {
+    STAGE_SECONDS: "Duration of a pipeline stage for one file (or one scan), in seconds.",
+    FILES_TOTAL: "Files by pipeline outcome.",
+    API_REQUEST_SECONDS: "Duration of a single upstream API request, in seconds.",
+    API_REQUESTS_TOTAL: "Upstream API requests by client and outcome.",
+}
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _labels(labels: Dict[str, str]) -> LabelSet:
+    """Turn keyword labels into a hashable, ordered label set."""
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: LabelSet) -> str:
+    """Render a label set in Prometheus exposition format."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+class Counter:
+    """Monotonically increasing value per label set."""
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.values: Dict[LabelSet, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """
+        :param amount: Value to add.
+        :param labels: Label values of the series.
+        """
+        key = _labels(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def render(self, extra: LabelSet = ()) -> List[str]:
+        """
+        :param extra: Labels added to every series (e.g. the shard).
+        :return: Exposition lines of the counter.
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            for labels, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_format_labels(labels + extra)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Distribution of observed values (e.g. latencies in seconds) per label set."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.series: Dict[LabelSet, List[float]] = {}  # bucket counts + [sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        :param value: Observed value.
+        :param labels: Label values of the series.
+        """
+        key = _labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [0.0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self, extra: LabelSet = ()) -> List[str]:
+        """
+        :param extra: Labels added to every series (e.g. the shard).
+        :return: Exposition lines of the histogram (cumulative buckets, sum and count).
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for labels, series in sorted(self.series.items()):
+                labels = labels + extra
+                cumulative = 0.0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    bucket_labels = labels + (("le", f"{bound:g}"),)
+                    lines.append(
+                        f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative:g}"
+                    )
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(labels + (('le', '+Inf'),))} "
+                    f"{series[-1]:g}"
+                )
+                lines.append(f"{self.name}_sum{_format_labels(labels)} {series[-2]:g}")
+                lines.append(
+                    f"{self.name}_count{_format_labels(labels)} {series[-1]:g}"
+                )
+        return lines
+
+
+class Metrics:
+    """
+    In-process registry of the counters and histograms of a run.
+
+    Metrics are created on first use and can be rendered in the Prometheus text
+    exposition format or written as a textfile-collector file.
+    """
+
+    _metrics: Dict[str, Counter | Histogram] = {}
+
+    @classmethod
+    def counter(cls, name: str, documentation: str = "") -> Counter:
+        """
+        :param name: Metric name.
+        :param documentation: HELP text, used when the counter is created.
+        :return: The registered counter.
+        """
+        metric = cls._metrics.get(name)
+        if metric is None:
+            # setdefault keeps creation race-free when called from I/O threads.
+            metric = cls._metrics.setdefault(
+                name, Counter(name, documentation or DOCUMENTATION.get(name, name))
+            )
+        return metric  # type: ignore[return-value]
+
+    @classmethod
+    def histogram(cls, name: str, documentation: str = "") -> Histogram:
+        """
+        :param name: Metric name.
+        :param documentation: HELP text, used when the histogram is created.
+        :return: The registered histogram.
+        """
+        metric = cls._metrics.get(name)
+        if metric is None:
+            # setdefault keeps creation race-free when called from I/O threads.
+            metric = cls._metrics.setdefault(
+                name, Histogram(name, documentation or DOCUMENTATION.get(name, name))
+            )
+        return metric  # type: ignore[return-value]
+
+    @classmethod
+    def inc(cls, name: str, amount: float = 1.0, **labels: str) -> None:
+        """Increment a counter (see `counter`)."""
+        cls.counter(name).inc(amount, **labels)
+
+    @classmethod
+    def observe(cls, name: str, value: float, **labels: str) -> None:
+        """Record a value in a histogram (see `histogram`)."""
+        cls.histogram(name).observe(value, **labels)
+
+    @classmethod
+    @contextmanager
+    def timer(cls, name: str, **labels: str) -> Iterator[None]:
+        """
+        Observe the duration of a block in a histogram, in seconds.
+
+        :param name: Histogram name.
+        :param labels: Label values of the series.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cls.observe(name, time.perf_counter() - start, **labels)
+
+    @classmethod
+    def render(cls, **extra_labels: str) -> str:
+        """
+        :param extra_labels: Labels added to every series (e.g. shard="0").
+        :return: All metrics in the Prometheus text exposition format.
+        """
+        extra = _labels(extra_labels)
+        lines: List[str] = []
+        for name in sorted(cls._metrics):
+            lines.extend(cls._metrics[name].render(extra))
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def write_textfile(cls, path: Optional[Path], **extra_labels: str) -> None:
+        """
+        Atomically write all metrics for the node_exporter textfile collector.
+
+        :param path: Target `.prom` file (None = export disabled).
+        :param extra_labels: Labels added to every series.
+        """
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # The periodic exporter thread may still be writing when the final export
+        # starts, so every thread gets its own temp file.
+        tmp_path = path.with_name(
+            f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        tmp_path.write_text(cls.render(**extra_labels), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget all metrics (e.g. between tests)."""
+        cls._metrics.clear()
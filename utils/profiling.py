@@ -0,0 +1,220 @@
+import asyncio
+import cProfile
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, Coroutine, List, Optional, Type, TypeVar
+
+from config.settings import (
+    PROFILE_DIR,
+    PROFILE_MEMORY_INTERVAL,
+    PROFILE_MEMORY_TOP,
+    PROFILE_SLOW_CALLBACK_MS,
+    PROFILE_TRACEMALLOC_FRAMES,
+)
+from managers.file_manager import AsyncFileManager
+from utils.logger import formatter, info_logger
+
+T = TypeVar("T")
+
+
+class RunProfiler:
+    """
+    Profiles a processing run and writes the results to `output_dir`.
+
+    While active it records:
+    - a cProfile CPU profile (`<prefix>.prof`, readable with pstats, snakeviz or
+      gprof2dot) plus a text summary of the top functions (`<prefix>_cpu.txt`),
+      covering the event loop thread and the worker threads of the file I/O pool
+      and of `asyncio.to_thread` (each profiled on its own, then merged);
+    - asyncio slow-callback warnings naming every task or callback that held the
+      event loop longer than `slow_callback_seconds` (`<prefix>_slow_callbacks.log`);
+    - a tracemalloc snapshot taken when traced memory peaked
+      (`<prefix>.tracemalloc`, loadable with `tracemalloc.Snapshot.load`) and its
+      top allocation sites (`<prefix>_memory.txt`).
+
+    Slow-callback reporting needs the loop in debug mode, which `run` enables.
+    """
+
+    def __init__(
+        self,
+        label: str = "run",
+        output_dir: Path = PROFILE_DIR,
+        slow_callback_seconds: float = PROFILE_SLOW_CALLBACK_MS / 1000,
+        tracemalloc_frames: int = PROFILE_TRACEMALLOC_FRAMES,
+        memory_interval: float = PROFILE_MEMORY_INTERVAL,
+        memory_top: int = PROFILE_MEMORY_TOP,
+    ) -> None:
+        """
+        :param label: Name included in the output file names (e.g. "main", "shard1").
+        :param output_dir: Directory the profiles are written to.
+        :param slow_callback_seconds: Loop blocking time reported as slow.
+        :param tracemalloc_frames: Stack frames stored per allocation.
+        :param memory_interval: Seconds between checks for a new memory peak.
+        :param memory_top: Allocation sites listed in the memory summary.
+        """
+        self.output_dir = output_dir
+        self.prefix = f"{time.strftime('%Y%m%d_%H%M%S')}_{label}"
+        self.slow_callback_seconds = slow_callback_seconds
+        self.tracemalloc_frames = max(tracemalloc_frames, 1)
+        self.memory_interval = memory_interval
+        self.memory_top = memory_top
+        self.peak_bytes = 0
+        self._snapshot_bytes = -1
+        self._profile = cProfile.Profile()
+        self._thread_profiles: List[cProfile.Profile] = []
+        self._previous_initializer: Optional[Callable[[], None]] = None
+        self._peak_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._stop_sampling = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._slow_handler: Optional[logging.Handler] = None
+        self._started_tracemalloc = False
+
+    def path(self, suffix: str) -> Path:
+        """
+        :param suffix: File name suffix (e.g. ".prof", "_memory.txt").
+        :return: Path of one of the output files.
+        """
+        return self.output_dir / f"{self.prefix}{suffix}"
+
+    def run(self, main: Coroutine[Any, Any, T]) -> T:
+        """
+        Run a coroutine in a new event loop under the profiler, in loop debug mode.
+
+        :param main: Coroutine to run (e.g. `processor.process_all()`).
+        :return: The coroutine's result.
+        """
+        with self, asyncio.Runner(debug=True) as runner:
+            loop = runner.get_loop()
+            loop.slow_callback_duration = self.slow_callback_seconds
+            loop.set_default_executor(
+                ThreadPoolExecutor(
+                    thread_name_prefix="asyncio", initializer=self._profile_thread
+                )
+            )
+            return runner.run(main)
+
+    def __enter__(self) -> "RunProfiler":
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        self._slow_handler = logging.FileHandler(self.path("_slow_callbacks.log"))
+        self._slow_handler.setFormatter(formatter)
+        self._slow_handler.setLevel(logging.WARNING)
+        logging.getLogger("asyncio").addHandler(self._slow_handler)
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.tracemalloc_frames)
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._sampler = threading.Thread(
+            target=self._sample_memory, name="profile-memory", daemon=True
+        )
+        self._sampler.start()
+
+        engine = AsyncFileManager.engine()
+        engine.close()  # new pool threads start with their own profiler
+        self._previous_initializer = engine.thread_initializer
+        engine.thread_initializer = self._profile_thread
+
+        self._profile.enable()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self._profile.disable()
+        engine = AsyncFileManager.engine()
+        engine.close()
+        engine.thread_initializer = self._previous_initializer
+
+        self._stop_sampling.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self._check_memory_peak()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        if self._slow_handler is not None:
+            logging.getLogger("asyncio").removeHandler(self._slow_handler)
+            self._slow_handler.close()
+
+        self._write_cpu_profile()
+        self._write_memory_profile()
+        info_logger.info(
+            f"[PROFILE] Profile written to {self.path('.prof')} "
+            f"(peak traced memory {self.peak_bytes / 2**20:.1f} MiB)"
+        )
+
+    def _profile_thread(self) -> None:
+        """Start a profiler in a new worker thread (cProfile only covers its own thread)."""
+        profile = cProfile.Profile()
+        self._thread_profiles.append(profile)
+        profile.enable()
+
+    def _sample_memory(self) -> None:
+        """Watch traced memory and keep a snapshot of the highest level seen."""
+        while not self._stop_sampling.wait(self.memory_interval):
+            self._check_memory_peak()
+
+    def _check_memory_peak(self) -> None:
+        """Take a snapshot if traced memory is higher than at the last snapshot."""
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak_bytes = max(self.peak_bytes, peak)
+        if current > self._snapshot_bytes:
+            self._peak_snapshot = tracemalloc.take_snapshot()
+            self._snapshot_bytes = current
+
+    def _write_cpu_profile(self) -> None:
+        """Dump the CPU profile of all threads and a cumulative-time summary."""
+        with self.path("_cpu.txt").open("w", encoding="utf-8") as summary:
+            stats = pstats.Stats(self._profile, stream=summary)
+            for profile in self._thread_profiles:
+                stats.add(profile)
+            stats.dump_stats(self.path(".prof"))
+            summary.write(
+                f"Event loop thread and {len(self._thread_profiles)} worker threads "
+                f"(file I/O pool, asyncio.to_thread); worker time includes waiting "
+                f"for work.\n\n"
+            )
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+
+    def _write_memory_profile(self) -> None:
+        """Dump the peak snapshot and its top allocation sites."""
+        if self._peak_snapshot is None:
+            return
+        snapshot = self._peak_snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            )
+        )
+        snapshot.dump(str(self.path(".tracemalloc")))
+
+        lines = [f"Peak traced memory: {self.peak_bytes / 2**20:.1f} MiB", ""]
+        for statistic in snapshot.statistics("lineno")[: self.memory_top]:
+            lines.append(str(statistic))
+        self.path("_memory.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def run_maybe_profiled(
+    main: Coroutine[Any, Any, T], profile: bool = False, label: str = "run"
+) -> T:
+    """
+    Run a coroutine with `asyncio.run`, optionally under a RunProfiler.
+
+    :param main: Coroutine to run.
+    :param profile: Whether to profile the run.
+    :param label: Name included in the profile file names.
+    :return: The coroutine's result.
+    """
+    if not profile:
+        return asyncio.run(main)
+    return RunProfiler(label).run(main)
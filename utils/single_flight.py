@@ -0,0 +1,64 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single in-flight call.
+
+    The first caller for a key starts the call; callers arriving while it is still
+    running await the same result, and any exception is raised in all of them.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced: int = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `func` for `key`, or join the call already in flight for that key.
+
+        :param key: Identifies identical calls.
+        :param func: Zero-argument coroutine function performing the call.
+        :return: The result of the shared call.
+        :raises Exception: Whatever the shared call raised.
+        """
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+
+        # Shield the shared call so one cancelled waiter does not cancel the others.
+        return await asyncio.shield(future)
+
+    def in_flight(self) -> int:
+        """
+        :return: Number of distinct calls currently in flight.
+        """
+        return len(self._calls)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        """Remove a finished call and mark its exception as retrieved."""
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            future.exception()
+
+
+def freeze_params(params: Any) -> Hashable:
+    """
+    Convert query parameters into a hashable key.
+
+    :param params: None, a dictionary or a list of (key, value) tuples.
+    :return: A hashable representation of the parameters.
+    """
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return tuple(sorted(params.items()))
+    return tuple(params)
@@ -0,0 +1,198 @@
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import threading
+import time
+import weakref
+from pathlib import Path
+from types import TracebackType
+from typing import Any, ContextManager, Dict, List, Optional, Type
+
+from config.settings import TRACE_MAX_EVENTS
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    """A running span; recorded as one complete ("X") trace event when it ends."""
+
+    __slots__ = ("name", "category", "args", "track", "started")
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]) -> None:
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self) -> "_Span":
+        self.track = Tracer.track()
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        Tracer.record(self, time.perf_counter_ns())
+
+
+class Tracer:
+    """
+    Process-wide collector of trace spans, exported in the Chrome trace event format.
+
+    Spans are recorded per asyncio task (or thread), which becomes a track in
+    chrome://tracing or Perfetto, so the stages of every file line up under the
+    worker that handled it and gaps show where it was waiting. While tracing is
+    off, `span` returns a shared no-op context and records nothing.
+    """
+
+    enabled: bool = False
+    max_events: int = TRACE_MAX_EVENTS
+    dropped: int = 0
+    _events: List[Dict[str, Any]] = []
+    _tracks: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+    _thread_tracks: Dict[int, int] = {}
+    _track_ids = itertools.count(1)
+    _origin_ns: int = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def start(cls, max_events: int = TRACE_MAX_EVENTS) -> None:
+        """
+        Forget earlier spans and start recording.
+
+        :param max_events: Maximum number of events kept; later spans are dropped and counted.
+        """
+        cls.reset()
+        cls.max_events = max_events
+        cls._origin_ns = time.perf_counter_ns()
+        cls.enabled = True
+
+    @classmethod
+    def stop(cls) -> None:
+        """Stop recording; the spans collected so far are kept for `write`."""
+        cls.enabled = False
+
+    @classmethod
+    def reset(cls) -> None:
+        """Stop recording and forget all spans."""
+        with cls._lock:
+            cls.enabled = False
+            cls.dropped = 0
+            cls._events = []
+            cls._tracks = weakref.WeakKeyDictionary()
+            cls._thread_tracks = {}
+            cls._track_ids = itertools.count(1)
+
+    @classmethod
+    def span(cls, name: str, category: str = "pipeline", **args: Any) -> ContextManager:
+        """
+        Time a block as a trace span.
+
+        :param name: Span name (e.g. "read", "upstream").
+        :param category: Trace category, used for filtering in the viewer.
+        :param args: Extra values shown with the span (e.g. file="a.json").
+        :return: A context manager recording the span, or a no-op one when tracing is off.
+        """
+        if not cls.enabled:
+            return _NULL_SPAN
+        return _Span(name, category, args)
+
+    @classmethod
+    def track(cls) -> int:
+        """
+        Return the track id of the current asyncio task, or of the thread outside a loop.
+
+        Ids are never reused within a trace, even after a task has finished and
+        been collected. The first span on a new track also records its name as
+        trace metadata.
+        """
+        try:
+            task: Any = asyncio.current_task()
+        except RuntimeError:
+            task = None
+
+        with cls._lock:
+            if task is not None:
+                track = cls._tracks.get(task)
+                if track is not None:
+                    return track
+                label = task.get_name()
+            else:
+                ident = threading.get_ident()
+                track = cls._thread_tracks.get(ident)
+                if track is not None:
+                    return track
+                label = threading.current_thread().name
+
+            track = next(cls._track_ids)
+            if task is not None:
+                cls._tracks[task] = track
+            else:
+                cls._thread_tracks[ident] = track
+            cls._events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": track,
+                    "args": {"name": label},
+                }
+            )
+            return track
+
+    @classmethod
+    def record(cls, span: _Span, ended: int) -> None:
+        """
+        Store a finished span as a complete event (timestamps in microseconds).
+
+        :param span: The finished span.
+        :param ended: perf_counter_ns() at the end of the span.
+        """
+        event = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": (span.started - cls._origin_ns) / 1000,
+            "dur": (ended - span.started) / 1000,
+            "pid": os.getpid(),
+            "tid": span.track,
+        }
+        if span.args:
+            event["args"] = span.args
+        with cls._lock:
+            if len(cls._events) >= cls.max_events:
+                cls.dropped += 1
+                return
+            cls._events.append(event)
+
+    @classmethod
+    def events(cls) -> List[Dict[str, Any]]:
+        """:return: A copy of the events recorded so far."""
+        with cls._lock:
+            return list(cls._events)
+
+    @classmethod
+    def write(cls, path: Optional[Path], **metadata: Any) -> None:
+        """
+        Atomically write the recorded spans as a Chrome trace JSON file.
+
+        :param path: Target `.json` file (None = export disabled).
+        :param metadata: Extra values stored in the trace's metadata (e.g. shard=0).
+        """
+        if path is None:
+            return
+        document = {
+            "traceEvents": cls.events(),
+            "displayTimeUnit": "ms",
+            "metadata": {"dropped_events": cls.dropped, **metadata},
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(document), encoding="utf-8")
+        os.replace(tmp_path, path)
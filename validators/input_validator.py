@@ -1,50 +1,171 @@
 import re
-from typing import Any
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+Check = Callable[[dict[str, Any]], List[str]]
+
+
+class FieldRule:
+    """Declarative rule for a single string field of a task."""
+
+    def __init__(
+        self,
+        pattern: str,
+        min_length: int = 1,
+        max_length: Optional[int] = None,
+        pattern_error: str = "Invalid '{field}': '{value}' contains invalid characters.",
+        transform: Optional[Callable[[str], str]] = None,
+    ) -> None:
+        """
+        :param pattern: Regular expression the whole value must match.
+        :param min_length: Minimum value length.
+        :param max_length: Maximum value length (None = unbounded).
+        :param pattern_error: Message for a pattern mismatch ({field} and {value} are filled in).
+        :param transform: Optional normalisation applied before matching (e.g. str.upper).
+        """
+        self.match = re.compile(pattern).fullmatch
+        self.min_length = min_length
+        self.max_length = max_length if max_length is not None else float("inf")
+        self.pattern_error = pattern_error
+        self.transform = transform
+
+    def error(self, field: str, value: Any) -> Optional[str]:
+        """
+        Describe why a value breaks the rule (slow path, only used for invalid input).
+
+        :param field: Field name.
+        :param value: Field value.
+        :return: The error message, or None if the value is valid.
+        """
+        if not value or not isinstance(value, str):
+            return f"Missing or invalid '{field}' field."
+        if not self.min_length <= len(value) <= self.max_length:
+            return (
+                f"Invalid '{field}': must be between {self.min_length} "
+                f"and {self.max_length} characters."
+            )
+        if not self.match(self.transform(value) if self.transform else value):
+            return self.pattern_error.format(field=field, value=value)
+        return None
+
+
+def compile_schema(schema: Dict[str, FieldRule]) -> Check:
+    """
+    Compile a schema into a single check function.
+
+    Valid records only pay for one type check, one length comparison and one
+    precompiled match per field; messages are built only for failing fields.
+
+    :param schema: Mapping of field name to its rule.
+    :return: Function returning the list of errors of a record (empty if valid).
+    """
+    rules = tuple(
+        (field, rule.min_length, rule.max_length, rule.match, rule.transform, rule)
+        for field, rule in schema.items()
+    )
+
+    def check(data: dict[str, Any]) -> List[str]:
+        errors: List[str] = []
+        for field, min_length, max_length, match, transform, rule in rules:
+            value = data.get(field)
+            if (
+                isinstance(value, str)
+                and min_length <= len(value) <= max_length
+                and match(transform(value) if transform else value)
+            ):
+                continue
+            error = rule.error(field, value)
+            if error is not None:
+                errors.append(error)
+        return errors
+
+    return check
 
 
 class InputValidator:
-    """Validator for input JSON data related to task dispatching."""
+    """
+    Validator for input JSON data related to task dispatching.
+
+    The rules are declared as a schema: BASE_SCHEMA applies to every task, and task
+    types can add or override field rules with `register_task_type`. Each schema
+    is compiled once per task type into a single check function.
+    """
+
+    BASE_SCHEMA: Dict[str, FieldRule] = {
+        "name": FieldRule(r"[A-Za-zÀ-ÿ\s\-]+", min_length=2, max_length=64),
+        "type": FieldRule(r"[a-zA-Z_]+", min_length=2, max_length=32),
+        "country": FieldRule(
+            r"[A-Z]{2}",
+            pattern_error="Invalid country code '{value}'. Must be ISO 3166-1 alpha-2.",
+            transform=str.upper,
+        ),
+    }
 
-    @staticmethod
-    def validate(json_data: dict[str, Any]) -> None:
+    _task_schemas: Dict[str, Dict[str, FieldRule]] = {}
+    _compiled: Dict[Optional[str], Check] = {}
+
+    @classmethod
+    def register_task_type(cls, task_type: str, rules: Dict[str, FieldRule]) -> None:
         """
-        Validate the structure and content of a given JSON dictionary.
+        Add field rules that only apply to one task type.
 
-        This method checks for the presence and format of the 'name', 'type',
-        and 'country' fields in the input data. If any validations fail, it
-        raises a ValueError with all relevant error messages.
+        :param task_type: Value of the "type" field the rules apply to.
+        :param rules: Field rules added to (or replacing those of) BASE_SCHEMA.
+        """
+        cls._task_schemas[task_type] = {**cls._task_schemas.get(task_type, {}), **rules}
+        cls._compiled.pop(task_type, None)
 
-        :param json_data: Dictionary representing the input JSON data.
-        :raises ValueError: If the input data is not valid.
+    @classmethod
+    def unregister_task_type(cls, task_type: str) -> None:
         """
-        errors: list[str] = []
+        Remove the extra rules of a task type.
 
-        if not isinstance(json_data, dict):
-            raise ValueError("Input data must be a JSON object.")
+        :param task_type: Task type registered with `register_task_type`.
+        """
+        cls._task_schemas.pop(task_type, None)
+        cls._compiled.pop(task_type, None)
 
-        name = json_data.get("name")
-        if not name or not isinstance(name, str):
-            errors.append("Missing or invalid 'name' field.")
-        elif len(name) < 2 or len(name) > 64:
-            errors.append("Invalid 'name': must be between 2 and 64 characters.")
-        elif not re.fullmatch(r"[A-Za-zÀ-ÿ\s\-]+", name):
-            errors.append(f"Invalid 'name': '{name}' contains invalid characters.")
+    @classmethod
+    def errors(cls, json_data: Any) -> List[str]:
+        """
+        Return every validation error of a record.
 
+        :param json_data: Parsed input JSON.
+        :return: Error messages (empty if the record is valid).
+        """
+        if not isinstance(json_data, dict):
+            return ["Input data must be a JSON object."]
         task_type = json_data.get("type")
-        if not task_type or not isinstance(task_type, str):
-            errors.append("Missing or invalid 'type' field.")
-        elif len(task_type) < 2 or len(task_type) > 32:
-            errors.append("Invalid 'type': must be between 2 and 32 characters.")
-        elif not re.fullmatch(r"[a-zA-Z_]+", task_type):
-            errors.append(f"Invalid 'type': '{task_type}' contains invalid characters.")
-
-        country = json_data.get("country")
-        if not country or not isinstance(country, str):
-            errors.append("Missing or invalid 'country' field.")
-        elif not re.fullmatch(r"[A-Z]{2}", country.upper()):
-            errors.append(
-                f"Invalid country code '{country}'. Must be ISO 3166-1 alpha-2."
-            )
+        if not isinstance(task_type, str) or task_type not in cls._task_schemas:
+            task_type = None
+        check = cls._compiled.get(task_type)
+        if check is None:
+            schema = {**cls.BASE_SCHEMA, **cls._task_schemas.get(task_type, {})}
+            check = cls._compiled[task_type] = compile_schema(schema)
+        return check(json_data)
+
+    @classmethod
+    def validate(cls, json_data: dict[str, Any]) -> None:
+        """
+        Validate the structure and content of a given JSON dictionary.
+
+        This method checks the fields declared in BASE_SCHEMA ('name', 'type' and
+        'country') plus any rules registered for the task's type. If any
+        validations fail, it raises a ValueError with all relevant error messages.
 
+        :param json_data: Dictionary representing the input JSON data.
+        :raises ValueError: If the input data is not valid.
+        """
+        errors = cls.errors(json_data)
         if errors:
             raise ValueError("; ".join(errors))
+
+    @classmethod
+    def validate_many(cls, records: Iterable[Any]) -> List[List[str]]:
+        """
+        Validate a batch of records without raising.
+
+        :param records: Parsed input JSON records.
+        :return: The errors of every record, in order (an empty list means valid).
+        """
+        errors = cls.errors
+        return [errors(record) for record in records]